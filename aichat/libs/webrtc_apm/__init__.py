@@ -42,19 +42,22 @@ def _get_library_path() -> str:
 
     return str(lib_path)
 
-# 延迟加载库（仅在macOS平台需要时加载）
+# 延迟加载库（仅在需要时加载）
 _lib = None
 
+# 提供预编译库的平台
+_SUPPORTED_SYSTEMS = ('darwin', 'linux')
+
 def _ensure_library_loaded():
-    """确保库已加载（仅macOS平台）。"""
+    """确保库已加载（macOS / Linux）。"""
     global _lib
 
-    # 检查是否为macOS平台
+    # 检查平台是否提供预编译库
     system = platform.system().lower()
-    if system != 'darwin':
+    if system not in _SUPPORTED_SYSTEMS:
         raise RuntimeError(
-            f"WebRTC APM library is only supported on macOS, current platform: {system}. "
-            f"Windows and Linux should use system-level AEC instead."
+            f"WebRTC APM library is only supported on macOS and Linux, current platform: {system}. "
+            f"Windows should use system-level AEC instead."
         )
 
     # 如果已加载，直接返回
@@ -278,12 +281,37 @@ def _init_function_signatures():
     _lib.WebRTC_APM_SetStreamDelayMs.argtypes = [ctypes.c_void_p, ctypes.c_int]
     _lib.WebRTC_APM_SetStreamDelayMs.restype = None
 
+    # 以裸地址（整数）传递音频缓冲区的函数原型，供 NumPy 零拷贝接口使用：
+    # 按子帧偏移时只需整数运算，无需为每个子帧创建 ctypes 指针对象
+    global _process_reverse_stream_raw, _process_stream_raw
+    raw_prototype = ctypes.CFUNCTYPE(
+        ctypes.c_int,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+        ctypes.c_void_p,
+    )
+    _process_reverse_stream_raw = raw_prototype(
+        ('WebRTC_APM_ProcessReverseStream', _lib)
+    )
+    _process_stream_raw = raw_prototype(('WebRTC_APM_ProcessStream', _lib))
+
+_process_reverse_stream_raw = None
+_process_stream_raw = None
+
+def _buffer_address(buffer, name: str) -> int:
+    """获取 int16 连续数组（NumPy ndarray）的数据地址。"""
+    if buffer.dtype.itemsize != 2 or not buffer.flags.c_contiguous:
+        raise ValueError(f"{name} must be a C-contiguous int16 array")
+    return buffer.ctypes.data
+
 class WebRTCAudioProcessing:
     """WebRTC 音频处理的高级 Python 封装器。"""
 
     def __init__(self):
         """初始化音频处理模块。"""
-        # 确保库已加载（仅macOS）
+        # 确保库已加载（macOS / Linux）
         _ensure_library_loaded()
         _init_function_signatures()
 
@@ -360,6 +388,57 @@ class WebRTCAudioProcessing:
             self._handle, src, src_config, dest_config, dest
         )
     
+    def process_frames(self, render, capture, render_config: int,
+                       capture_config: int, capture_out, frame_size: int,
+                       render_out=None) -> int:
+        """批量处理多个10ms子帧（NumPy 零拷贝）。
+
+        按子帧交替调用反向流和采集流处理，直接传递数组内存地址，
+        结果写入调用方预分配的输出数组，整个过程不创建中间缓冲区。
+
+        Args:
+            render: 参考信号（int16 连续数组），长度与 capture 相同
+            capture: 采集信号（int16 连续数组），长度为 frame_size 的整数倍
+            render_config: 反向流配置句柄
+            capture_config: 采集流配置句柄
+            capture_out: 采集处理结果输出数组（int16，长度同 capture）
+            frame_size: 每个子帧的样本数（如 16kHz 下为 160）
+            render_out: 反向流处理结果输出数组，默认原地写回 render
+
+        Returns:
+            状态码（0表示全部成功，否则为第一个失败的错误码）
+        """
+        total = len(capture)
+        if total % frame_size != 0 or len(render) != total:
+            raise ValueError("buffer length must be a multiple of frame_size")
+        if len(capture_out) != total:
+            raise ValueError("capture_out length must match capture")
+        if render_out is None:
+            render_out = render
+
+        render_ptr = _buffer_address(render, 'render')
+        render_out_ptr = _buffer_address(render_out, 'render_out')
+        capture_ptr = _buffer_address(capture, 'capture')
+        capture_out_ptr = _buffer_address(capture_out, 'capture_out')
+
+        handle = self._handle
+        step = frame_size * 2  # int16 字节数
+        status = 0
+        for offset in range(0, total * 2, step):
+            result = _process_reverse_stream_raw(
+                handle, render_ptr + offset, render_config, render_config,
+                render_out_ptr + offset,
+            )
+            if result != 0 and status == 0:
+                status = result
+            result = _process_stream_raw(
+                handle, capture_ptr + offset, capture_config, capture_config,
+                capture_out_ptr + offset,
+            )
+            if result != 0 and status == 0:
+                status = result
+        return status
+
     def set_stream_delay_ms(self, delay_ms: int) -> None:
         """设置流延迟（毫秒）。
         
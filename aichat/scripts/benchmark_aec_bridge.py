@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""WebRTC APM ctypes 桥接微基准.
+
+对比两种调用方式处理一帧（20/40/60ms）音频的耗时：
+1. legacy: 每个10ms子帧创建4个 ctypes.c_short 数组（逐元素解包），
+   结果用 np.array 转回并 np.concatenate 拼接（原 AECProcessor 实现）
+2. batched: WebRTCAudioProcessing.process_frames，直接传递 NumPy 数组地址，
+   结果写入预分配输出数组
+
+用法:
+    python scripts/benchmark_aec_bridge.py [--iterations 2000]
+"""
+
+import argparse
+import ctypes
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from libs.webrtc_apm import WebRTCAudioProcessing, create_default_config  # noqa: E402
+
+SAMPLE_RATE = 16000
+SUBFRAME = 160  # 10ms @ 16kHz
+
+
+def create_apm():
+    apm = WebRTCAudioProcessing()
+    config = create_default_config()
+    config.echo.enabled = True
+    config.noise_suppress.enabled = True
+    config.high_pass.enabled = True
+    if apm.apply_config(config) != 0:
+        raise RuntimeError("APM配置失败")
+    stream_config = apm.create_stream_config(SAMPLE_RATE, 1)
+    apm.set_stream_delay_ms(40)
+    return apm, stream_config
+
+
+def legacy_process(apm, stream_config, capture, reference):
+    chunks = []
+    for start in range(0, len(capture), SUBFRAME):
+        cap = capture[start : start + SUBFRAME]
+        ref = reference[start : start + SUBFRAME]
+        capture_buffer = (ctypes.c_short * SUBFRAME)(*cap)
+        reference_buffer = (ctypes.c_short * SUBFRAME)(*ref)
+        processed_capture = (ctypes.c_short * SUBFRAME)()
+        processed_reference = (ctypes.c_short * SUBFRAME)()
+        apm.process_reverse_stream(
+            reference_buffer, stream_config, stream_config, processed_reference
+        )
+        apm.process_stream(
+            capture_buffer, stream_config, stream_config, processed_capture
+        )
+        chunks.append(np.array(processed_capture, dtype=np.int16))
+    return np.concatenate(chunks)
+
+
+def batched_process(apm, stream_config, capture, reference, out):
+    apm.process_frames(
+        reference, capture, stream_config, stream_config, out, SUBFRAME
+    )
+    return out
+
+
+def run(iterations: int):
+    rng = np.random.default_rng(0)
+    print(f"{'frame':>6} {'legacy us':>10} {'batched us':>11} {'speedup':>8}")
+    for frame_ms in (20, 40, 60):
+        size = SAMPLE_RATE * frame_ms // 1000
+        capture = rng.integers(-3000, 3000, size, dtype=np.int16)
+        reference = rng.integers(-3000, 3000, size, dtype=np.int16)
+        reference_scratch = np.empty_like(reference)
+        out = np.empty_like(capture)
+
+        results = {}
+        for name in ("legacy", "batched"):
+            apm, stream_config = create_apm()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                if name == "legacy":
+                    legacy_process(apm, stream_config, capture, reference)
+                else:
+                    reference_scratch[:] = reference
+                    batched_process(
+                        apm, stream_config, capture, reference_scratch, out
+                    )
+            elapsed = time.perf_counter() - start
+            results[name] = elapsed / iterations * 1e6
+            apm.destroy_stream_config(stream_config)
+
+        print(
+            f"{frame_ms:>4}ms {results['legacy']:>10.1f} {results['batched']:>11.1f} "
+            f"{results['legacy'] / results['batched']:>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebRTC APM ctypes 桥接微基准")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    try:
+        run(args.iterations)
+    except (OSError, RuntimeError) as e:
+        print(f"无法加载 WebRTC APM 库: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
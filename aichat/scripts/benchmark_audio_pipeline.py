@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""音频热路径基准（模拟声卡，无需真实硬件）
+
+用时钟驱动的模拟设备替换 sd.InputStream / sd.OutputStream，按指定的采样率、
+声道数和 blocksize 以快于实时的速度驱动 AudioCodec 的输入回调和输出回调：
+- 输入端：送入合成语音信号，采集工作线程完成重采样/AEC/编码
+- 输出端：模拟服务端按实时节奏下发 Opus 包（解码写入播放缓冲区）
+
+报告内容：
+- 每次回调耗时的 P50/P95/P99/最大值，及相对回调周期（截止时间）的占比
+- 每次回调的临时内存分配（tracemalloc 峰值，单独一轮测量）
+- 模拟 xrun：回调超出周期、输入缓冲区溢出丢块、播放欠载
+- 端到端吞吐：模拟音频时长 / 实际耗时，编码帧数与采集积压
+
+用法:
+    python scripts/benchmark_audio_pipeline.py
+    python scripts/benchmark_audio_pipeline.py --input-rate 48000 --input-channels 2 \
+        --output-rate 44100 --output-channels 2 --seconds 60
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+
+class SimulatedStream:
+    """
+    模拟 PortAudio 流：只记录参数和回调，由 SimulatedDevice 按虚拟时钟驱动.
+    """
+
+    def __init__(
+        self,
+        device=None,
+        samplerate=None,
+        channels=1,
+        dtype=np.float32,
+        blocksize=0,
+        callback=None,
+        finished_callback=None,
+        latency=None,
+        **kwargs,
+    ):
+        self.device = device
+        self.samplerate = samplerate
+        self.channels = channels
+        self.dtype = dtype
+        self.blocksize = blocksize
+        self.callback = callback
+        self.finished_callback = finished_callback
+        self.latency = 0.02
+        self.active = False
+
+    def start(self):
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def close(self):
+        self.active = False
+        if self.finished_callback:
+            self.finished_callback()
+
+
+def install_simulated_backend():
+    """
+    用模拟流替换 sounddevice 的输入/输出流（未安装 sounddevice 时注册同名模块）
+    """
+    try:
+        import sounddevice as sd
+    except (ImportError, OSError):
+        sd = types.ModuleType("sounddevice")
+        sd.query_devices = lambda *args, **kwargs: []
+        sys.modules["sounddevice"] = sd
+    sd.InputStream = SimulatedStream
+    sd.OutputStream = SimulatedStream
+    return sd
+
+
+class CallbackTimer:
+    """
+    回调耗时记录.
+    """
+
+    def __init__(self, name: str, period: float):
+        self.name = name
+        self.period = period
+        self.durations = []
+        self.deadline_misses = 0
+
+    def record(self, elapsed: float):
+        self.durations.append(elapsed)
+        if elapsed > self.period:
+            self.deadline_misses += 1
+
+    def summary(self) -> str:
+        if not self.durations:
+            return f"{self.name}: 无数据"
+        data = np.array(self.durations) * 1e6
+        p50, p95, p99 = np.percentile(data, [50, 95, 99])
+        budget = data.max() / (self.period * 1e6) * 100
+        return (
+            f"{self.name:<8} n={len(data):<6} p50={p50:7.1f}us p95={p95:7.1f}us "
+            f"p99={p99:7.1f}us max={data.max():8.1f}us "
+            f"(最大占周期 {budget:5.1f}%, 超时 {self.deadline_misses})"
+        )
+
+
+class SimulatedDevice:
+    """
+    虚拟时钟驱动的声卡：按各流的回调周期交替调用输入/输出回调.
+    """
+
+    def __init__(self, codec, seconds: float, speed: float, tts_ratio: float):
+        self.codec = codec
+        self.seconds = seconds
+        self.speed = speed
+        self.tts_ratio = tts_ratio
+
+        self.input_stream = codec.input_stream
+        self.output_stream = codec.output_stream
+
+        in_rate = self.input_stream.samplerate
+        out_rate = self.output_stream.samplerate
+        self.in_block = self.input_stream.blocksize
+        self.out_block = self.output_stream.blocksize
+        self.in_period = self.in_block / in_rate
+        self.out_period = self.out_block / out_rate
+
+        self.input_timer = CallbackTimer("input", self.in_period)
+        self.output_timer = CallbackTimer("output", self.out_period)
+
+        # 预生成输入信号（语音频段正弦 + 噪声），按块循环使用
+        t = np.arange(int(in_rate * 2)) / in_rate
+        mono = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.01 * np.random.default_rng(
+            0
+        ).standard_normal(len(t))
+        self.input_signal = np.repeat(
+            mono.astype(np.float32)[:, None], self.input_stream.channels, axis=1
+        )
+        self.outdata = np.zeros(
+            (self.out_block, self.output_stream.channels), dtype=np.float32
+        )
+
+        # 模拟服务端下发的 Opus 包（24kHz 单声道语音）
+        self.packets = self._make_tts_packets()
+
+    def _make_tts_packets(self):
+        import opuslib
+
+        from src.constants.constants import AudioConfig
+
+        encoder = opuslib.Encoder(
+            AudioConfig.OUTPUT_SAMPLE_RATE, 1, opuslib.APPLICATION_AUDIO
+        )
+        size = AudioConfig.OUTPUT_FRAME_SIZE
+        t = np.arange(size * 50) / AudioConfig.OUTPUT_SAMPLE_RATE
+        pcm = (0.2 * np.sin(2 * np.pi * 440 * t) * 32767).astype(np.int16)
+        return [
+            encoder.encode(pcm[i : i + size].tobytes(), size)
+            for i in range(0, len(pcm), size)
+        ]
+
+    def _time_info(self, now: float, period: float):
+        return types.SimpleNamespace(
+            currentTime=now,
+            inputBufferAdcTime=now - period,
+            outputBufferDacTime=now + 2 * period,
+        )
+
+    def run(self, measure_alloc: bool = False) -> dict:
+        """驱动回调直到模拟时长结束.
+
+        Args:
+            measure_alloc: 是否测量每次回调的临时分配（会显著拖慢执行）
+
+        Returns:
+            dict: 分配统计（仅 measure_alloc 时）与实际耗时
+        """
+        from src.audio_codecs.jitter_buffer import JitterAction
+        from src.constants.constants import AudioConfig
+
+        codec = self.codec
+        frame_period = AudioConfig.FRAME_DURATION / 1000
+        next_in = next_out = next_packet = 0.0
+        packet_index = 0
+        in_pos = 0
+        alloc = {"input": [], "output": []}
+
+        wall_start = time.perf_counter()
+        while min(next_in, next_out) < self.seconds:
+            now = min(next_in, next_out, next_packet)
+
+            # 服务端下发：按实时节奏，tts_ratio 比例的时间有语音
+            if now == next_packet:
+                cycle = (packet_index * frame_period) % 10.0
+                if cycle < 10.0 * self.tts_ratio:
+                    packet = self.packets[packet_index % len(self.packets)]
+                    codec._decode_to_playout(JitterAction.FRAME, packet)
+                packet_index += 1
+                next_packet += frame_period
+                continue
+
+            if now == next_in:
+                end = in_pos + self.in_block
+                if end > len(self.input_signal):
+                    in_pos, end = 0, self.in_block
+                indata = self.input_signal[in_pos:end]
+                in_pos = end
+                info = self._time_info(now, self.in_period)
+                self._call(
+                    self.input_timer, alloc["input"] if measure_alloc else None,
+                    codec._input_callback, indata, self.in_block, info, None,
+                )
+                next_in += self.in_period
+            else:
+                info = self._time_info(now, self.out_period)
+                self._call(
+                    self.output_timer, alloc["output"] if measure_alloc else None,
+                    codec._output_callback, self.outdata, self.out_block, info, None,
+                )
+                next_out += self.out_period
+
+            if self.speed > 0:
+                # 按倍速限制节奏（0 表示尽可能快）
+                target = wall_start + now / self.speed
+                delay = target - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        wall = time.perf_counter() - wall_start
+        return {"wall": wall, "alloc": alloc}
+
+    def _call(self, timer, alloc_samples, callback, *args):
+        if alloc_samples is not None:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            callback(*args)
+            alloc_samples.append(tracemalloc.get_traced_memory()[1] - before)
+            return
+        start = time.perf_counter()
+        callback(*args)
+        timer.record(time.perf_counter() - start)
+
+
+async def create_codec(args):
+    """
+    按参数创建 AudioCodec（跳过设备探测，使用模拟流）
+    """
+    from src.audio_codecs.audio_codec import AudioCodec
+    from src.constants.constants import AudioConfig
+
+    codec = AudioCodec()
+    codec.device_input_sample_rate = args.input_rate
+    codec.device_output_sample_rate = args.output_rate
+    codec.input_channels = args.input_channels
+    codec.output_channels = args.output_channels
+    codec._device_input_frame_size = args.blocksize or int(
+        args.input_rate * AudioConfig.FRAME_DURATION / 1000
+    )
+    codec._device_output_frame_size = args.blocksize or int(
+        args.output_rate * AudioConfig.FRAME_DURATION / 1000
+    )
+
+    await codec._create_opus_codecs()
+    await codec._create_resamplers()
+    codec._start_capture_worker()
+    await codec._create_streams()
+
+    encoded = {"frames": 0, "bytes": 0}
+
+    def on_encoded(data: bytes):
+        encoded["frames"] += 1
+        encoded["bytes"] += len(data)
+
+    codec.set_encoded_callback(on_encoded)
+    # 一个帧订阅者，模拟唤醒词检测器读取
+    subscription = codec.subscribe_frames("benchmark")
+    return codec, encoded, subscription
+
+
+def wait_capture_drained(codec, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if codec.get_capture_stats()["backlog"] == 0:
+            return
+        time.sleep(0.01)
+
+
+async def run_benchmark(args) -> int:
+    install_simulated_backend()
+
+    codec, encoded, subscription = await create_codec(args)
+    try:
+        device = SimulatedDevice(codec, args.seconds, args.speed, args.tts_ratio)
+
+        # 第一轮：计时
+        result = device.run()
+        wait_capture_drained(codec)
+        while subscription.read() is not None:
+            pass
+
+        # 第二轮：短时测量临时分配
+        alloc_device = SimulatedDevice(
+            codec, min(args.seconds, args.alloc_seconds), 0, args.tts_ratio
+        )
+        tracemalloc.start()
+        alloc_result = alloc_device.run(measure_alloc=True)
+        tracemalloc.stop()
+        wait_capture_drained(codec)
+
+        capture = codec.get_capture_stats()
+        playout = codec.get_playout_stats()
+
+        print("=" * 72)
+        print(
+            f"输入 {args.input_rate}Hz {args.input_channels}ch | "
+            f"输出 {args.output_rate}Hz {args.output_channels}ch | "
+            f"blocksize in={device.in_block} out={device.out_block}"
+        )
+        print("-" * 72)
+        print(device.input_timer.summary())
+        print(device.output_timer.summary())
+        print("-" * 72)
+        for name, samples in alloc_result["alloc"].items():
+            if samples:
+                data = np.array(samples)
+                print(
+                    f"{name:<8} 每次回调临时分配: 平均 {data.mean():8.0f}B "
+                    f"P95 {np.percentile(data, 95):8.0f}B 最大 {data.max():8.0f}B"
+                )
+        print("-" * 72)
+        print(
+            f"xrun: 输入超时 {device.input_timer.deadline_misses} | "
+            f"输出超时 {device.output_timer.deadline_misses} | "
+            f"输入溢出丢块 {capture['dropped_blocks']} | "
+            f"播放欠载 {playout['underruns']}"
+        )
+        print(
+            "采集阶段耗时(ms): "
+            + ", ".join(
+                f"{k}={v['avg_ms']:.3f}/{v['max_ms']:.3f}"
+                for k, v in capture["stages"].items()
+            )
+            + f" | 积压峰值 {capture['backlog_peak']} 块"
+        )
+        print(
+            f"吞吐: 模拟 {args.seconds:.1f}s 用时 {result['wall']:.2f}s "
+            f"({args.seconds / result['wall']:.1f}x 实时) | "
+            f"编码 {encoded['frames']} 帧 {encoded['bytes']} 字节 | "
+            f"订阅者丢帧 {subscription.dropped}"
+        )
+        print("=" * 72)
+    finally:
+        await codec.close()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="音频热路径基准（模拟声卡）")
+    parser.add_argument("--input-rate", type=int, default=48000)
+    parser.add_argument("--input-channels", type=int, default=2)
+    parser.add_argument("--output-rate", type=int, default=48000)
+    parser.add_argument("--output-channels", type=int, default=2)
+    parser.add_argument(
+        "--blocksize", type=int, default=0, help="每次回调帧数，0 表示一个协议帧"
+    )
+    parser.add_argument("--seconds", type=float, default=30.0, help="模拟音频时长")
+    parser.add_argument(
+        "--speed", type=float, default=0.0, help="倍速（0 表示尽可能快）"
+    )
+    parser.add_argument(
+        "--tts-ratio", type=float, default=0.5, help="有下行语音的时间比例"
+    )
+    parser.add_argument(
+        "--alloc-seconds", type=float, default=5.0, help="分配测量轮的模拟时长"
+    )
+    args = parser.parse_args()
+
+    from src.utils.logging_config import setup_logging
+
+    setup_logging()
+    return asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""协议/MCP JSON 编解码微基准.
+
+按真实消息形态对比每条消息的处理耗时：
+1. legacy: 原实现的编解码序列（标准库 json，含多余的编码→解码往返）
+   - tools/call: 解析请求 → 工具结果 dumps → loads → 为记录长度再 dumps 一次
+     → 响应 dumps → send_mcp_message 再 loads → 外层消息 dumps
+   - tools/list: 每个工具 dumps 测长度 → 响应 dumps → loads → 外层 dumps
+   - iot states: 状态列表 dumps → send_iot_states 再 loads → 外层 dumps
+2. single/json: 去掉往返后每条消息只解码、编码各一次（标准库紧凑编码）
+3. single/orjson: 同上，使用 orjson（未安装时跳过）
+
+用法:
+    python scripts/benchmark_json_codec.py [--iterations 20000]
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from src.utils import json_codec  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SESSION_ID = "5f0c8e4a-3b9e-4b8f-9d0c-2c1f7e6a9b10"
+
+
+def make_tools(count: int = 30) -> list:
+    """
+    构造与本项目工具描述规模相当的工具列表.
+    """
+    tools = []
+    for i in range(count):
+        tools.append(
+            {
+                "name": f"self.category_{i % 6}.tool_{i}",
+                "description": (
+                    "根据用户的语音指令执行相应操作。参数说明：target 为目标对象名称，"
+                    "value 为设置值（0-100），mode 可选 auto/manual。"
+                    "Use this tool when the user asks to adjust device settings."
+                ),
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "target": {"type": "string"},
+                        "value": {"type": "integer", "minimum": 0, "maximum": 100},
+                        "mode": {"type": "string"},
+                    },
+                    "required": ["target"],
+                },
+            }
+        )
+    return tools
+
+
+def make_messages() -> dict:
+    status = {
+        "audio_speaker": {"volume": 65, "muted": False},
+        "application": {"device_state": "listening", "iot_devices": 3},
+        "network": {"connected": True, "rtt_ms": 42.5},
+        "calendar": [
+            {"title": f"会议 {i}", "start": "2025-06-01 09:00"} for i in range(8)
+        ],
+    }
+    call_request = {
+        "session_id": SESSION_ID,
+        "type": "mcp",
+        "payload": {
+            "jsonrpc": "2.0",
+            "id": 7,
+            "method": "tools/call",
+            "params": {
+                "name": "self.get_device_status",
+                "arguments": {"detail": True},
+            },
+        },
+    }
+    call_result = {
+        "content": [{"type": "text", "text": json.dumps(status, ensure_ascii=False)}],
+        "isError": False,
+    }
+    states = [
+        {"name": f"Thing{i}", "state": {"power": i % 2 == 0, "level": i * 7}}
+        for i in range(6)
+    ]
+    return {
+        "call_request_text": json.dumps(call_request),
+        "call_result": call_result,
+        "tools": make_tools(),
+        "states": states,
+    }
+
+
+# -------------------------
+# 原实现
+# -------------------------
+def legacy_tools_call(messages: dict) -> str:
+    data = json.loads(messages["call_request_text"])
+    request_id = data["payload"]["id"]
+    result = json.dumps(messages["call_result"])  # McpTool.call
+    parsed = json.loads(result)  # _handle_tool_call
+    len(json.dumps(parsed))  # _reply_result 记录长度
+    payload = json.dumps({"jsonrpc": "2.0", "id": request_id, "result": parsed})
+    payload_data = json.loads(payload)  # send_mcp_message
+    return json.dumps(
+        {"session_id": SESSION_ID, "type": "mcp", "payload": payload_data}
+    )
+
+
+def legacy_tools_list(messages: dict) -> str:
+    tools = []
+    for tool in messages["tools"]:
+        len(json.dumps(tool))
+        tools.append(tool)
+    payload = json.dumps({"jsonrpc": "2.0", "id": 2, "result": {"tools": tools}})
+    payload_data = json.loads(payload)
+    return json.dumps(
+        {"session_id": SESSION_ID, "type": "mcp", "payload": payload_data}
+    )
+
+
+def legacy_iot_states(messages: dict) -> str:
+    states_json = json.dumps(messages["states"])  # get_states_json
+    states = json.loads(states_json)  # send_iot_states
+    return json.dumps(
+        {"session_id": SESSION_ID, "type": "iot", "update": True, "states": states}
+    )
+
+
+# -------------------------
+# 去掉往返后的实现
+# -------------------------
+def make_single(dumps, loads, dumps_bytes):
+    def tools_call(messages: dict):
+        data = loads(messages["call_request_text"])
+        payload = {
+            "jsonrpc": "2.0",
+            "id": data["payload"]["id"],
+            "result": messages["call_result"],
+        }
+        return dumps({"session_id": SESSION_ID, "type": "mcp", "payload": payload})
+
+    def tools_list(messages: dict):
+        tools = []
+        for tool in messages["tools"]:
+            len(dumps_bytes(tool))
+            tools.append(tool)
+        payload = {"jsonrpc": "2.0", "id": 2, "result": {"tools": tools}}
+        return dumps({"session_id": SESSION_ID, "type": "mcp", "payload": payload})
+
+    def iot_states(messages: dict):
+        return dumps(
+            {
+                "session_id": SESSION_ID,
+                "type": "iot",
+                "update": True,
+                "states": messages["states"],
+            }
+        )
+
+    return {
+        "tools/call": tools_call,
+        "tools/list": tools_list,
+        "iot states": iot_states,
+    }
+
+
+def bench(func, messages: dict, iterations: int) -> float:
+    func(messages)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(messages)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="协议/MCP JSON 编解码微基准")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    messages = make_messages()
+    encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    implementations = {
+        "legacy": {
+            "tools/call": legacy_tools_call,
+            "tools/list": legacy_tools_list,
+            "iot states": legacy_iot_states,
+        },
+        "single/json": make_single(
+            encoder.encode, json.loads, lambda o: encoder.encode(o).encode("utf-8")
+        ),
+    }
+    if orjson is not None:
+        implementations["single/orjson"] = make_single(
+            lambda o: orjson.dumps(o).decode("utf-8"), orjson.loads, orjson.dumps
+        )
+    else:
+        print("未安装 orjson，跳过 single/orjson")
+
+    print(f"平台: {platform.machine()} / Python {platform.python_version()}")
+    print(f"json_codec 当前后端: {json_codec.BACKEND}")
+    sizes = {
+        name: len(func(messages).encode("utf-8"))
+        for name, func in implementations["legacy"].items()
+    }
+    print(f"{'message':>12} {'bytes':>7} {'impl':>14} {'us/msg':>9} {'speedup':>8}")
+    for name in implementations["legacy"]:
+        baseline = None
+        for impl, funcs in implementations.items():
+            seconds = bench(funcs[name], messages, args.iterations)
+            baseline = baseline or seconds
+            print(
+                f"{name:>12} {sizes[name]:>7} {impl:>14} {seconds * 1e6:>9.2f} "
+                f"{baseline / seconds:>7.2f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""MQTT/UDP 音频发送路径微基准.
+
+对比每包 CPU 时间（time.process_time，含加密、封包和系统调用）：
+1. legacy: 原 MqttProtocol.send_audio 实现，每包拼接十六进制 nonce、
+   bytes.fromhex 解码密钥、新建 AES-CTR Cipher，阻塞 socket.sendto
+2. cached: UdpAudioCipher 预分配包缓冲 + 复用 AES 上下文，asyncio 数据报传输发送
+3. mmsg: 同 cached，按批一次 sendmmsg 系统调用发出（仅 Linux）
+
+数据包发往本机回环端口（接收端不读取，缓冲满后由内核丢弃），只衡量发送侧开销。
+ARM 设备（如树莓派）的数据需在设备上运行本脚本获得。
+
+用法:
+    python scripts/benchmark_mqtt_udp.py [--iterations 20000] [--batch 5]
+"""
+
+import argparse
+import asyncio
+import os
+import platform
+import socket
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from cryptography.hazmat.backends import default_backend  # noqa: E402
+from cryptography.hazmat.primitives.ciphers import (  # noqa: E402
+    Cipher,
+    algorithms,
+    modes,
+)
+
+from src.protocols.udp_audio import (  # noqa: E402
+    MmsgSender,
+    UdpAudioCipher,
+    flush_packets,
+)
+
+
+def bench_legacy(sock, addr, key_hex, nonce_hex, payload, iterations):
+    """
+    原实现：逐包十六进制拼接 nonce 并新建 Cipher.
+    """
+    sequence = 0
+    start = time.process_time()
+    for _ in range(iterations):
+        sequence = (sequence + 1) & 0xFFFFFFFF
+        new_nonce = (
+            nonce_hex[:4]
+            + format(len(payload), "04x")
+            + nonce_hex[8:24]
+            + format(sequence, "08x")
+        )
+        encryptor = Cipher(
+            algorithms.AES(bytes.fromhex(key_hex)),
+            modes.CTR(bytes.fromhex(new_nonce)),
+            backend=default_backend(),
+        ).encryptor()
+        encrypted = encryptor.update(bytes(payload)) + encryptor.finalize()
+        sock.sendto(bytes.fromhex(new_nonce) + encrypted, addr)
+    return time.process_time() - start
+
+
+def bench_cached(transport, key_hex, nonce_hex, payload, iterations):
+    """
+    新实现：预分配包缓冲 + 复用 AES 上下文 + 数据报传输.
+    """
+    cipher = UdpAudioCipher(key_hex, nonce_hex)
+    start = time.process_time()
+    for _ in range(iterations):
+        transport.sendto(cipher.seal(payload))
+    return time.process_time() - start
+
+
+def bench_mmsg(transport, key_hex, nonce_hex, payload, iterations, batch):
+    """
+    新实现 + sendmmsg 批量发送.
+    """
+    cipher = UdpAudioCipher(key_hex, nonce_hex, slots=batch)
+    sender = MmsgSender(cipher.slot_addresses)
+    packets = []
+    start = time.process_time()
+    for _ in range(iterations // batch):
+        packets.clear()
+        for slot in range(batch):
+            packets.append(cipher.seal(payload, slot))
+        flush_packets(transport, packets, sender)
+    return time.process_time() - start
+
+
+async def run(iterations: int, batch: int, sizes):
+    loop = asyncio.get_running_loop()
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    addr = sink.getsockname()
+
+    legacy_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    legacy_sock.settimeout(0.5)
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol, remote_addr=addr
+    )
+
+    key_hex = os.urandom(16).hex()
+    nonce_hex = os.urandom(16).hex()
+    print(f"平台: {platform.machine()} / Python {platform.python_version()}")
+    print(f"{'payload':>8} {'impl':>8} {'us/packet':>10} {'speedup':>8}")
+    try:
+        for size in sizes:
+            payload = os.urandom(size)
+            results = {
+                "legacy": bench_legacy(
+                    legacy_sock, addr, key_hex, nonce_hex, payload, iterations
+                ),
+                "cached": bench_cached(
+                    transport, key_hex, nonce_hex, payload, iterations
+                ),
+            }
+            packets = iterations
+            if MmsgSender.is_available():
+                results["mmsg"] = bench_mmsg(
+                    transport, key_hex, nonce_hex, payload, iterations, batch
+                )
+            baseline = results["legacy"] / packets
+            for name, seconds in results.items():
+                count = packets if name != "mmsg" else iterations // batch * batch
+                per_packet = seconds / count
+                print(
+                    f"{size:>8} {name:>8} {per_packet * 1e6:>10.2f} "
+                    f"{baseline / per_packet:>7.2f}x"
+                )
+    finally:
+        transport.close()
+        legacy_sock.close()
+        sink.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MQTT/UDP 音频发送路径微基准")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--batch", type=int, default=5, help="sendmmsg 每批包数")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[60, 120, 240],
+        help="Opus 负载字节数（60ms 帧约 60~240 字节）",
+    )
+    args = parser.parse_args()
+
+    if not MmsgSender.is_available():
+        print("当前平台不支持 sendmmsg，跳过批量发送测试")
+    asyncio.run(run(args.iterations, max(1, args.batch), args.sizes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
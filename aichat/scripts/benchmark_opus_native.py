@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Opus 编解码调用层微基准.
+
+对比三种方式在 16kHz / 24kHz、20/40/60ms 帧长下的每帧耗时和临时分配：
+1. opuslib: encode(pcm.tobytes()) 返回新 bytes，decode 结果再 np.frombuffer
+   （原 AudioCodec 实现）
+2. native: NativeOpusEncoder/Decoder 直接读写 NumPy 数组，输出复用缓冲区
+3. batch: encode_batch / decode_batch 一次调用处理多帧
+
+用法:
+    python scripts/benchmark_opus_native.py [--iterations 2000] [--batch 10]
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from src.utils.opus_loader import setup_opus  # noqa: E402
+
+setup_opus()
+
+from src.audio_codecs import opus_native  # noqa: E402
+
+try:
+    import opuslib
+except ImportError:
+    opuslib = None
+
+
+def make_frames(sample_rate: int, frame_size: int, count: int) -> np.ndarray:
+    """
+    生成多帧语音频段的测试信号.
+    """
+    t = np.arange(frame_size * count) / sample_rate
+    signal = 0.3 * np.sin(2 * np.pi * 220 * t) + 0.2 * np.sin(2 * np.pi * 1250 * t)
+    noise = np.random.default_rng(0).standard_normal(len(t)) * 0.02
+    return ((signal + noise) * 32767 * 0.5).astype(np.int16).reshape(count, -1)
+
+
+def bench_opuslib(sample_rate, frame_size, frames):
+    encoder = opuslib.Encoder(sample_rate, 1, opuslib.APPLICATION_VOIP)
+    decoder = opuslib.Decoder(sample_rate, 1)
+    count = len(frames)
+
+    def step(i):
+        packet = encoder.encode(frames[i % count].tobytes(), frame_size)
+        return np.frombuffer(decoder.decode(packet, frame_size), dtype=np.int16)
+
+    return step
+
+
+def bench_native(sample_rate, frame_size, frames):
+    encoder = opus_native.NativeOpusEncoder(sample_rate, 1)
+    decoder = opus_native.NativeOpusDecoder(sample_rate, 1)
+    count = len(frames)
+
+    def step(i):
+        packet = bytes(encoder.encode(frames[i % count]))
+        return decoder.decode(packet, frame_size)
+
+    return step
+
+
+def bench_batch(sample_rate, frame_size, frames, batch):
+    encoder = opus_native.NativeOpusEncoder(sample_rate, 1)
+    decoder = opus_native.NativeOpusDecoder(sample_rate, 1)
+    block = np.ascontiguousarray(frames[:batch])
+    packets_out = np.zeros((batch, opus_native.MAX_PACKET_BYTES), dtype=np.uint8)
+    lengths = np.zeros(batch, dtype=np.int32)
+    pcm_out = np.zeros(batch * frame_size, dtype=np.int16)
+    packets = [None] * batch
+
+    def step(i):
+        encoder.encode_batch(block, packets_out, lengths)
+        for index in range(batch):
+            packets[index] = packets_out[index, : lengths[index]].tobytes()
+        return decoder.decode_batch(packets, pcm_out, frame_size)
+
+    return step
+
+
+def measure(step, iterations: int, frames_per_step: int):
+    """测量每帧耗时（微秒）和每帧临时分配（字节）.
+
+    Returns:
+        (us_per_frame, bytes_per_frame)
+    """
+    for i in range(20):
+        step(i)
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        step(i)
+    elapsed = time.perf_counter() - start
+
+    alloc_steps = min(iterations, 200)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    peak = 0
+    for i in range(alloc_steps):
+        tracemalloc.reset_peak()
+        step(i)
+        peak += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    frames = iterations * frames_per_step
+    return elapsed / frames * 1e6, peak / (alloc_steps * frames_per_step)
+
+
+def run(iterations: int, batch: int):
+    print(
+        f"{'rate':>6} {'frame':>6} {'impl':>8} {'us/frame':>10} "
+        f"{'alloc B/frame':>14} {'speedup':>8}"
+    )
+    for sample_rate in (16000, 24000):
+        for frame_ms in (20, 40, 60):
+            frame_size = sample_rate * frame_ms // 1000
+            frames = make_frames(sample_rate, frame_size, max(batch, 50))
+
+            results = {}
+            if opuslib is not None:
+                results["opuslib"] = measure(
+                    bench_opuslib(sample_rate, frame_size, frames),
+                    iterations,
+                    1,
+                )
+            results["native"] = measure(
+                bench_native(sample_rate, frame_size, frames),
+                iterations,
+                1,
+            )
+            results["batch"] = measure(
+                bench_batch(sample_rate, frame_size, frames, batch),
+                max(1, iterations // batch),
+                batch,
+            )
+
+            baseline = results.get("opuslib", results["native"])[0]
+            for name, (us, alloc) in results.items():
+                print(
+                    f"{sample_rate:>6} {frame_ms:>4}ms {name:>8} {us:>10.1f} "
+                    f"{alloc:>14.0f} {baseline / us:>7.2f}x"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Opus 编解码调用层微基准")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=10, help="批量接口每次帧数")
+    args = parser.parse_args()
+
+    if not opus_native.is_available():
+        print("无法加载 libopus")
+        return 1
+    if opuslib is None:
+        print("未安装 opuslib，仅测试原生调用层")
+
+    run(args.iterations, args.batch)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""Vosk 唤醒词模式对比基准.
+
+对同一组 WAV 分别用 open（开放词表，仅最终结果）与 grammar（唤醒词+垃圾词语法，
+稳定的部分结果）两种模式离线解码，按采集帧大小逐块送入识别器，统计：
+- 检出率（正样本）与误唤醒次数（负样本）
+- 检出延迟：检出时刻减去语音结束时刻（按能量估计，负值表示语音未结束即检出）
+- 识别器 CPU 时间 / 每秒音频，以及单块最大耗时
+
+WAV 需为 16kHz 单声道 16bit；结尾自动补静音，使 open 模式也能等到端点。
+
+用法:
+    python scripts/benchmark_vosk_wake_word.py --model models/vosk-model-vi \\
+        --wav samples/wake/*.wav [--negatives samples/noise/*.wav] [--json]
+"""
+
+import argparse
+import json
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from src.audio_processing.vosk_wake_word import (  # noqa: E402
+    VOSK_AVAILABLE,
+    VoskPhraseDecoder,
+)
+from src.constants.constants import AudioConfig  # noqa: E402
+from src.utils.turn_tracer import summarize  # noqa: E402
+
+SAMPLE_RATE = AudioConfig.INPUT_SAMPLE_RATE
+
+
+def load_wav(path: Path) -> np.ndarray:
+    """
+    读取 16kHz 单声道 int16 WAV.
+    """
+    with wave.open(str(path), "rb") as wf:
+        if (
+            wf.getframerate() != SAMPLE_RATE
+            or wf.getnchannels() != 1
+            or wf.getsampwidth() != 2
+        ):
+            raise ValueError(f"{path}: 需要 {SAMPLE_RATE}Hz 单声道 16bit WAV")
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def speech_end_ms(samples: np.ndarray, frame: int, threshold_db: float) -> float:
+    """
+    估计语音结束时刻：最后一个能量超过阈值的块的结束位置.
+    """
+    end = 0
+    for start in range(0, len(samples), frame):
+        chunk = samples[start : start + frame].astype(np.float32) / 32768.0
+        rms = float(np.sqrt(np.mean(chunk * chunk))) if len(chunk) else 0.0
+        if rms > 0 and 20 * np.log10(rms) > threshold_db:
+            end = start + len(chunk)
+    return end * 1000.0 / SAMPLE_RATE
+
+
+def run_file(decoder: VoskPhraseDecoder, samples: np.ndarray, frame: int) -> dict:
+    """
+    逐块解码一个文件，首次检出即停止（与检测器检出后重置一致）.
+    """
+    decoder.reset()
+    cpu_s = 0.0
+    max_chunk_ms = 0.0
+    detected_ms = None
+    source = None
+    fed = 0
+    for start in range(0, len(samples), frame):
+        chunk = samples[start : start + frame]
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        hit = decoder.accept(chunk.tobytes())
+        cpu_s += time.thread_time() - cpu_start
+        max_chunk_ms = max(max_chunk_ms, (time.perf_counter() - wall_start) * 1000)
+        fed += len(chunk)
+        if hit:
+            detected_ms = fed * 1000.0 / SAMPLE_RATE
+            source = hit[2]
+            break
+    return {
+        "audio_s": fed / SAMPLE_RATE,
+        "cpu_s": cpu_s,
+        "max_chunk_ms": max_chunk_ms,
+        "detected_ms": detected_ms,
+        "source": source,
+    }
+
+
+def run_mode(mode: str, model, args, positives: list, negatives: list) -> dict:
+    decoder = VoskPhraseDecoder(
+        model,
+        args.phrases,
+        mode=mode,
+        min_confidence=args.min_confidence,
+        partial_stable=args.partial_stable,
+    )
+    frame = SAMPLE_RATE * args.frame_ms // 1000
+    tail = np.zeros(SAMPLE_RATE * args.tail_ms // 1000, dtype=np.int16)
+
+    audio_s = cpu_s = max_chunk_ms = 0.0
+    latencies = []
+    partial_hits = 0
+    misses = []
+    for path, samples in positives:
+        end_ms = speech_end_ms(samples, frame, args.speech_db)
+        result = run_file(decoder, np.concatenate([samples, tail]), frame)
+        audio_s += result["audio_s"]
+        cpu_s += result["cpu_s"]
+        max_chunk_ms = max(max_chunk_ms, result["max_chunk_ms"])
+        if result["detected_ms"] is None:
+            misses.append(path.name)
+            continue
+        latencies.append(result["detected_ms"] - end_ms)
+        partial_hits += result["source"] == "partial"
+
+    false_triggers = []
+    for path, samples in negatives:
+        result = run_file(decoder, np.concatenate([samples, tail]), frame)
+        audio_s += result["audio_s"]
+        cpu_s += result["cpu_s"]
+        max_chunk_ms = max(max_chunk_ms, result["max_chunk_ms"])
+        if result["detected_ms"] is not None:
+            false_triggers.append(path.name)
+
+    return {
+        "mode": mode,
+        "detected": len(latencies),
+        "positives": len(positives),
+        "partial_detections": partial_hits,
+        "misses": misses,
+        "false_triggers": false_triggers,
+        "negatives": len(negatives),
+        "latency_after_speech_ms": summarize(latencies) if latencies else None,
+        "cpu_per_audio_s": cpu_s / audio_s if audio_s else 0.0,
+        "max_chunk_ms": max_chunk_ms,
+        "rejected_low_confidence": decoder.rejected,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vosk 唤醒词模式对比基准")
+    parser.add_argument("--model", required=True, help="Vosk 模型目录")
+    parser.add_argument("--wav", nargs="+", required=True, help="含唤醒词的 WAV")
+    parser.add_argument("--negatives", nargs="*", default=[], help="不含唤醒词的 WAV")
+    parser.add_argument("--phrases", nargs="+", default=["hello"], help="唤醒词")
+    parser.add_argument("--modes", nargs="+", default=list(VoskPhraseDecoder.MODES))
+    parser.add_argument("--min-confidence", type=float, default=0.6)
+    parser.add_argument("--partial-stable", type=int, default=2)
+    parser.add_argument(
+        "--frame-ms", type=int, default=AudioConfig.FRAME_DURATION, help="送入块长"
+    )
+    parser.add_argument("--tail-ms", type=int, default=1500, help="结尾补静音")
+    parser.add_argument(
+        "--speech-db", type=float, default=-40.0, help="语音结束估计的能量阈值"
+    )
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args()
+
+    if not VOSK_AVAILABLE:
+        print("未安装 vosk: pip install vosk")
+        return 1
+
+    from vosk import Model, SetLogLevel
+
+    SetLogLevel(-1)
+    model = Model(args.model)
+    positives = [(Path(p), load_wav(Path(p))) for p in args.wav]
+    negatives = [(Path(p), load_wav(Path(p))) for p in args.negatives]
+
+    results = [run_mode(m, model, args, positives, negatives) for m in args.modes]
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0
+
+    print(
+        f"{'mode':>8} {'detected':>9} {'partial':>8} {'false':>6} "
+        f"{'lat_p50':>8} {'lat_p95':>8} {'cpu/s':>7} {'max_ms':>7}"
+    )
+    for r in results:
+        lat = r["latency_after_speech_ms"] or {
+            "p50_ms": float("nan"),
+            "p95_ms": float("nan"),
+        }
+        print(
+            f"{r['mode']:>8} {r['detected']:>4}/{r['positives']:<4} "
+            f"{r['partial_detections']:>8} {len(r['false_triggers']):>6} "
+            f"{lat['p50_ms']:>8.0f} {lat['p95_ms']:>8.0f} "
+            f"{r['cpu_per_audio_s']:>7.3f} {r['max_chunk_ms']:>7.1f}"
+        )
+        if r["misses"]:
+            print(f"{'':>8} 漏检: {', '.join(r['misses'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
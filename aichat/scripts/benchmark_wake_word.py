@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""唤醒词引擎准确率/延迟基准（带标注的 WAV 语料，A/B 配置对比）.
+
+按采集帧大小把目录下的 WAV 依次发布到帧广播，经与 AudioCodec 相同的
+subscribe_frames 接口送入真实的 WakeWordDetector / VoskWakeWordDetector，
+以检测器能达到的最快速度运行（不按实时节奏），统计：
+- 命中率：标注的唤醒词在 [起点, 终点 + 容差] 内被检出的比例
+- 检出延迟：检出时刻减去标注终点（毫秒，负值表示词未说完即检出）
+- 每小时误唤醒：不落在任何标注窗口内的检出（按音频时间合并相邻重复）
+- 每小时音频消耗的 CPU 秒数（进程 CPU，含引擎内部线程）
+
+标注文件为 CSV，每行一个唤醒词：文件相对路径,起点秒,终点秒；
+未出现在标注中的 WAV 视为负样本。WAV 需为 16kHz 单声道 16bit。
+
+检出时刻按检测器订阅已读取的帧数计算，精度约一帧。运行期间检测器自身的
+冷却时间（按挂钟计时）被关闭，重复检出改为按音频时间合并。
+
+用法:
+    python scripts/benchmark_wake_word.py --corpus samples/wake \\
+        --variant sherpa-t2=sherpa,WAKE_WORD_OPTIONS.NUM_THREADS=2 \\
+        --variant sherpa-t4=sherpa,WAKE_WORD_OPTIONS.NUM_THREADS=4 \\
+        --variant vosk-grammar=vosk,WAKE_WORD_OPTIONS.VOSK_MODE=grammar
+
+    变体也可以写在 JSON 文件中（--variants-file）：
+    [{"name": "...", "engine": "sherpa|vosk", "config": {"A.B": 1}}]
+"""
+
+import argparse
+import asyncio
+import bisect
+import copy
+import csv
+import json
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from src.audio_codecs.frame_broadcast import FrameBroadcaster  # noqa: E402
+from src.constants.constants import AudioConfig  # noqa: E402
+from src.utils.config_manager import ConfigManager  # noqa: E402
+from src.utils.turn_tracer import summarize  # noqa: E402
+
+SAMPLE_RATE = AudioConfig.INPUT_SAMPLE_RATE
+ENGINES = ("sherpa", "vosk")
+
+
+class FrameSource:
+    """
+    代替 AudioCodec 的帧源，只提供检测器使用的帧订阅接口.
+    """
+
+    def __init__(self):
+        self.broadcaster = FrameBroadcaster(capacity=100)
+        self.subscription = None
+
+    def subscribe_frames(self, name: str):
+        self.subscription = self.broadcaster.subscribe(name)
+        return self.subscription
+
+    def unsubscribe_frames(self, subscription):
+        self.broadcaster.unsubscribe(subscription)
+
+
+def load_wav(path: Path) -> np.ndarray:
+    """
+    读取 16kHz 单声道 int16 WAV.
+    """
+    with wave.open(str(path), "rb") as wf:
+        if (
+            wf.getframerate() != SAMPLE_RATE
+            or wf.getnchannels() != 1
+            or wf.getsampwidth() != 2
+        ):
+            raise ValueError(f"{path}: 需要 {SAMPLE_RATE}Hz 单声道 16bit WAV")
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def load_labels(path: Path) -> dict:
+    """读取标注 CSV（文件,起点秒,终点秒），跳过表头和 # 注释行.
+
+    Returns:
+        dict: 文件相对路径 -> [(起点秒, 终点秒), ...]
+    """
+    labels = {}
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                start, end = float(row[1]), float(row[2])
+            except (IndexError, ValueError):
+                continue  # 表头或格式错误的行
+            labels.setdefault(row[0].strip(), []).append((start, end))
+    return labels
+
+
+def parse_value(text: str):
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return text
+
+
+def parse_variant(spec: str) -> dict:
+    """
+    解析 name=engine[,KEY=VALUE...] 形式的变体.
+    """
+    name, _, rest = spec.partition("=")
+    engine, *pairs = rest.split(",")
+    config = {}
+    for pair in pairs:
+        key, _, value = pair.partition("=")
+        config[key.strip()] = parse_value(value.strip())
+    return {"name": name, "engine": engine, "config": config}
+
+
+def apply_overrides(config: ConfigManager, overrides: dict):
+    """
+    在内存中覆盖配置项（不写回配置文件，update_config 会持久化）.
+    """
+    for path, value in overrides.items():
+        current = config._config
+        *parts, last = path.split(".")
+        for part in parts:
+            current = current.setdefault(part, {})
+        current[last] = value
+
+
+def create_detector(engine: str):
+    if engine == "vosk":
+        from src.audio_processing.vosk_wake_word import VoskWakeWordDetector
+
+        return VoskWakeWordDetector()
+    from src.audio_processing.wake_word_detect import WakeWordDetector
+
+    return WakeWordDetector()
+
+
+def build_stream(files: list, gap_ms: int, frame: int):
+    """拼接语料：每个文件后补静音，整体补齐到整帧.
+
+    Returns:
+        (样本, 各文件起点秒列表)
+    """
+    gap = np.zeros(SAMPLE_RATE * gap_ms // 1000, dtype=np.int16)
+    parts, offsets, position = [], [], 0
+    for _, samples in files:
+        offsets.append(position / SAMPLE_RATE)
+        parts.extend([samples, gap])
+        position += len(samples) + len(gap)
+    stream = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
+    pad = (-len(stream)) % frame
+    return np.concatenate([stream, np.zeros(pad, dtype=np.int16)]), offsets
+
+
+async def run_variant(variant: dict, files: list, labels: dict, args) -> dict:
+    config = ConfigManager.get_instance()
+    saved = copy.deepcopy(config._config)
+    apply_overrides(config, {"WAKE_WORD_OPTIONS.USE_WAKE_WORD": True})
+    apply_overrides(config, variant["config"])
+    try:
+        detector = create_detector(variant["engine"])
+    finally:
+        config._config = saved
+    if not getattr(detector, "enabled", False):
+        raise RuntimeError(f"{variant['name']}: 检测器初始化失败")
+
+    frame = AudioConfig.INPUT_FRAME_SIZE
+    stream, offsets = build_stream(files, args.gap_ms, frame)
+    source = FrameSource()
+    detections = []
+
+    async def on_detected(*_):
+        sub = source.subscription
+        consumed = source.broadcaster.published - (sub.lag if sub else 0)
+        detections.append(consumed * frame / SAMPLE_RATE)
+
+    detector.on_detected(on_detected)
+    detector.detection_cooldown = 0.0
+    if not await detector.start(source):
+        raise RuntimeError(f"{variant['name']}: 检测器启动失败")
+
+    subscription = source.subscription
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for start in range(0, len(stream), frame):
+        # 限制积压，避免检测器读取过慢时帧被覆盖
+        while subscription.lag >= args.max_lag:
+            await asyncio.sleep(0.001)
+        source.broadcaster.publish(stream[start : start + frame])
+    while subscription.lag:
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(args.drain_ms / 1000)
+    cpu_s = time.process_time() - cpu_start
+    wall_s = time.perf_counter() - wall_start
+    stats = detector.get_stats() if hasattr(detector, "get_stats") else {}
+    await detector.stop()
+
+    audio_h = len(stream) / SAMPLE_RATE / 3600
+    result = score(variant, files, offsets, labels, detections, audio_h, args)
+    result.update(
+        {
+            "audio_h": audio_h,
+            "cpu_s_per_audio_h": cpu_s / audio_h,
+            "realtime_factor": audio_h * 3600 / wall_s,
+            "gate_duty_cycle": stats.get("gate", {}).get("duty_cycle"),
+        }
+    )
+    return result
+
+
+def score(variant, files, offsets, labels, detections, audio_h, args) -> dict:
+    """
+    将检出时刻与标注窗口匹配，统计命中、延迟与误唤醒.
+    """
+    windows = []
+    for (name, _), offset in zip(files, offsets):
+        for start, end in labels.get(name, []):
+            windows.append([offset + start, offset + end, None])
+
+    false_accepts = []
+    for t in sorted(detections):
+        window = next(
+            (w for w in windows if w[0] <= t <= w[1] + args.tolerance_s), None
+        )
+        if window is not None:
+            if window[2] is None:
+                window[2] = t
+            continue
+        if false_accepts and t - false_accepts[-1][1] < args.merge_s:
+            continue
+        index = bisect.bisect_right(offsets, t) - 1
+        false_accepts.append((files[max(0, index)][0], t))
+
+    latencies = [(w[2] - w[1]) * 1000 for w in windows if w[2] is not None]
+    return {
+        "name": variant["name"],
+        "engine": variant["engine"],
+        "config": variant["config"],
+        "labels": len(windows),
+        "hits": len(latencies),
+        "hit_rate": len(latencies) / len(windows) if windows else 0.0,
+        "latency_ms": summarize(latencies) if latencies else None,
+        "false_accepts": len(false_accepts),
+        "false_accepts_per_hour": len(false_accepts) / audio_h if audio_h else 0.0,
+        "false_accept_files": sorted({name for name, _ in false_accepts}),
+    }
+
+
+def load_corpus(corpus: Path) -> list:
+    return [
+        (path.relative_to(corpus).as_posix(), load_wav(path))
+        for path in sorted(corpus.rglob("*.wav"))
+    ]
+
+
+async def run(args) -> list:
+    variants = [parse_variant(v) for v in args.variant]
+    if args.variants_file:
+        variants += json.loads(Path(args.variants_file).read_text(encoding="utf-8"))
+    if not variants:
+        variants = [{"name": e, "engine": e, "config": {}} for e in ENGINES]
+    for variant in variants:
+        if variant["engine"] not in ENGINES:
+            raise ValueError(f"未知引擎: {variant['engine']}（可选 {ENGINES}）")
+
+    corpus = Path(args.corpus)
+    labels = load_labels(Path(args.labels) if args.labels else corpus / "labels.csv")
+    files = load_corpus(corpus)
+    if not files:
+        raise ValueError(f"{corpus} 下没有 WAV 文件")
+
+    results = []
+    for variant in variants:
+        try:
+            results.append(await run_variant(variant, files, labels, args))
+        except Exception as e:
+            print(f"[{variant['name']}] 跳过: {e}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="唤醒词引擎准确率/延迟基准")
+    parser.add_argument("--corpus", required=True, help="WAV 语料目录（递归）")
+    parser.add_argument("--labels", help="标注 CSV，默认 <corpus>/labels.csv")
+    parser.add_argument(
+        "--variant",
+        action="append",
+        default=[],
+        help="name=engine[,KEY=VALUE...]，可重复",
+    )
+    parser.add_argument("--variants-file", help="变体列表 JSON 文件")
+    parser.add_argument("--gap-ms", type=int, default=1500, help="文件间补静音")
+    parser.add_argument(
+        "--tolerance-s", type=float, default=2.0, help="标注终点后仍算命中的时长"
+    )
+    parser.add_argument(
+        "--merge-s", type=float, default=2.0, help="合并相邻误唤醒的音频时长"
+    )
+    parser.add_argument("--max-lag", type=int, default=8, help="允许积压的帧数")
+    parser.add_argument(
+        "--drain-ms", type=int, default=200, help="送完后等待检测器处理的时长"
+    )
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return 0 if results else 1
+
+    print(
+        f"{'variant':>16} {'hit_rate':>9} {'lat_p50':>8} {'lat_p95':>8} "
+        f"{'FA/h':>7} {'cpu_s/h':>8} {'duty':>6} {'xRT':>6}"
+    )
+    for r in results:
+        lat = r["latency_ms"] or {"p50_ms": float("nan"), "p95_ms": float("nan")}
+        duty = r["gate_duty_cycle"]
+        print(
+            f"{r['name']:>16} {r['hit_rate']:>9.1%} {lat['p50_ms']:>8.0f} "
+            f"{lat['p95_ms']:>8.0f} {r['false_accepts_per_hour']:>7.2f} "
+            f"{r['cpu_s_per_audio_h']:>8.0f} "
+            f"{'-' if duty is None else format(duty, '.0%'):>6} "
+            f"{r['realtime_factor']:>6.1f}"
+        )
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
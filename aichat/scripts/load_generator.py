@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""多客户端压测.
+
+启动 N 个无界面客户端连接本地替身服务器（scripts/local_server.py）或兼容后端，
+每个客户端循环执行对话轮次：发送 listen start → 按 60ms 节奏上行静音帧直到收到 stt
+→ 接收下行音频直到 tts stop。结束后汇总：
+- 吞吐：上/下行帧率与下行码率
+- 丢帧：服务端在 tts stop 中给出的下行帧数与实际收到帧数之差；
+  UDP 另外统计重排窗口的乱序、迟到、重复计数
+  （WebSocket 保序不丢帧，替身服务器把丢包模拟为重传延迟，计入到达偏差）
+- 延迟：建连、listen 到 stt / tts start / 首个下行音频帧的 P50/P95，
+  以及下行帧相对理想节奏的到达偏差
+
+用法:
+    python scripts/local_server.py --jitter-ms 30 --loss 0.02 &
+    python scripts/load_generator.py --transport ws --clients 20 --turns 5
+    python scripts/load_generator.py --transport mqtt --clients 20 --turns 5
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import websockets  # noqa: E402
+from local_server import (  # noqa: E402
+    FRAME_DURATION_MS,
+    MQTT_CONNACK,
+    MQTT_CONNECT,
+    MQTT_PUBLISH,
+    MQTT_SUBACK,
+    MQTT_SUBSCRIBE,
+    SILENCE_FRAME,
+    mqtt_packet,
+    mqtt_publish,
+    mqtt_string,
+    parse_mqtt_publish,
+    read_mqtt_packet,
+)
+
+from src.protocols.udp_audio import (  # noqa: E402
+    UdpAudioCipher,
+    ReorderWindow,
+    packet_sequence,
+)
+from src.utils.turn_tracer import summarize  # noqa: E402
+
+LATENCY_SEGMENTS = ("listen_to_stt", "listen_to_tts_start", "listen_to_first_audio")
+
+
+class LoadStats:
+    """
+    所有客户端共享的压测统计.
+    """
+
+    def __init__(self):
+        self.connect_ms: List[float] = []
+        self.connect_failures = 0
+        self.turns_ok = 0
+        self.turns_failed = 0
+        self.uplink_frames = 0
+        self.downlink_frames = 0
+        self.downlink_bytes = 0
+        self.frames_expected = 0
+        self.frames_received = 0
+        self.latency = {name: [] for name in LATENCY_SEGMENTS}
+        self.lateness_ms: List[float] = []
+        self.reorder = {"reordered": 0, "late": 0, "duplicates": 0, "lost": 0}
+
+
+class HeadlessClient:
+    """
+    无界面客户端基类：对话轮次逻辑与统计，子类实现具体传输
+    """
+
+    def __init__(self, index: int, stats: LoadStats, turn_timeout: float):
+        self.index = index
+        self.stats = stats
+        self.turn_timeout = turn_timeout
+        self.session_id = ""
+        self._hello = asyncio.Event()
+        self._speech_done = asyncio.Event()
+        self._tts_stop = asyncio.Event()
+        self._listen_at = 0.0
+        self._marks = {}
+        self._turn_frames = 0
+        self._expected = 0
+        self._first_arrival: Optional[float] = None
+        self._first_index = 0
+
+    # 子类实现
+    async def connect(self):
+        raise NotImplementedError
+
+    async def send_json(self, message: dict):
+        raise NotImplementedError
+
+    async def send_audio(self, frame: bytes):
+        raise NotImplementedError
+
+    async def close(self):
+        raise NotImplementedError
+
+    def on_json(self, message: dict):
+        msg_type = message.get("type")
+        now = time.monotonic()
+        if msg_type == "hello":
+            self.session_id = message.get("session_id", "")
+            self._hello.set()
+        elif msg_type == "stt":
+            self._marks.setdefault("listen_to_stt", now)
+            self._speech_done.set()
+        elif msg_type == "tts" and message.get("state") == "start":
+            self._marks.setdefault("listen_to_tts_start", now)
+            self._speech_done.set()
+        elif msg_type == "tts" and message.get("state") == "stop":
+            self._expected = int(message.get("frames", 0))
+            self._tts_stop.set()
+
+    def on_audio(self, payload: bytes, index: Optional[int] = None):
+        """处理一帧下行音频.
+
+        Args:
+            payload: Opus 数据
+            index: 帧序号（UDP 为序列号；None 时按到达顺序计）
+        """
+        now = time.monotonic()
+        stats = self.stats
+        stats.downlink_frames += 1
+        stats.downlink_bytes += len(payload)
+        index = self._turn_frames if index is None else index
+        if self._first_arrival is None:
+            self._first_arrival = now
+            self._first_index = index
+            self._marks.setdefault("listen_to_first_audio", now)
+        else:
+            ideal = (
+                self._first_arrival
+                + (index - self._first_index) * FRAME_DURATION_MS / 1000
+            )
+            stats.lateness_ms.append((now - ideal) * 1000)
+        self._turn_frames += 1
+
+    async def run(self, turns: int, ramp: float):
+        await asyncio.sleep(ramp * self.index)
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(self.connect(), timeout=10)
+            await asyncio.wait_for(self._hello.wait(), timeout=10)
+        except Exception as e:
+            self.stats.connect_failures += 1
+            print(f"客户端 {self.index} 建连失败: {e}")
+            await self.close()
+            return
+        self.stats.connect_ms.append((time.monotonic() - start) * 1000)
+        try:
+            for _ in range(turns):
+                await self._run_turn()
+        finally:
+            await self.close()
+
+    async def _run_turn(self):
+        stats = self.stats
+        self._speech_done.clear()
+        self._tts_stop.clear()
+        self._marks = {}
+        self._turn_frames = 0
+        self._expected = 0
+        self._first_arrival = None
+        self._listen_at = time.monotonic()
+        await self.send_json(
+            {
+                "session_id": self.session_id,
+                "type": "listen",
+                "state": "start",
+                "mode": "auto",
+            }
+        )
+        try:
+            await asyncio.wait_for(self._uplink(), timeout=self.turn_timeout)
+            await asyncio.wait_for(self._tts_stop.wait(), timeout=self.turn_timeout)
+        except asyncio.TimeoutError:
+            stats.turns_failed += 1
+            return
+        # 等待仍在路上的 UDP 包
+        await asyncio.sleep(0.1)
+        self.finish_turn()
+        stats.turns_ok += 1
+        stats.frames_expected += self._expected
+        stats.frames_received += min(self._turn_frames, self._expected)
+        for name, stamp in self._marks.items():
+            stats.latency[name].append((stamp - self._listen_at) * 1000)
+
+    async def _uplink(self):
+        """
+        按实时节奏上行静音帧，直到服务端开始回复.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        sent = 0
+        while not self._speech_done.is_set():
+            await self.send_audio(SILENCE_FRAME)
+            sent += 1
+            self.stats.uplink_frames += 1
+            delay = start + sent * FRAME_DURATION_MS / 1000 - loop.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._speech_done.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    def finish_turn(self):
+        """
+        一轮结束时的传输相关收尾（UDP 冲刷重排窗口）.
+        """
+
+
+class WebsocketClient(HeadlessClient):
+    def __init__(self, index: int, stats: LoadStats, turn_timeout: float, url: str):
+        super().__init__(index, stats, turn_timeout)
+        self.url = url
+        self.websocket = None
+        self._reader: Optional[asyncio.Task] = None
+
+    async def connect(self):
+        headers = {
+            "Authorization": "Bearer test-token",
+            "Protocol-Version": "1",
+            "Device-Id": f"load-{self.index:04d}",
+            "Client-Id": f"load-client-{self.index:04d}",
+        }
+        try:
+            self.websocket = await websockets.connect(
+                self.url, additional_headers=headers, compression=None
+            )
+        except TypeError:
+            self.websocket = await websockets.connect(
+                self.url, extra_headers=headers, compression=None
+            )
+        self._reader = asyncio.create_task(self._read())
+        await self.send_json(
+            {
+                "type": "hello",
+                "version": 1,
+                "transport": "websocket",
+                "audio_params": {
+                    "format": "opus",
+                    "sample_rate": 16000,
+                    "channels": 1,
+                    "frame_duration": FRAME_DURATION_MS,
+                },
+            }
+        )
+
+    async def _read(self):
+        try:
+            async for message in self.websocket:
+                if isinstance(message, bytes):
+                    self.on_audio(message)
+                else:
+                    self.on_json(json.loads(message))
+        except websockets.ConnectionClosed:
+            pass
+
+    async def send_json(self, message: dict):
+        await self.websocket.send(json.dumps(message))
+
+    async def send_audio(self, frame: bytes):
+        await self.websocket.send(frame)
+
+    async def close(self):
+        if self._reader:
+            self._reader.cancel()
+        if self.websocket is not None:
+            await self.websocket.close()
+
+
+class MqttUdpClient(HeadlessClient):
+    def __init__(
+        self, index: int, stats: LoadStats, turn_timeout: float, host: str, port: int
+    ):
+        super().__init__(index, stats, turn_timeout)
+        self.host = host
+        self.port = port
+        self.client_id = f"load-client-{self.index:04d}"
+        self.writer = None
+        self._reader: Optional[asyncio.Task] = None
+        self._udp = None
+        self._tx: Optional[UdpAudioCipher] = None
+        self._rx: Optional[UdpAudioCipher] = None
+        self._window = ReorderWindow()
+        self._ready: list = []
+
+    async def connect(self):
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = (
+            mqtt_string("MQTT")
+            + bytes([4, 0xC2])  # 3.1.1，用户名 + 密码 + 清除会话
+            + (60).to_bytes(2, "big")
+            + mqtt_string(self.client_id)
+            + mqtt_string("load")
+            + mqtt_string("load")
+        )
+        self.writer.write(mqtt_packet(MQTT_CONNECT, 0, body))
+        packet_type, _, _ = await read_mqtt_packet(reader)
+        if packet_type != MQTT_CONNACK:
+            raise ConnectionError(f"意外的 MQTT 报文: {packet_type}")
+        topic = f"devices/p2p/{self.client_id}"
+        body = b"\x00\x01" + mqtt_string(topic) + b"\x00"  # 报文 ID 1，QoS 0
+        self.writer.write(mqtt_packet(MQTT_SUBSCRIBE, 0x02, body))
+        packet_type, _, _ = await read_mqtt_packet(reader)
+        if packet_type != MQTT_SUBACK:
+            raise ConnectionError(f"意外的 MQTT 报文: {packet_type}")
+        self._reader = asyncio.create_task(self._read(reader))
+        await self.send_json(
+            {
+                "type": "hello",
+                "version": 3,
+                "transport": "udp",
+                "audio_params": {
+                    "format": "opus",
+                    "sample_rate": 24000,
+                    "channels": 1,
+                    "frame_duration": FRAME_DURATION_MS,
+                },
+            }
+        )
+
+    async def _read(self, reader):
+        try:
+            while True:
+                packet_type, flags, body = await read_mqtt_packet(reader)
+                if packet_type != MQTT_PUBLISH:
+                    continue
+                _, _, payload = parse_mqtt_publish(flags, body)
+                message = json.loads(payload)
+                if message.get("type") == "hello":
+                    await self._open_udp(message["udp"])
+                self.on_json(message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    async def _open_udp(self, udp: dict):
+        loop = asyncio.get_running_loop()
+        self._tx = UdpAudioCipher(udp["key"], udp["nonce"])
+        self._rx = UdpAudioCipher(udp["key"], udp["nonce"])
+        client = self
+
+        class _Protocol(asyncio.DatagramProtocol):
+            def datagram_received(self, data, addr):
+                client._on_datagram(data)
+
+        self._udp, _ = await loop.create_datagram_endpoint(
+            _Protocol, remote_addr=(udp["server"], udp["port"])
+        )
+
+    def _on_datagram(self, data: bytes):
+        self._window.push(packet_sequence(data), data, self._ready)
+        self._deliver()
+
+    def _deliver(self):
+        for sequence, packet in self._ready:
+            self.on_audio(self._rx.open(packet), sequence)
+        self._ready.clear()
+
+    def finish_turn(self):
+        self._window.flush(self._ready)
+        self._deliver()
+
+    async def send_json(self, message: dict):
+        self.writer.write(mqtt_publish("device-server", json.dumps(message).encode()))
+        await self.writer.drain()
+
+    async def send_audio(self, frame: bytes):
+        if self._udp is not None:
+            self._udp.sendto(self._tx.seal(frame))
+
+    async def close(self):
+        if self._reader:
+            self._reader.cancel()
+        stats = self._window.get_stats()
+        for key in self.stats.reorder:
+            self.stats.reorder[key] += stats.get(key, 0)
+        if self.writer is not None:
+            try:
+                await self.send_json({"type": "goodbye", "session_id": self.session_id})
+            except Exception:
+                pass
+            self.writer.close()
+        if self._udp is not None:
+            self._udp.close()
+
+
+def report(stats: LoadStats, args, elapsed: float) -> dict:
+    """
+    汇总压测结果.
+    """
+    expected = max(1, stats.frames_expected)
+    result = {
+        "transport": args.transport,
+        "clients": args.clients,
+        "elapsed_s": round(elapsed, 1),
+        "connect_failures": stats.connect_failures,
+        "connect_ms": summarize(stats.connect_ms) if stats.connect_ms else None,
+        "turns_ok": stats.turns_ok,
+        "turns_failed": stats.turns_failed,
+        "uplink_fps": round(stats.uplink_frames / elapsed, 1),
+        "downlink_fps": round(stats.downlink_frames / elapsed, 1),
+        "downlink_kbps": round(stats.downlink_bytes * 8 / 1000 / elapsed, 1),
+        "frame_loss": round(1 - stats.frames_received / expected, 4),
+        "latency_ms": {
+            name: summarize(values)
+            for name, values in stats.latency.items()
+            if values
+        },
+        "lateness_ms": summarize(stats.lateness_ms) if stats.lateness_ms else None,
+    }
+    if args.transport == "mqtt":
+        result["udp_reorder"] = stats.reorder
+    return result
+
+
+def print_report(result: dict):
+    print(
+        f"传输 {result['transport']}  客户端 {result['clients']}  "
+        f"耗时 {result['elapsed_s']}s  建连失败 {result['connect_failures']}"
+    )
+    print(f"轮次: 成功 {result['turns_ok']} 超时 {result['turns_failed']}")
+    print(
+        f"吞吐: 上行 {result['uplink_fps']} 帧/s  下行 {result['downlink_fps']} 帧/s "
+        f"({result['downlink_kbps']} kbit/s)  丢帧率 {result['frame_loss']:.2%}"
+    )
+    if "udp_reorder" in result:
+        print(f"UDP 重排: {result['udp_reorder']}")
+    rows = [("connect", result["connect_ms"])]
+    rows += list(result["latency_ms"].items())
+    rows.append(("frame_lateness", result["lateness_ms"]))
+    print(f"{'segment':>22} {'count':>6} {'p50_ms':>9} {'p95_ms':>9} {'max_ms':>9}")
+    for name, s in rows:
+        if not s:
+            continue
+        print(
+            f"{name:>22} {s['count']:>6} {s['p50_ms']:>9.1f} "
+            f"{s['p95_ms']:>9.1f} {s['max_ms']:>9.1f}"
+        )
+
+
+async def run(args) -> dict:
+    stats = LoadStats()
+    clients = []
+    for index in range(args.clients):
+        if args.transport == "ws":
+            clients.append(WebsocketClient(index, stats, args.turn_timeout, args.url))
+        else:
+            clients.append(
+                MqttUdpClient(
+                    index, stats, args.turn_timeout, args.mqtt_host, args.mqtt_port
+                )
+            )
+    start = time.monotonic()
+    await asyncio.gather(
+        *(client.run(args.turns, args.ramp_ms / 1000) for client in clients)
+    )
+    return report(stats, args, time.monotonic() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多客户端压测")
+    parser.add_argument("--transport", choices=("ws", "mqtt"), default="ws")
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=3, help="每个客户端的对话轮数")
+    parser.add_argument("--url", default="ws://127.0.0.1:8765/xiaozhi/v1/")
+    parser.add_argument("--mqtt-host", default="127.0.0.1")
+    parser.add_argument("--mqtt-port", type=int, default=1883)
+    parser.add_argument("--ramp-ms", type=float, default=50, help="客户端启动间隔")
+    parser.add_argument("--turn-timeout", type=float, default=30.0)
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出结果")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+    return 0 if result["turns_failed"] == 0 and not result["connect_failures"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
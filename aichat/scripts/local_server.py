@@ -0,0 +1,775 @@
+#!/usr/bin/env python3
+"""本地协议替身服务器.
+
+在本机模拟后端，供传输层改动做可复现的性能测试，无需连接真实服务：
+1. WebSocket：与 WebsocketProtocol 相同的 hello / listen / abort / 二进制 Opus
+2. MQTT + UDP：内置最小 MQTT 3.1.1 代理（控制消息）和 AES-CTR 加密的 UDP 音频
+   通道，包格式与 MqttProtocol / UdpAudioCipher 一致
+
+每轮对话按脚本回放：收到约 speech_ms 的上行音频（手动模式下收到 listen stop）后，
+依次下发 stt → llm → tts start → 逐句 sentence_start + Opus 音频 → tts stop。
+下行音频可叠加固定延迟、随机抖动和丢包（UDP 上抖动会造成真实的乱序）。
+WebSocket 保序传输上丢包表现为 TCP 重传：该帧推迟 retransmit_ms 送达，后续帧被队头阻塞。
+
+脚本为 JSON 文件（省略时使用内置的 2 秒静音回复）:
+    {
+      "speech_ms": 1200,
+      "greeting": {"tts": [{"text": "Xin chào", "audio": "hello.opus"}]},
+      "turns": [
+        {"stt": "mấy giờ rồi", "llm": {"emotion": "happy"}, "think_ms": 300,
+         "tts": [{"text": "Bây giờ là 9 giờ", "audio": "reply.opus"}]}
+      ]
+    }
+audio 为 Ogg Opus 录音（相对脚本文件的路径，建议 opusenc --framesize 60 编码），
+也可用 "silence_ms" 代替 audio 生成静音帧。
+
+客户端配置:
+    WEBSOCKET_URL = ws://127.0.0.1:8765/xiaozhi/v1/
+    MQTT_INFO = {"endpoint": "127.0.0.1:1883", "client_id": "...", "username": "u",
+                 "password": "p", "publish_topic": "device-server",
+                 "subscribe_topic": "devices/p2p/<client_id>"}
+
+用法:
+    python scripts/local_server.py [--script turns.json] [--delay-ms 20]
+        [--jitter-ms 30] [--loss 0.02] [--retransmit-ms 200] [--seed 1]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import struct
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+import websockets  # noqa: E402
+
+from src.protocols.udp_audio import (  # noqa: E402
+    NONCE_SIZE,
+    UdpAudioCipher,
+    packet_sequence,
+)
+
+FRAME_DURATION_MS = 60
+OUTPUT_SAMPLE_RATE = 24000
+
+# 60ms 单声道 CELT 静音包：TOC(配置31, code 3) + 帧数 3 + 3 个 20ms 静音帧
+SILENCE_FRAME = bytes([0xFB, 0x03, 0xFF, 0xFE, 0xFF, 0xFE, 0xFF, 0xFE])
+
+DEFAULT_SCRIPT = {
+    "speech_ms": 1200,
+    "turns": [
+        {
+            "stt": "xin chào",
+            "llm": {"emotion": "happy", "text": "😊"},
+            "think_ms": 200,
+            "tts": [{"text": "Xin chào, tôi có thể giúp gì?", "silence_ms": 2000}],
+        }
+    ],
+}
+
+
+# -------------------------
+# Opus 数据
+# -------------------------
+def read_ogg_opus(path: Path) -> List[bytes]:
+    """从 Ogg Opus 文件中取出音频包（跳过 OpusHead / OpusTags）.
+
+    Returns:
+        按顺序排列的 Opus 包
+    """
+    data = path.read_bytes()
+    packets = []
+    partial = bytearray()
+    pos = 0
+    while pos + 27 <= len(data):
+        if data[pos : pos + 4] != b"OggS":
+            raise ValueError(f"不是有效的 Ogg 文件: {path}")
+        segments = data[pos + 26]
+        table = data[pos + 27 : pos + 27 + segments]
+        pos += 27 + segments
+        for lace in table:
+            partial += data[pos : pos + lace]
+            pos += lace
+            if lace < 255:
+                packets.append(bytes(partial))
+                partial.clear()
+    return [p for p in packets if not p.startswith((b"OpusHead", b"OpusTags"))]
+
+
+def opus_packet_duration_ms(packet: bytes) -> float:
+    """
+    按 TOC 字节计算 Opus 包时长（毫秒），用于按实时速率下发.
+    """
+    if not packet:
+        return 0.0
+    toc = packet[0]
+    config = toc >> 3
+    if config < 12:
+        frame_ms = (10, 20, 40, 60)[config % 4]
+    elif config < 16:
+        frame_ms = (10, 20)[config % 2]
+    else:
+        frame_ms = (2.5, 5, 10, 20)[config % 4]
+    code = toc & 0x03
+    if code == 0:
+        frames = 1
+    elif code in (1, 2):
+        frames = 2
+    else:
+        frames = packet[1] & 0x3F if len(packet) > 1 else 1
+    return frame_ms * frames
+
+
+def load_script(path: Optional[Path]) -> dict:
+    """加载对话脚本并把每句的音频解析为 Opus 包列表.
+
+    Returns:
+        脚本字典，tts 句子中附加 frames 字段
+    """
+    script = json.loads(path.read_text(encoding="utf-8")) if path else DEFAULT_SCRIPT
+    base = path.parent if path else project_dir
+    turns = list(script.get("turns") or [])
+    if script.get("greeting"):
+        turns.append(script["greeting"])
+    for turn in turns:
+        for sentence in turn.get("tts", []):
+            if sentence.get("audio"):
+                sentence["frames"] = read_ogg_opus(base / sentence["audio"])
+            else:
+                count = int(sentence.get("silence_ms", 1000)) // FRAME_DURATION_MS
+                sentence["frames"] = [SILENCE_FRAME] * max(1, count)
+    if not script.get("turns"):
+        raise ValueError("脚本中没有 turns")
+    return script
+
+
+# -------------------------
+# 网络损伤
+# -------------------------
+class Impairment:
+    """
+    下行音频的网络损伤：固定延迟 + 均匀抖动 + 随机丢包（保序传输上为重传延迟）
+    """
+
+    def __init__(
+        self,
+        delay_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        loss: float = 0.0,
+        seed: Optional[int] = None,
+        retransmit_ms: float = 200.0,
+    ):
+        self.delay = delay_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.loss = loss
+        self.retransmit = retransmit_ms / 1000
+        self._random = random.Random(seed)
+
+    def offset(self) -> Optional[float]:
+        """
+        单帧额外延迟（秒），None 表示该帧丢弃.
+        """
+        if self.loss and self._random.random() < self.loss:
+            return None
+        return self.delay + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+
+
+class ServerStats:
+    """
+    服务端汇总统计.
+    """
+
+    def __init__(self):
+        self.sessions = 0
+        self.active = 0
+        self.turns = 0
+        self.aborts = 0
+        self.uplink_frames = 0
+        self.uplink_lost = 0
+        self.downlink_frames = 0
+        self.downlink_dropped = 0
+        self.downlink_retransmits = 0
+
+    def line(self) -> str:
+        return (
+            f"会话 {self.active}/{self.sessions} 轮次 {self.turns} 打断 {self.aborts} "
+            f"上行 {self.uplink_frames} 帧(丢 {self.uplink_lost}) "
+            f"下行 {self.downlink_frames} 帧(丢 {self.downlink_dropped} "
+            f"重传 {self.downlink_retransmits})"
+        )
+
+
+# -------------------------
+# 会话：与传输无关的对话逻辑
+# -------------------------
+class Session:
+    """
+    单个客户端会话：跟踪监听状态、统计上行音频并按脚本回放回复
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        server: "LocalServer",
+        send_json: Callable,
+        send_audio: Callable,
+        ordered: bool,
+    ):
+        """初始化会话.
+
+        Args:
+            session_id: 会话 ID
+            server: 所属服务器（脚本、损伤配置和统计）
+            send_json: 发送 JSON 消息的协程函数
+            send_audio: 发送一帧 Opus。保序传输为协程函数 send_audio(frame)；
+                非保序传输为普通函数 send_audio(frame, delay)，立即封包，
+                delay 秒后发出，delay 为 None 表示该包在网络上丢失
+            ordered: 传输是否保序（WebSocket 保序；UDP 按抖动各自调度）
+        """
+        self.session_id = session_id
+        self.server = server
+        self._send_json = send_json
+        self._send_audio = send_audio
+        self._ordered = ordered
+        self.mode = "auto"
+        self.listening = False
+        self._uplink_ms = 0.0
+        self._reply_task: Optional[asyncio.Task] = None
+        self._turn_index = 0
+        self._last_seq: Optional[int] = None
+
+    async def send_json(self, message: dict):
+        message.setdefault("session_id", self.session_id)
+        await self._send_json(message)
+
+    @property
+    def replying(self) -> bool:
+        return self._reply_task is not None and not self._reply_task.done()
+
+    async def on_json(self, message: dict):
+        """
+        处理客户端 JSON 控制消息.
+        """
+        msg_type = message.get("type")
+        if msg_type == "listen":
+            state = message.get("state")
+            if state == "start":
+                self.mode = message.get("mode", "auto")
+                self.listening = True
+                self._uplink_ms = 0.0
+            elif state == "stop":
+                self.listening = False
+                if self.mode == "manual" and not self.replying:
+                    self._start_reply(self._next_turn())
+            elif state == "detect" and self.server.script.get("greeting"):
+                if not self.replying:
+                    self._start_reply(self.server.script["greeting"])
+        elif msg_type == "abort":
+            if self.replying:
+                self._reply_task.cancel()
+                self.server.stats.aborts += 1
+                await self.send_json({"type": "tts", "state": "stop"})
+
+    def on_audio(self, payload: bytes, sequence: Optional[int] = None):
+        """
+        处理一帧上行音频：累计说话时长，达到 speech_ms 后开始回复.
+        """
+        stats = self.server.stats
+        stats.uplink_frames += 1
+        if sequence is not None:
+            # UDP 上行按序列号缺口统计丢包（乱序到达的包不重复计数）
+            last = self._last_seq
+            if last is not None and sequence > last + 1:
+                stats.uplink_lost += sequence - last - 1
+            if last is None or sequence > last:
+                self._last_seq = sequence
+
+        if not self.listening or self.replying or self.mode == "manual":
+            return
+        self._uplink_ms += opus_packet_duration_ms(payload) or FRAME_DURATION_MS
+        if self._uplink_ms >= self.server.script.get("speech_ms", 1200):
+            self._uplink_ms = 0.0
+            if self.mode != "realtime":
+                self.listening = False
+            self._start_reply(self._next_turn())
+
+    def _next_turn(self) -> dict:
+        turns = self.server.script["turns"]
+        turn = turns[self._turn_index % len(turns)]
+        self._turn_index += 1
+        return turn
+
+    def _start_reply(self, turn: dict):
+        self._reply_task = asyncio.create_task(self._reply(turn))
+
+    async def _reply(self, turn: dict):
+        """
+        按脚本下发一轮回复.
+        """
+        stats = self.server.stats
+        try:
+            if turn.get("stt"):
+                await self.send_json({"type": "stt", "text": turn["stt"]})
+            await asyncio.sleep(turn.get("think_ms", 0) / 1000)
+            if turn.get("llm"):
+                await self.send_json({"type": "llm", **turn["llm"]})
+            await self.send_json({"type": "tts", "state": "start"})
+            frames = 0
+            for sentence in turn.get("tts", []):
+                await self.send_json(
+                    {
+                        "type": "tts",
+                        "state": "sentence_start",
+                        "text": sentence.get("text", ""),
+                    }
+                )
+                frames += await self._send_frames(sentence["frames"])
+            stats.turns += 1
+            # frames 为本轮下行帧数（含被丢弃的），供压测客户端统计丢帧
+            await self.send_json({"type": "tts", "state": "stop", "frames": frames})
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"[{self.session_id[:8]}] 回放失败: {e}")
+
+    async def _send_frames(self, frames: List[bytes]) -> int:
+        """按实时速率下发一组音频帧（叠加网络损伤）.
+
+        Returns:
+            下发的帧数（含丢弃）
+        """
+        loop = asyncio.get_running_loop()
+        impairment = self.server.impairment
+        stats = self.server.stats
+        start = loop.time()
+        elapsed = 0.0
+        last_target = start
+        for frame in frames:
+            offset = impairment.offset()
+            due = start + elapsed
+            elapsed += opus_packet_duration_ms(frame) / 1000
+            if offset is None and self._ordered:
+                # TCP 不丢帧：丢失的分段经重传后送达，其后的帧被队头阻塞
+                offset = impairment.delay + impairment.retransmit
+                stats.downlink_retransmits += 1
+            if offset is None:
+                stats.downlink_dropped += 1
+            else:
+                stats.downlink_frames += 1
+            if self._ordered:
+                # 保序传输上抖动和重传只表现为推迟，不会乱序
+                last_target = max(due + offset, last_target)
+                delay = last_target - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._send_audio(frame)
+            else:
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # 按原始顺序封包（序列号连续），再按各自的延迟发出或丢弃
+                self._send_audio(frame, None if offset is None else offset)
+                if offset is not None:
+                    last_target = max(last_target, due + offset)
+        # 等待最后一帧发出后再继续（tts stop 不应早于音频）
+        delay = max(last_target, start + elapsed) - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return len(frames)
+
+    def close(self):
+        if self.replying:
+            self._reply_task.cancel()
+
+
+# -------------------------
+# WebSocket 传输
+# -------------------------
+class WebsocketFrontend:
+    """
+    WebSocket 传输：hello 握手后收发 JSON 和二进制 Opus
+    """
+
+    def __init__(self, server: "LocalServer"):
+        self.server = server
+
+    async def handle(self, websocket, path=None):
+        stats = self.server.stats
+        session = None
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    if session is not None:
+                        session.on_audio(message)
+                    continue
+                data = json.loads(message)
+                if data.get("type") == "hello":
+                    session = self._open_session(websocket)
+                    await session.send_json(
+                        {
+                            "type": "hello",
+                            "transport": "websocket",
+                            "audio_params": self.server.audio_params(),
+                        }
+                    )
+                elif session is not None:
+                    await session.on_json(data)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            if session is not None:
+                session.close()
+                stats.active -= 1
+
+    def _open_session(self, websocket) -> Session:
+        stats = self.server.stats
+        stats.sessions += 1
+        stats.active += 1
+
+        async def send_json(message):
+            await websocket.send(json.dumps(message, ensure_ascii=False))
+
+        return Session(
+            uuid.uuid4().hex, self.server, send_json, websocket.send, ordered=True
+        )
+
+
+# -------------------------
+# MQTT 3.1.1 最小实现（代理端与压测客户端共用）
+# -------------------------
+MQTT_CONNECT = 1
+MQTT_CONNACK = 2
+MQTT_PUBLISH = 3
+MQTT_PUBACK = 4
+MQTT_SUBSCRIBE = 8
+MQTT_SUBACK = 9
+MQTT_PINGREQ = 12
+MQTT_PINGRESP = 13
+MQTT_DISCONNECT = 14
+
+
+def mqtt_string(value: str) -> bytes:
+    data = value.encode("utf-8")
+    return struct.pack(">H", len(data)) + data
+
+
+def mqtt_packet(packet_type: int, flags: int, body: bytes = b"") -> bytes:
+    """
+    组装 MQTT 报文（固定报头 + 剩余长度 + 报文体）.
+    """
+    header = bytearray([(packet_type << 4) | flags])
+    length = len(body)
+    while True:
+        byte = length % 128
+        length //= 128
+        header.append(byte | 0x80 if length else byte)
+        if not length:
+            break
+    return bytes(header) + body
+
+
+async def read_mqtt_packet(reader: asyncio.StreamReader):
+    """读取一个 MQTT 报文.
+
+    Returns:
+        (报文类型, 标志位, 报文体)
+    """
+    first = (await reader.readexactly(1))[0]
+    length = 0
+    multiplier = 1
+    while True:
+        byte = (await reader.readexactly(1))[0]
+        length += (byte & 0x7F) * multiplier
+        if not byte & 0x80:
+            break
+        multiplier *= 128
+    body = await reader.readexactly(length) if length else b""
+    return first >> 4, first & 0x0F, body
+
+
+def mqtt_publish(topic: str, payload: bytes) -> bytes:
+    """
+    组装 QoS 0 的 PUBLISH 报文.
+    """
+    return mqtt_packet(MQTT_PUBLISH, 0, mqtt_string(topic) + payload)
+
+
+def parse_mqtt_publish(flags: int, body: bytes):
+    """解析 PUBLISH 报文.
+
+    Returns:
+        (主题, 报文 ID（QoS 0 为 None）, 负载)
+    """
+    (topic_len,) = struct.unpack_from(">H", body, 0)
+    topic = body[2 : 2 + topic_len].decode("utf-8")
+    pos = 2 + topic_len
+    packet_id = None
+    if (flags >> 1) & 0x03:
+        (packet_id,) = struct.unpack_from(">H", body, pos)
+        pos += 2
+    return topic, packet_id, body[pos:]
+
+
+class MqttUdpFrontend:
+    """
+    MQTT 控制通道 + AES-CTR UDP 音频通道
+
+    - 代理只服务本服务器：客户端发布的任何消息都交给其会话处理，
+      回复发布到客户端订阅的主题
+    - UDP 包按包头中的 8 字节连接标识（nonce[4:12]）找到会话，首包确定客户端地址
+    """
+
+    def __init__(self, server: "LocalServer", udp_host: str, udp_port: int):
+        self.server = server
+        self.udp_host = udp_host
+        self.udp_port = udp_port
+        self.udp_transport = None
+        self._by_connection: Dict[bytes, "_UdpSession"] = {}
+
+    async def start_udp(self):
+        loop = asyncio.get_running_loop()
+        frontend = self
+
+        class _Protocol(asyncio.DatagramProtocol):
+            def datagram_received(self, data, addr):
+                frontend._on_datagram(data, addr)
+
+        self.udp_transport, _ = await loop.create_datagram_endpoint(
+            _Protocol, local_addr=(self.udp_host, self.udp_port)
+        )
+        self.udp_port = self.udp_transport.get_extra_info("sockname")[1]
+
+    def _on_datagram(self, data: bytes, addr):
+        if len(data) <= NONCE_SIZE:
+            return
+        udp = self._by_connection.get(bytes(data[4:12]))
+        if udp is None:
+            return
+        udp.addr = addr
+        try:
+            payload = udp.rx_cipher.open(data)
+        except ValueError:
+            return
+        udp.session.on_audio(payload, packet_sequence(data))
+
+    async def handle(self, reader, writer):
+        topic = None
+        client_id = ""
+        udp: Optional[_UdpSession] = None
+        try:
+            while True:
+                packet_type, flags, body = await read_mqtt_packet(reader)
+                if packet_type == MQTT_CONNECT:
+                    client_id = self._parse_client_id(body)
+                    writer.write(mqtt_packet(MQTT_CONNACK, 0, b"\x00\x00"))
+                elif packet_type == MQTT_SUBSCRIBE:
+                    packet_id = body[:2]
+                    (topic_len,) = struct.unpack_from(">H", body, 2)
+                    topic = body[4 : 4 + topic_len].decode("utf-8")
+                    writer.write(mqtt_packet(MQTT_SUBACK, 0, packet_id + b"\x00"))
+                elif packet_type == MQTT_PUBLISH:
+                    _, packet_id, payload = parse_mqtt_publish(flags, body)
+                    if packet_id is not None:
+                        writer.write(
+                            mqtt_packet(MQTT_PUBACK, 0, struct.pack(">H", packet_id))
+                        )
+                    data = json.loads(payload)
+                    if data.get("type") == "hello":
+                        if udp is not None:
+                            self._close(udp)
+                        reply_topic = topic or f"devices/p2p/{client_id}"
+                        udp = self._open_session(writer, reply_topic)
+                        await udp.session.send_json(self._hello(udp))
+                    elif data.get("type") == "goodbye":
+                        if udp is not None:
+                            self._close(udp)
+                            udp = None
+                    elif udp is not None:
+                        await udp.session.on_json(data)
+                elif packet_type == MQTT_PINGREQ:
+                    writer.write(mqtt_packet(MQTT_PINGRESP, 0))
+                elif packet_type == MQTT_DISCONNECT:
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if udp is not None:
+                self._close(udp)
+            writer.close()
+
+    @staticmethod
+    def _parse_client_id(body: bytes) -> str:
+        (name_len,) = struct.unpack_from(">H", body, 0)
+        pos = 2 + name_len + 4  # 协议名 + 级别 + 连接标志 + 保活
+        (id_len,) = struct.unpack_from(">H", body, pos)
+        return body[pos + 2 : pos + 2 + id_len].decode("utf-8", "replace")
+
+    def _sendto(self, packet: bytes, addr):
+        if self.udp_transport is not None:
+            self.udp_transport.sendto(packet, addr)
+
+    def _open_session(self, writer, reply_topic: str) -> "_UdpSession":
+        loop = asyncio.get_running_loop()
+        stats = self.server.stats
+        stats.sessions += 1
+        stats.active += 1
+        key_hex = os.urandom(16).hex()
+        connection = os.urandom(8)
+        nonce_hex = (b"\x01\x00\x00\x00" + connection + b"\x00" * 4).hex()
+        udp = _UdpSession(connection, key_hex, nonce_hex)
+
+        async def send_json(message):
+            payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+            writer.write(mqtt_publish(reply_topic, payload))
+            await writer.drain()
+
+        def send_audio(frame: bytes, delay: Optional[float]):
+            # 丢弃的包同样占用序列号；seal 返回槽位视图，延迟发送前需复制
+            packet = bytes(udp.tx_cipher.seal(frame))
+            if delay is None or udp.addr is None:
+                return
+            if delay <= 0:
+                self._sendto(packet, udp.addr)
+            else:
+                loop.call_later(delay, self._sendto, packet, udp.addr)
+
+        udp.session = Session(
+            uuid.uuid4().hex, self.server, send_json, send_audio, ordered=False
+        )
+        self._by_connection[connection] = udp
+        return udp
+
+    def _hello(self, udp: "_UdpSession") -> dict:
+        return {
+            "type": "hello",
+            "transport": "udp",
+            "audio_params": self.server.audio_params(),
+            "udp": {
+                "server": self.server.advertise_host,
+                "port": self.udp_port,
+                "key": udp.key_hex,
+                "nonce": udp.nonce_hex,
+            },
+        }
+
+    def _close(self, udp: "_UdpSession"):
+        udp.session.close()
+        if self._by_connection.pop(udp.connection, None) is not None:
+            self.server.stats.active -= 1
+
+
+class _UdpSession:
+    __slots__ = (
+        "connection",
+        "key_hex",
+        "nonce_hex",
+        "rx_cipher",
+        "tx_cipher",
+        "addr",
+        "session",
+    )
+
+    def __init__(self, connection: bytes, key_hex: str, nonce_hex: str):
+        self.connection = connection
+        self.key_hex = key_hex
+        self.nonce_hex = nonce_hex
+        self.rx_cipher = UdpAudioCipher(key_hex, nonce_hex)
+        self.tx_cipher = UdpAudioCipher(key_hex, nonce_hex)
+        self.addr = None
+        self.session: Optional[Session] = None
+
+
+# -------------------------
+# 服务器
+# -------------------------
+class LocalServer:
+    """
+    本地替身服务器：持有脚本、损伤配置和统计，启动各传输前端
+    """
+
+    def __init__(self, script: dict, impairment: Impairment, advertise_host: str):
+        self.script = script
+        self.impairment = impairment
+        self.advertise_host = advertise_host
+        self.stats = ServerStats()
+
+    @staticmethod
+    def audio_params() -> dict:
+        return {
+            "format": "opus",
+            "sample_rate": OUTPUT_SAMPLE_RATE,
+            "channels": 1,
+            "frame_duration": FRAME_DURATION_MS,
+        }
+
+    async def serve(self, host: str, ws_port: int, mqtt_port: int, udp_port: int):
+        ws = WebsocketFrontend(self)
+        ws_server = await websockets.serve(
+            ws.handle, host, ws_port, max_size=10 * 1024 * 1024, compression=None
+        )
+        mqtt = MqttUdpFrontend(self, host, udp_port)
+        await mqtt.start_udp()
+        mqtt_server = await asyncio.start_server(mqtt.handle, host, mqtt_port)
+
+        print(f"WebSocket: ws://{self.advertise_host}:{ws_port}/xiaozhi/v1/")
+        print(f"MQTT:      {self.advertise_host}:{mqtt_port}（UDP 音频 {mqtt.udp_port}）")
+        try:
+            while True:
+                await asyncio.sleep(10)
+                print(f"[{time.strftime('%H:%M:%S')}] {self.stats.line()}")
+        finally:
+            ws_server.close()
+            mqtt_server.close()
+            if mqtt.udp_transport:
+                mqtt.udp_transport.close()
+            print(self.stats.line())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地协议替身服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--advertise-host", help="hello 中下发的 UDP 地址")
+    parser.add_argument("--ws-port", type=int, default=8765)
+    parser.add_argument("--mqtt-port", type=int, default=1883)
+    parser.add_argument("--udp-port", type=int, default=8884)
+    parser.add_argument("--script", type=Path, help="对话脚本 JSON")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="下行固定延迟")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="下行抖动上限")
+    parser.add_argument("--loss", type=float, default=0.0, help="下行丢包率（0~1）")
+    parser.add_argument(
+        "--retransmit-ms",
+        type=float,
+        default=200.0,
+        help="WebSocket 上丢包的重传延迟（TCP 最小 RTO）",
+    )
+    parser.add_argument("--seed", type=int, help="随机种子（复现损伤序列）")
+    args = parser.parse_args()
+
+    server = LocalServer(
+        load_script(args.script),
+        Impairment(
+            args.delay_ms, args.jitter_ms, args.loss, args.seed, args.retransmit_ms
+        ),
+        args.advertise_host or args.host,
+    )
+    try:
+        asyncio.run(
+            server.serve(args.host, args.ws_port, args.mqtt_port, args.udp_port)
+        )
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""对话轮次延迟汇总.
+
+读取 logs/turn_trace.jsonl（及其滚动备份），按分段输出 P50/P95/最大耗时，
+用于回答“这一轮回复为什么慢”：定位耗时集中在建连、上行、STT、LLM、TTS 还是本地播放。
+
+用法:
+    python scripts/turn_trace_report.py [--log-dir logs] [--last 200] [--completed-only]
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
+
+from src.utils.turn_tracer import SEGMENTS, summarize  # noqa: E402
+
+
+def load_turns(log_dir: Path) -> list:
+    """
+    按时间顺序读取所有追踪记录（滚动备份编号越大越旧）.
+    """
+    files = sorted(
+        log_dir.glob("turn_trace.jsonl*"),
+        key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    turns = []
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    turns.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return turns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对话轮次延迟汇总")
+    parser.add_argument(
+        "--log-dir", type=Path, default=project_dir / "logs", help="追踪文件目录"
+    )
+    parser.add_argument("--last", type=int, default=0, help="只统计最近 N 轮")
+    parser.add_argument(
+        "--completed-only", action="store_true", help="只统计以 tts stop 结束的轮次"
+    )
+    args = parser.parse_args()
+
+    turns = load_turns(args.log_dir)
+    if args.completed_only:
+        turns = [t for t in turns if t.get("end") == "tts_stop"]
+    if args.last > 0:
+        turns = turns[-args.last :]
+    if not turns:
+        print(f"未找到追踪记录: {args.log_dir / 'turn_trace.jsonl'}")
+        return 1
+
+    ends = {}
+    for turn in turns:
+        ends[turn.get("end")] = ends.get(turn.get("end"), 0) + 1
+    print(f"轮次: {len(turns)}  结束原因: {ends}")
+    print(f"{'segment':>20} {'count':>6} {'p50_ms':>9} {'p95_ms':>9} {'max_ms':>9}")
+    for name in SEGMENTS:
+        values = [
+            t["segments_ms"][name] for t in turns if name in t.get("segments_ms", {})
+        ]
+        if not values:
+            continue
+        s = summarize(values)
+        print(
+            f"{name:>20} {s['count']:>6} {s['p50_ms']:>9.1f} "
+            f"{s['p95_ms']:>9.1f} {s['max_ms']:>9.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,6 +25,7 @@ from src.protocols.websocket_protocol import WebsocketProtocol
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 from src.utils.opus_loader import setup_opus
+from src.utils.turn_tracer import TurnTracer
 
 logger = get_logger(__name__)
 setup_opus()
@@ -214,11 +215,14 @@ class Application:
     # -------------------------
     # 自动/实时对话：根据 AEC 与当前配置选择模式，开启保持会话
     # -------------------------
-    async def start_auto_conversation(self) -> None:
+    async def start_auto_conversation(self) -> bool:
+        """
+        返回 listen 指令是否已发出（建连失败或发送异常时为 False）.
+        """
         try:
             ok = await self.connect_protocol()
             if not ok:
-                return
+                return False
 
             mode = (
                 ListeningMode.REALTIME if self.aec_enabled else ListeningMode.AUTO_STOP
@@ -227,8 +231,9 @@ class Application:
             self.keep_listening = True
             await self.protocol.send_start_listening(mode)
             await self.set_device_state(DeviceState.LISTENING)
+            return True
         except Exception:
-            pass
+            return False
 
     async def _start_conversation_from_wake_word(self) -> None:
         """
@@ -257,6 +262,7 @@ class Application:
         self.protocol.on_network_error(self._on_network_error)
         self.protocol.on_incoming_json(self._on_incoming_json)
         self.protocol.on_incoming_audio(self._on_incoming_audio)
+        self.protocol.on_incoming_audio_batch(self._on_incoming_audio_batch)
         self.protocol.on_audio_channel_opened(self._on_audio_channel_opened)
         self.protocol.on_audio_channel_closed(self._on_audio_channel_closed)
 
@@ -317,6 +323,12 @@ class Application:
         # 转发给插件
         self.spawn(self.plugins.notify_incoming_audio(data), "plugin:on_audio")
 
+    def _on_incoming_audio_batch(self, frames):
+        # 一批按序列号排好序的音频帧只创建一个任务
+        self.spawn(
+            self.plugins.notify_incoming_audio_batch(frames), "plugin:on_audio_batch"
+        )
+
     def _on_incoming_json(self, json_data):
         try:
             msg_type = json_data.get("type") if isinstance(json_data, dict) else None
@@ -326,6 +338,7 @@ class Application:
             if msg_type == "goodbye":
                 logger.info("Server gửi goodbye, chuyển về IDLE và chờ 'Bạn ơi'...")
                 self.keep_listening = False
+                TurnTracer.get_instance().finish_turn("goodbye")
                 
                 async def _handle_goodbye():
                     try:
@@ -338,6 +351,15 @@ class Application:
                 self.spawn(_handle_goodbye(), "handle_goodbye")
                 return  # Không chuyển tiếp goodbye cho plugin
             
+            # 对话轮次里程碑：stt / llm / tts start / tts stop
+            tracer = TurnTracer.get_instance()
+            if msg_type in ("stt", "llm"):
+                tracer.mark(msg_type)
+            elif msg_type == "tts" and json_data.get("state") == "start":
+                tracer.mark("tts_start")
+            elif msg_type == "tts" and json_data.get("state") == "stop":
+                tracer.finish_turn("tts_stop")
+
             # Phát hiện "Bạn ơi" từ STT để bắt đầu trò chuyện tự động
             if msg_type == "stt":
                 text = json_data.get("text", "")
@@ -394,6 +416,9 @@ class Application:
                                     await self.protocol.send_start_listening(
                                         self.listening_mode
                                     )
+                                else:
+                                    # 实时模式持续监听，同样开始新一轮追踪
+                                    TurnTracer.get_instance().start_turn("listen")
                             except Exception:
                                 pass
 
@@ -420,13 +445,16 @@ class Application:
 
     async def _on_audio_channel_closed(self):
         logger.info("Kênh giao thức đã đóng")
+        TurnTracer.get_instance().finish_turn("closed")
         # Kênh đóng -> về IDLE
         await self.set_device_state(DeviceState.IDLE)
         
         # Tự động kết nối lại để tiếp tục chờ "Bạn ơi"
         if self.running and not self._shutdown_event.is_set():
             logger.info("Đang kết nối lại để chờ 'Bạn ơi'...")
-            await asyncio.sleep(1)  # Đợi 1 giây trước khi kết nối lại
+            # 有预热的备用连接时立即切换，否则等待1秒再重连
+            if not self.protocol.standby_ready():
+                await asyncio.sleep(1)  # Đợi 1 giây trước khi kết nối lại
             try:
                 await self.connect_protocol()
             except Exception as e:
@@ -526,6 +554,7 @@ class Application:
 
         logger.info(f"Ngừng phát âm thanh, lý do: {reason}")
         self.aborted = True
+        TurnTracer.get_instance().finish_turn("abort")
         
         # Kiểm tra kết nối trước khi gửi
         if self.protocol and self.is_audio_channel_opened():
@@ -1,19 +1,35 @@
 import platform
-from collections import deque
 from typing import Any, Dict, Optional
 
 import numpy as np
 import sounddevice as sd
 
+from src.audio_codecs.ring_buffer import AudioRingBuffer
 from src.constants.constants import AudioConfig
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 
+class ReferenceSource:
+    """
+    AEC 参考信号来源.
+    """
+
+    AUTO = "auto"  # macOS 优先 BlackHole，找不到时使用应用自身播放
+    LOOPBACK = "loopback"  # 从 BlackHole 等回环设备采集（仅 macOS）
+    PLAYBACK = "playback"  # 由 AudioCodec 输出回调推送实际播放的样本
+
+
 class AECProcessor:
     """
     音频回声消除处理器 专门用于处理参考信号（扬声器输出）和麦克风输入的AEC.
+
+    参考信号来源：
+    - macOS：BlackHole 回环设备，或应用自身播放
+    - Linux：应用自身播放（AudioCodec 输出回调推送，无需虚拟声卡）
+    - Windows：使用系统级AEC
     """
 
     def __init__(self):
@@ -23,7 +39,7 @@ class AECProcessor:
         self._is_linux = self._platform == "linux"
         self._is_windows = self._platform == "windows"
 
-        # WebRTC APM 实例（仅 macOS 使用）
+        # WebRTC APM 实例（macOS / Linux 使用）
         self.apm = None
         self.apm_config = None
         self.capture_config = None
@@ -34,14 +50,38 @@ class AECProcessor:
         self.reference_device_id = None
         self.reference_sample_rate = None
 
-        # 参考信号重采样器（仅 macOS 使用）
+        # 参考信号重采样器（仅 macOS 回环设备使用）
         self.reference_resampler = None
-        self._resample_reference_buffer = deque()
+
+        # 参考信号来源
+        config = ConfigManager.get_instance()
+        self._reference_source_config = config.get_config(
+            "AEC_OPTIONS.REFERENCE_SOURCE", ReferenceSource.AUTO
+        )
+        self.reference_source: Optional[str] = None
+
+        # 应用自身播放的参考信号（输出回调写入，采集工作线程读取）
+        self._playback_ring: Optional[AudioRingBuffer] = None
+        self._playback_chunk: Optional[np.ndarray] = None
+        self._playback_resampler = None
+        self._playback_sample_rate = None
+
+        # 延迟估计（秒）：输出回调与采集工作线程分别更新
+        self._output_latency = 0.0
+        self._capture_latency = 0.0
+        self._stream_delay_ms = 40
 
         # 缓冲区
-        self._reference_buffer = deque()
         self._webrtc_frame_size = 160  # WebRTC标准：16kHz, 10ms = 160 samples
         self._system_frame_size = AudioConfig.INPUT_FRAME_SIZE  # 系统配置的帧大小
+        # 参考信号最多保留约200ms，环形缓冲区预留1秒防止消费端短暂停顿时丢数据
+        self._max_reference_samples = self._webrtc_frame_size * 20
+        self._reference_buffer = AudioRingBuffer(
+            AudioConfig.INPUT_SAMPLE_RATE, dtype=np.int16
+        )
+        self._reference_frame = np.zeros(self._system_frame_size, dtype=np.int16)
+        # APM 采集处理结果（调用方持有的输出缓冲区，每帧复用）
+        self._capture_out = np.zeros(self._system_frame_size, dtype=np.int16)
 
         # 状态标志
         self._is_initialized = False
@@ -52,17 +92,28 @@ class AECProcessor:
         初始化AEC处理器.
         """
         try:
-            if self._is_windows or self._is_linux:
-                # Windows 和 Linux 平台使用系统级AEC，无需额外处理
-                logger.info(
-                    f"{self._platform.capitalize()} 平台使用系统级回声消除，AEC处理器已启用"
+            if self._is_macos or self._is_linux:
+                # macOS / Linux 平台使用进程内 WebRTC APM
+                await self._initialize_apm()
+
+                use_loopback = self._is_macos and self._reference_source_config in (
+                    ReferenceSource.AUTO,
+                    ReferenceSource.LOOPBACK,
                 )
+                if use_loopback:
+                    await self._initialize_reference_capture()
+
+                if self.reference_stream is not None:
+                    self.reference_source = ReferenceSource.LOOPBACK
+                else:
+                    # 由 AudioCodec 调用 set_playback_format 后开始推送播放样本
+                    self.reference_source = ReferenceSource.PLAYBACK
+                    logger.info("AEC参考信号使用应用自身播放的音频")
+            elif self._is_windows:
+                # Windows 平台使用系统级AEC，无需额外处理
+                logger.info("Windows 平台使用系统级回声消除，AEC处理器已启用")
                 self._is_initialized = True
                 return
-            elif self._is_macos:
-                # macOS 平台使用 WebRTC + BlackHole
-                await self._initialize_apm()
-                await self._initialize_reference_capture()
             else:
                 logger.warning(f"当前平台 {self._platform} 暂不支持AEC功能")
                 self._is_initialized = True
@@ -76,16 +127,26 @@ class AECProcessor:
             await self.close()
             raise
 
-    async def _initialize_apm(self):
+    @property
+    def is_active(self) -> bool:
         """
-        初始化WebRTC音频处理模块（仅macOS）
+        是否在进程内执行回声消除（APM 已创建）
         """
-        if not self._is_macos:
-            logger.warning("非macOS平台调用了_initialize_apm，这不应该发生")
-            return
+        return self._is_initialized and self.apm is not None
 
+    @property
+    def uses_playback_reference(self) -> bool:
+        """
+        参考信号是否来自应用自身播放.
+        """
+        return self.reference_source == ReferenceSource.PLAYBACK
+
+    async def _initialize_apm(self):
+        """
+        初始化WebRTC音频处理模块（macOS / Linux）
+        """
         try:
-            # 延迟导入，仅在macOS需要时加载本地库
+            # 延迟导入，仅在需要时加载本地库
             from libs.webrtc_apm import WebRTCAudioProcessing, create_default_config
 
             self.apm = WebRTCAudioProcessing()
@@ -118,8 +179,8 @@ class AECProcessor:
             self.capture_config = self.apm.create_stream_config(sample_rate, channels)
             self.render_config = self.apm.create_stream_config(sample_rate, channels)
 
-            # 设置流延迟
-            self.apm.set_stream_delay_ms(40)  # 50ms延迟
+            # 设置流延迟（应用自身播放作为参考时按实测延迟持续更新）
+            self.apm.set_stream_delay_ms(self._stream_delay_ms)
 
             logger.info("WebRTC APM初始化完成")
 
@@ -232,33 +293,18 @@ class AECProcessor:
             return
 
         try:
-            audio_data = indata.copy().flatten()
+            # 单声道输入，直接取第一列视图，写入时由环形缓冲区完成拷贝
+            audio_data = indata[:, 0]
 
             # 使用soxr高质量重采样
             if self.reference_resampler:
                 # 重采样到16kHz
-                resampled_data = self.reference_resampler.resample_chunk(
+                audio_data = self.reference_resampler.resample_chunk(
                     audio_data, last=False
                 )
-                if len(resampled_data) > 0:
-                    self._resample_reference_buffer.extend(
-                        resampled_data.astype(np.int16)
-                    )
-
-                # 从缓冲区提取WebRTC标准帧
-                while len(self._resample_reference_buffer) >= self._webrtc_frame_size:
-                    for _ in range(self._webrtc_frame_size):
-                        self._reference_buffer.append(
-                            self._resample_reference_buffer.popleft()
-                        )
-            else:
-                # 无需重采样，直接使用
-                self._reference_buffer.extend(audio_data)
 
-            # 保持缓冲区大小合理
-            max_buffer_size = self._webrtc_frame_size * 20  # 保持约200ms的数据
-            while len(self._reference_buffer) > max_buffer_size:
-                self._reference_buffer.popleft()
+            if len(audio_data) > 0:
+                self._reference_buffer.write(audio_data)
 
         except Exception as e:
             logger.error(f"参考信号回调错误: {e}")
@@ -269,136 +315,196 @@ class AECProcessor:
         """
         logger.info("参考信号流已结束")
 
-    def process_audio(self, capture_audio: np.ndarray) -> np.ndarray:
-        """处理音频帧，应用AEC 支持10ms/20ms/40ms/60ms等不同帧长度，通过分割处理实现.
+    # ============= 应用自身播放作为参考信号 =============
 
-        Args:
-            capture_audio: 麦克风采集的音频数据 (16kHz, int16)
+    def set_playback_format(self, sample_rate: int):
+        """设置播放参考信号格式（AudioCodec 创建输出流后调用）
 
-        Returns:
-            处理后的音频数据
+        Args:
+            sample_rate: 输出设备采样率（单声道 float32 样本）
         """
-        if not self._is_initialized:
-            return capture_audio
+        if not self.uses_playback_reference:
+            return
 
-        # Windows 和 Linux 平台直接返回原始音频（系统级处理）
-        if self._is_windows or self._is_linux:
-            return capture_audio
+        self._playback_sample_rate = sample_rate
+        # 环形缓冲区预留1秒，读取时只保留最近约200ms
+        self._playback_ring = AudioRingBuffer(sample_rate, dtype=np.float32)
+        self._playback_chunk = np.zeros(sample_rate // 5, dtype=np.float32)
 
-        # macOS 平台使用 WebRTC AEC 处理
-        if not self._is_macos or self.apm is None:
-            return capture_audio
+        if sample_rate != AudioConfig.INPUT_SAMPLE_RATE:
+            import soxr
 
-        try:
-            # 检查输入帧大小是否为WebRTC帧大小的整数倍
-            if len(capture_audio) % self._webrtc_frame_size != 0:
-                logger.warning(
-                    f"音频帧大小不是WebRTC帧的整数倍: {len(capture_audio)}, WebRTC帧: {self._webrtc_frame_size}"
-                )
-                return capture_audio
+            self._playback_resampler = soxr.ResampleStream(
+                sample_rate,
+                AudioConfig.INPUT_SAMPLE_RATE,
+                num_channels=1,
+                dtype="float32",
+                quality="QQ",
+            )
+            logger.info(
+                f"播放参考信号重采样: {sample_rate}Hz → {AudioConfig.INPUT_SAMPLE_RATE}Hz"
+            )
 
-            # 计算需要分割的块数
-            num_chunks = len(capture_audio) // self._webrtc_frame_size
+    def push_playback(self, samples: np.ndarray, output_latency: float):
+        """推送实际播放的样本（输出回调线程调用，只做一次拷贝）
 
-            if num_chunks == 1:
-                # 10ms帧，直接处理
-                return self._process_single_aec_frame(capture_audio)
-            else:
-                # 20ms/40ms/60ms帧，分割处理
-                return self._process_chunked_aec_frames(capture_audio, num_chunks)
+        Args:
+            samples: 本次回调写入设备的单声道 float32 样本（含静音）
+            output_latency: 从回调到样本真正播出的时间（秒）
+        """
+        if self._playback_ring is None or self._is_closing:
+            return
+        self._playback_ring.write(samples)
+        if output_latency > 0:
+            self._output_latency = output_latency
 
-        except Exception as e:
-            logger.error(f"AEC处理失败: {e}")
-            return capture_audio
+    def set_capture_latency(self, capture_latency: float):
+        """更新采集延迟（采集工作线程调用）
 
-    def _process_single_aec_frame(self, capture_audio: np.ndarray) -> np.ndarray:
+        Args:
+            capture_latency: 从样本被麦克风采集到进入AEC处理的时间（秒），
+                含设备输入延迟和采集缓冲区积压
         """
-        处理单个10ms WebRTC帧（仅macOS）
+        if capture_latency > 0:
+            self._capture_latency = capture_latency
+
+    def _pull_playback_reference(self):
         """
-        if not self._is_macos:
-            return capture_audio
+        将播放样本转换为16kHz int16并写入参考信号缓冲区（采集工作线程）
+        """
+        ring = self._playback_ring
+        if ring is None:
+            return
 
-        try:
-            # 仅在macOS导入ctypes
-            import ctypes
+        # 只保留最近的数据，旧数据对应的回声已经过去
+        excess = ring.available - len(self._playback_chunk)
+        if excess > 0:
+            ring.skip(excess)
 
-            # 获取参考信号
-            reference_audio = self._get_reference_frame(self._webrtc_frame_size)
+        count = ring.read_into(self._playback_chunk)
+        if count == 0:
+            return
 
-            # 创建ctypes缓冲区
-            capture_buffer = (ctypes.c_short * self._webrtc_frame_size)(*capture_audio)
-            reference_buffer = (ctypes.c_short * self._webrtc_frame_size)(
-                *reference_audio
-            )
+        audio_data = self._playback_chunk[:count]
+        if self._playback_resampler is not None:
+            audio_data = self._playback_resampler.resample_chunk(audio_data, last=False)
+            if len(audio_data) == 0:
+                return
 
-            processed_capture = (ctypes.c_short * self._webrtc_frame_size)()
-            processed_reference = (ctypes.c_short * self._webrtc_frame_size)()
+        reference = np.clip(audio_data * 32768.0, -32768, 32767).astype(np.int16)
+        self._reference_buffer.write(reference)
 
-            # 首先处理参考信号（render stream）
-            render_result = self.apm.process_reverse_stream(
-                reference_buffer,
-                self.render_config,
-                self.render_config,
-                processed_reference,
-            )
+    def _update_stream_delay(self):
+        """更新 APM 流延迟.
 
-            if render_result != 0:
-                logger.warning(f"参考信号处理失败，错误码: {render_result}")
+        延迟 = 输出延迟（写入设备到播出）+ 采集延迟（采集到处理）
+        - 参考信号排队时长（参考样本比当前采集帧更早送入APM）
+        """
+        queued_ms = (
+            self._reference_buffer.available * 1000 / AudioConfig.INPUT_SAMPLE_RATE
+        )
+        delay_ms = (self._output_latency + self._capture_latency) * 1000 - queued_ms
+        delay_ms = int(min(500, max(0, delay_ms)))
+        # 变化超过5ms才更新，避免AEC频繁重新收敛
+        if abs(delay_ms - self._stream_delay_ms) >= 5:
+            self._stream_delay_ms = delay_ms
+            self.apm.set_stream_delay_ms(delay_ms)
+
+    def get_stats(self) -> dict:
+        """获取AEC状态.
 
-            # 然后处理采集信号（capture stream）
-            capture_result = self.apm.process_stream(
-                capture_buffer,
-                self.capture_config,
-                self.capture_config,
-                processed_capture,
-            )
+        Returns:
+            dict: 参考信号来源、延迟估计和参考信号缓冲情况
+        """
+        return {
+            "active": self.is_active,
+            "reference_source": self.reference_source,
+            "stream_delay_ms": self._stream_delay_ms,
+            "output_latency_ms": self._output_latency * 1000,
+            "capture_latency_ms": self._capture_latency * 1000,
+            "reference_buffered_ms": self._reference_buffer.available
+            * 1000
+            / AudioConfig.INPUT_SAMPLE_RATE,
+        }
+
+    def process_audio(self, capture_audio: np.ndarray) -> np.ndarray:
+        """处理音频帧，应用AEC 支持10ms/20ms/40ms/60ms等不同帧长度，按10ms子帧批量处理.
+
+        Args:
+            capture_audio: 麦克风采集的音频数据 (16kHz, int16)
+
+        Returns:
+            处理后的音频数据（复用的输出缓冲区，下一帧会被覆盖）
+        """
+        # 未创建 APM（Windows 系统级处理等）时直接返回原始音频
+        if not self.is_active:
+            return capture_audio
 
-            if capture_result != 0:
-                logger.warning(f"采集信号处理失败，错误码: {capture_result}")
+        try:
+            if self.uses_playback_reference:
+                self._pull_playback_reference()
+                self._update_stream_delay()
+
+            # 检查输入帧大小是否为WebRTC帧大小的整数倍
+            if len(capture_audio) % self._webrtc_frame_size != 0:
+                logger.warning(
+                    f"音频帧大小不是WebRTC帧的整数倍: {len(capture_audio)}, WebRTC帧: {self._webrtc_frame_size}"
+                )
                 return capture_audio
 
-            # 转换回numpy数组
-            return np.array(processed_capture, dtype=np.int16)
+            return self._process_aec_frames(capture_audio)
 
         except Exception as e:
-            logger.error(f"AEC帧处理失败: {e}")
+            logger.error(f"AEC处理失败: {e}")
             return capture_audio
 
-    def _process_chunked_aec_frames(
-        self, capture_audio: np.ndarray, num_chunks: int
-    ) -> np.ndarray:
-        """
-        分割处理大帧（20ms/40ms/60ms等）
-        """
-        processed_chunks = []
-
-        for i in range(num_chunks):
-            # 提取当前10ms块
-            start_idx = i * self._webrtc_frame_size
-            end_idx = (i + 1) * self._webrtc_frame_size
-            chunk = capture_audio[start_idx:end_idx]
+    def _process_aec_frames(self, capture_audio: np.ndarray) -> np.ndarray:
+        """一次调用处理整帧包含的全部10ms子帧.
 
-            # 处理这个10ms块
-            processed_chunk = self._process_single_aec_frame(chunk)
-            processed_chunks.append(processed_chunk)
+        参考信号和采集信号直接以数组地址传入 APM，结果写入复用的输出缓冲区.
+        """
+        frame_size = len(capture_audio)
+        if len(self._capture_out) != frame_size:
+            self._capture_out = np.zeros(frame_size, dtype=np.int16)
+
+        capture = np.ascontiguousarray(capture_audio, dtype=np.int16)
+        reference = self._get_reference_frame(frame_size)
+
+        # 参考信号处理结果原地写回参考帧缓冲区（仅用于APM内部分析）
+        result = self.apm.process_frames(
+            reference,
+            capture,
+            self.render_config,
+            self.capture_config,
+            self._capture_out,
+            self._webrtc_frame_size,
+        )
+        if result != 0:
+            logger.warning(f"AEC处理失败，错误码: {result}")
+            return capture_audio
 
-        # 将所有处理后的块重新组合
-        return np.concatenate(processed_chunks)
+        return self._capture_out
 
     def _get_reference_frame(self, frame_size: int) -> np.ndarray:
         """
         获取指定大小的参考信号帧.
         """
-        # 如果没有参考信号或缓冲区不足，返回静音
-        if len(self._reference_buffer) < frame_size:
-            return np.zeros(frame_size, dtype=np.int16)
-
-        # 从缓冲区提取一帧
-        frame_data = []
-        for _ in range(frame_size):
-            frame_data.append(self._reference_buffer.popleft())
-
-        return np.array(frame_data, dtype=np.int16)
+        # 保持缓冲区大小合理：只保留最近约200ms的数据（在消费端裁剪，避免跨线程改读位置）
+        excess = self._reference_buffer.available - self._max_reference_samples
+        if excess > 0:
+            self._reference_buffer.skip(excess)
+
+        if len(self._reference_frame) != frame_size:
+            self._reference_frame = np.zeros(frame_size, dtype=np.int16)
+
+        # 按10ms子帧读取：可用的整子帧依次填入，不足的子帧补静音
+        step = self._webrtc_frame_size
+        count = min(frame_size, self._reference_buffer.available // step * step)
+        if count > 0:
+            self._reference_buffer.read_into(self._reference_frame, count)
+        if count < frame_size:
+            self._reference_frame[count:] = 0
+        return self._reference_frame
 
     async def close(self):
         """
@@ -411,46 +517,45 @@ class AECProcessor:
         logger.info("开始关闭AEC处理器...")
 
         try:
-            # 仅在 macOS 平台清理 WebRTC 相关资源
-            if self._is_macos:
-                # 停止参考信号流
-                if self.reference_stream:
-                    try:
-                        self.reference_stream.stop()
-                        self.reference_stream.close()
-                    except Exception as e:
-                        logger.warning(f"关闭参考信号流失败: {e}")
-                    finally:
-                        self.reference_stream = None
-
-                # 清理重采样器
-                if self.reference_resampler:
-                    try:
-                        # 刷新重采样器缓冲区
-                        empty_array = np.array([], dtype=np.int16)
-                        self.reference_resampler.resample_chunk(empty_array, last=True)
-                    except Exception as e:
-                        logger.debug(f"刷新参考信号重采样器缓冲区失败: {e}")
-                    finally:
-                        self.reference_resampler = None
-
-                # 清理WebRTC APM
-                if self.apm:
-                    try:
-                        if self.capture_config:
-                            self.apm.destroy_stream_config(self.capture_config)
-                        if self.render_config:
-                            self.apm.destroy_stream_config(self.render_config)
-                    except Exception as e:
-                        logger.warning(f"清理APM配置失败: {e}")
-                    finally:
-                        self.capture_config = None
-                        self.render_config = None
-                        self.apm = None
+            # 停止参考信号流
+            if self.reference_stream:
+                try:
+                    self.reference_stream.stop()
+                    self.reference_stream.close()
+                except Exception as e:
+                    logger.warning(f"关闭参考信号流失败: {e}")
+                finally:
+                    self.reference_stream = None
+
+            # 清理重采样器
+            if self.reference_resampler:
+                try:
+                    # 刷新重采样器缓冲区
+                    empty_array = np.array([], dtype=np.int16)
+                    self.reference_resampler.resample_chunk(empty_array, last=True)
+                except Exception as e:
+                    logger.debug(f"刷新参考信号重采样器缓冲区失败: {e}")
+                finally:
+                    self.reference_resampler = None
+            self._playback_resampler = None
+            self._playback_ring = None
+
+            # 清理WebRTC APM
+            if self.apm:
+                try:
+                    if self.capture_config:
+                        self.apm.destroy_stream_config(self.capture_config)
+                    if self.render_config:
+                        self.apm.destroy_stream_config(self.render_config)
+                except Exception as e:
+                    logger.warning(f"清理APM配置失败: {e}")
+                finally:
+                    self.capture_config = None
+                    self.render_config = None
+                    self.apm = None
 
             # 清理缓冲区
             self._reference_buffer.clear()
-            self._resample_reference_buffer.clear()
 
             self._is_initialized = False
             logger.info("AEC处理器已关闭")
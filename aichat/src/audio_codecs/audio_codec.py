@@ -1,6 +1,8 @@
 import asyncio
 import gc
 import platform
+import threading
+import time
 from collections import deque
 from typing import Callable, List, Optional, Protocol
 
@@ -9,20 +11,38 @@ import opuslib
 import sounddevice as sd
 import soxr
 
+from src.audio_codecs import opus_native
 from src.audio_codecs.aec_processor import AECProcessor
+from src.audio_codecs.audio_telemetry import (
+    CallbackMonitor,
+    LatencyHistogram,
+    LevelGauge,
+)
+from src.audio_codecs.frame_broadcast import FrameBroadcaster, FrameSubscription
+from src.audio_codecs.jitter_buffer import JitterAction, JitterBuffer
+from src.audio_codecs.playout_buffer import OverflowPolicy, PlayoutBuffer
+from src.audio_codecs.ring_buffer import AudioRingBuffer
 from src.constants.constants import AudioConfig
 from src.utils.audio_utils import (
     downmix_to_mono,
-    safe_queue_put,
     select_audio_device,
-    upmix_mono_to_channels,
 )
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
+from src.utils.turn_tracer import TurnTracer
 
 logger = get_logger(__name__)
 
 
+class DecodeMode:
+    """
+    下行 Opus 解码位置.
+    """
+
+    LOOP = "loop"  # 事件循环上的出队任务解码
+    PULL = "pull"  # 解码线程按播放进度拉取解码（不占用事件循环）
+
+
 def _is_raspberry_pi() -> bool:
     """Kiểm tra xem thiết bị có phải là Raspberry Pi không."""
     machine = platform.machine().lower()
@@ -37,7 +57,7 @@ class AudioListener(Protocol):
 
     def on_audio_data(self, audio_data: np.ndarray) -> None:
         """
-        接收音频数据的回调.
+        接收音频数据的回调（只读数组，所有监听器共享，需保留时自行拷贝）.
         """
         ...
 
@@ -62,6 +82,14 @@ class AudioCodec:
     - 输出：接收Opus → 解码24kHz单声道 → 重采样+上混 → 设备原生播放
     """
 
+    # 采集工作线程的处理阶段（用于耗时统计）
+    _CAPTURE_STAGES = ("convert", "aec", "encode", "listeners")
+
+    # 原始采集环形缓冲区可容纳的设备帧数
+    _CAPTURE_RING_BLOCKS = 16
+    # 峰值低于该值（约 -50 dBFS）的帧视为静音
+    _SILENCE_PEAK = 100
+
     def __init__(self, audio_processor: Optional[AECProcessor] = None):
         """初始化音频编解码器.
 
@@ -87,9 +115,19 @@ class AudioCodec:
         self.input_resampler = None
         self.output_resampler = None
 
-        # 重采样缓冲区
-        self._resample_input_buffer = deque()
-        self._resample_output_buffer = deque()
+        # 重采样缓冲区（预分配环形缓冲区，按需创建）
+        self._resample_input_buffer: Optional[AudioRingBuffer] = None
+        self._resample_output_buffer: Optional[AudioRingBuffer] = None
+
+        # 回调内复用的帧缓冲区，避免每帧分配
+        self._input_frame: Optional[np.ndarray] = None
+        self._output_frame: Optional[np.ndarray] = None
+        self._playout_pcm: Optional[np.ndarray] = None
+        self._playout_float: Optional[np.ndarray] = None
+
+        # 重采样缓冲区清空请求（由回调线程执行，避免跨线程修改读位置）
+        self._reset_input_resample = False
+        self._reset_output_resample = False
 
         # 转换标记
         self._need_input_downmix = False
@@ -103,16 +141,110 @@ class AudioCodec:
         self.input_stream = None
         self.output_stream = None
 
-        # 播放队列
-        self._output_buffer = asyncio.Queue(maxsize=500)
+        # 采集管线：输入回调只把原始帧拷入环形缓冲区，其余处理在工作线程完成
+        self._capture_ring: Optional[AudioRingBuffer] = None
+        self._capture_block: Optional[np.ndarray] = None
+        self._capture_event = threading.Event()
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_running = False
+        self._capture_stats = {
+            "callbacks": 0,
+            "dropped_blocks": 0,
+            "overflows": 0,
+            "processed_blocks": 0,
+            "encoded_frames": 0,
+            "backlog_peak": 0,
+        }
+        # 各阶段累计/最大耗时（秒）
+        self._stage_totals = dict.fromkeys(self._CAPTURE_STAGES, 0.0)
+        self._stage_max = dict.fromkeys(self._CAPTURE_STAGES, 0.0)
+
+        # 实时健康遥测（各自只由一个线程写入，无锁）
+        self._input_monitor = CallbackMonitor()
+        self._output_monitor = CallbackMonitor()
+        # 对话轮次追踪：记录首个实际播放样本
+        self._turn_tracer = TurnTracer.get_instance()
+        self._output_underflows = 0
+        self._encode_histogram = LatencyHistogram()
+        self._decode_histogram = LatencyHistogram()
+        self._capture_backlog = LevelGauge()
+        self._input_resample_fill = LevelGauge()
+        self._output_resample_fill = LevelGauge()
+        self._playout_depth = LevelGauge()
+        self._input_resample_dropped = 0
+
+        # 播放缓冲区（事件循环写入，输出回调按样本读取）
+        playout_ms = self.config.get_config("AUDIO_OPTIONS.PLAYOUT_BUFFER_MS", 30000)
+        self._output_buffer = PlayoutBuffer(
+            AudioConfig.OUTPUT_SAMPLE_RATE,
+            capacity_ms=playout_ms,
+            policy=OverflowPolicy.DROP_OLDEST,
+        )
+
+        # 抖动缓冲区（缓存 Opus 包，按播放进度逐帧解码写入播放缓冲区）
+        self._jitter_enabled = self.config.get_config(
+            "AUDIO_OPTIONS.JITTER_BUFFER_ENABLED", True
+        )
+        self._jitter_buffer = JitterBuffer(
+            AudioConfig.FRAME_DURATION,
+            min_depth_ms=self.config.get_config("AUDIO_OPTIONS.JITTER_MIN_MS", None),
+            max_depth_ms=self.config.get_config("AUDIO_OPTIONS.JITTER_MAX_MS", 600),
+            max_packets=max(1, playout_ms // AudioConfig.FRAME_DURATION),
+        )
+        # 播放缓冲区保持的解码余量：至少两帧，覆盖事件循环定时器抖动
+        self._playout_lead_samples = int(
+            AudioConfig.OUTPUT_SAMPLE_RATE
+            * max(AudioConfig.FRAME_DURATION * 2, 80)
+            / 1000
+        )
+        self._jitter_event: Optional[asyncio.Event] = None
+        self._jitter_task: Optional[asyncio.Task] = None
+
+        # 拉取式解码：抖动缓冲区在事件循环和解码线程间共享，用锁保护
+        self._decode_mode = self.config.get_config(
+            "AUDIO_OPTIONS.DECODE_MODE", DecodeMode.LOOP
+        )
+        self._jitter_lock = threading.Lock()
+        self._decode_event = threading.Event()
+        self._decode_thread: Optional[threading.Thread] = None
+        self._decode_running = False
+        # 清空队列时递增，丢弃清空前已出队但尚未写入的帧
+        self._decode_generation = 0
 
         # 回调和监听器（解耦外部依赖）
         self._encoded_callback: Optional[Callable] = None
         self._audio_listeners: List[AudioListener] = []
 
+        # 可选的VAD门控（决定编码帧是否上行）及其事件回调
+        self._vad_gate = None
+        self._vad_event_callback: Optional[Callable[[str], None]] = None
+
+        # 采集帧广播：每帧发布一次，订阅者按各自游标读取
+        self._frame_broadcaster = FrameBroadcaster(capacity=100)
+
+        # 唤醒预录：最近 WAKE_PREROLL_MS 的编码帧及采集时间（与广播帧时间戳一致），
+        # 唤醒后补发唤醒词结束之后、listen 指令之前说出的内容
+        preroll_ms = self.config.get_config("AUDIO_OPTIONS.WAKE_PREROLL_MS", 1500)
+        self._encoded_preroll: Optional[deque] = (
+            deque(maxlen=max(1, preroll_ms // AudioConfig.FRAME_DURATION))
+            if preroll_ms > 0
+            else None
+        )
+        self._preroll_lock = threading.Lock()
+
+        # 最近一帧是否为静音（编码回调中读取，用于上行拥塞时丢弃）
+        self._last_frame_silent = False
+
+        # 是否使用原生 Opus 调用层（见 _create_opus_codecs）
+        self._native_opus = False
+
         # 音频处理器（可选注入）
         self.audio_processor = audio_processor
         self._aec_enabled = False
+        # 输出回调是否向AEC推送实际播放的样本（作为参考信号）
+        self._playback_reference = False
+        # 输入设备延迟（秒），由输入回调根据时间戳更新
+        self._input_latency = 0.0
 
         # 状态标记
         self._is_closing = False
@@ -136,6 +268,13 @@ class AudioCodec:
             # 创建重采样器和转换标记
             await self._create_resamplers()
 
+            # 启动采集工作线程（需在输入流启动前就绪）
+            self._start_capture_worker()
+
+            # 拉取式解码：启动解码线程
+            if self._jitter_enabled and self._decode_mode == DecodeMode.PULL:
+                self._start_decode_worker()
+
             # 创建音频流（使用设备原生格式）
             await self._create_streams()
 
@@ -143,7 +282,13 @@ class AudioCodec:
             if self.audio_processor:
                 try:
                     await self.audio_processor.initialize()
-                    self._aec_enabled = self.audio_processor._is_initialized
+                    processor = self.audio_processor
+                    self._aec_enabled = processor.is_active
+                    if self._aec_enabled and processor.uses_playback_reference:
+                        processor.set_playback_format(
+                            self.device_output_sample_rate
+                        )
+                        self._playback_reference = True
                     logger.info(
                         f"AEC处理器已初始化: {'启用' if self._aec_enabled else '禁用'}"
                     )
@@ -269,6 +414,21 @@ class AudioCodec:
         创建Opus编解码器.
         """
         try:
+            # 优先使用原生调用层（编解码直接读写 NumPy 缓冲区，不逐帧分配）
+            use_native = self.config.get_config("AUDIO_OPTIONS.NATIVE_OPUS", True)
+            if use_native and opus_native.is_available():
+                self.opus_encoder = opus_native.NativeOpusEncoder(
+                    AudioConfig.INPUT_SAMPLE_RATE,
+                    AudioConfig.CHANNELS,
+                    opus_native.APPLICATION_VOIP,
+                )
+                self.opus_decoder = opus_native.NativeOpusDecoder(
+                    AudioConfig.OUTPUT_SAMPLE_RATE, AudioConfig.CHANNELS
+                )
+                self._native_opus = True
+                logger.info("Opus编解码器创建成功（原生调用）")
+                return
+
             # 输入编码器：16kHz单声道
             self.opus_encoder = opuslib.Encoder(
                 AudioConfig.INPUT_SAMPLE_RATE,
@@ -305,6 +465,11 @@ class AudioCodec:
                 dtype="float32",
                 quality="QQ",  # 快速质量（低延迟）
             )
+            # 重采样后累积到整帧再输出，预留多帧余量应对回调抖动
+            self._resample_input_buffer = AudioRingBuffer(
+                AudioConfig.INPUT_FRAME_SIZE * 8, dtype=np.float32
+            )
+            self._input_frame = np.zeros(AudioConfig.INPUT_FRAME_SIZE, dtype=np.float32)
             logger.info(f"输入重采样: {self.device_input_sample_rate}Hz → 16kHz")
 
         # 输出转换器配置
@@ -317,6 +482,13 @@ class AudioCodec:
                 dtype="float32",
                 quality="QQ",
             )
+            # 容量需覆盖“一次回调所需帧数 + 一个重采样块”，按8帧预留
+            self._resample_output_buffer = AudioRingBuffer(
+                self._device_output_frame_size * 8, dtype=np.float32
+            )
+            self._output_frame = np.zeros(
+                self._resample_output_buffer.capacity, dtype=np.float32
+            )
             logger.info(
                 f"输出重采样: {AudioConfig.OUTPUT_SAMPLE_RATE}Hz → "
                 f"{self.device_output_sample_rate}Hz"
@@ -327,6 +499,14 @@ class AudioCodec:
         if self._need_output_upmix:
             logger.info(f"输出声道上混: 1ch → {self.output_channels}ch")
 
+        # 3. 输出回调读取播放缓冲区用的暂存区（直接播放按设备帧，重采样按协议帧）
+        #    预留多倍余量，应对设备实际 blocksize 大于配置值的情况
+        playout_chunk = max(
+            self._device_output_frame_size, AudioConfig.OUTPUT_FRAME_SIZE
+        )
+        self._playout_pcm = np.zeros(playout_chunk * 4, dtype=np.int16)
+        self._playout_float = np.zeros(playout_chunk * 4, dtype=np.float32)
+
     async def _create_streams(self):
         """
         创建音频流（完全使用设备原生格式）
@@ -379,85 +559,249 @@ class AudioCodec:
             raise
 
     def _input_callback(self, indata, frames, time_info, status):
+        """输入回调（实时线程）：只把设备原生帧拷入环形缓冲区并唤醒工作线程.
+
+        下混、重采样、AEC、编码和监听器分发都在采集工作线程中完成，
+        回调内的工作量固定且不分配内存。
         """
-        输入回调：设备原生格式 → 服务端协议格式 转换流程：多声道/高采样率 → 下混+重采样 → 16kHz单声道 → Opus编码.
-        """
-        if status and "overflow" not in str(status).lower():
-            logger.warning(f"输入流状态: {status}")
+        start = time.perf_counter()
+        stats = self._capture_stats
+        if status:
+            if "overflow" in str(status).lower():
+                stats["overflows"] += 1
+            else:
+                logger.warning(f"输入流状态: {status}")
 
-        if self._is_closing:
+        if self._is_closing or self._capture_ring is None:
             return
 
-        try:
-            # 步骤1: 声道下混（立体声/多声道 → 单声道）
-            if self._need_input_downmix:
-                # indata shape: (frames, channels)
-                audio_data = downmix_to_mono(indata, keepdims=False)
-            else:
-                audio_data = indata.flatten()  # 已经是单声道
+        stats["callbacks"] += 1
+        latency = time_info.currentTime - time_info.inputBufferAdcTime
+        if latency > 0:
+            self._input_latency = latency
 
-            # 步骤2: 采样率转换（设备采样率 → 16kHz）
-            if self.input_resampler is not None:
-                audio_data = self._process_input_resampling(audio_data)
-                if audio_data is None:  # 数据不足，等待下一帧
-                    return
+        raw = indata.reshape(-1)
+        # 整块写入，空间不足时丢弃整块，避免声道错位
+        if self._capture_ring.free < raw.size:
+            stats["dropped_blocks"] += 1
+        else:
+            self._capture_ring.write(raw)
+        self._capture_event.set()
+        self._input_monitor.record(
+            time.perf_counter() - start, frames / self.device_input_sample_rate
+        )
 
-            # 步骤3: 验证帧大小
-            if len(audio_data) != AudioConfig.INPUT_FRAME_SIZE:
-                return
+    def _start_capture_worker(self):
+        """
+        创建原始采集缓冲区并启动采集工作线程.
+        """
+        block_size = self._device_input_frame_size * self.input_channels
+        self._capture_ring = AudioRingBuffer(
+            block_size * self._CAPTURE_RING_BLOCKS, dtype=np.float32
+        )
+        self._capture_block = np.zeros(block_size, dtype=np.float32)
 
-            # 步骤4: 转换为 int16 供 Opus 编码和 AEC 处理
-            audio_data_int16 = (audio_data * 32768.0).astype(np.int16)
+        self._capture_running = True
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, name="AudioCaptureWorker", daemon=True
+        )
+        self._capture_thread.start()
 
-            # 步骤5: AEC处理（如果启用）
-            if self._aec_enabled and self.audio_processor._is_macos:
-                try:
-                    audio_data_int16 = self.audio_processor.process_audio(audio_data_int16)
-                except Exception as e:
-                    logger.warning(f"AEC处理失败，使用原始音频: {e}")
+    def _stop_capture_worker(self):
+        """
+        停止采集工作线程.
+        """
+        self._capture_running = False
+        self._capture_event.set()
+        if self._capture_thread and self._capture_thread.is_alive():
+            self._capture_thread.join(timeout=1.0)
+        self._capture_thread = None
 
-            # 步骤6: Opus编码并实时发送
-            if self._encoded_callback:
+    def _capture_loop(self):
+        """
+        采集工作线程：按设备帧取出原始数据并处理.
+        """
+        block = self._capture_block
+        ring = self._capture_ring
+        stats = self._capture_stats
+        while self._capture_running:
+            self._capture_event.wait(timeout=0.1)
+            self._capture_event.clear()
+
+            backlog = ring.available // block.size
+            if backlog > stats["backlog_peak"]:
+                stats["backlog_peak"] = backlog
+            self._capture_backlog.record(backlog)
+
+            while self._capture_running and ring.available >= block.size:
+                ring.read_into(block)
                 try:
-                    pcm_data = audio_data_int16.tobytes()
-                    encoded_data = self.opus_encoder.encode(
-                        pcm_data, AudioConfig.INPUT_FRAME_SIZE
+                    self._process_capture_block(
+                        block.reshape(-1, self.input_channels)
                     )
-                    if encoded_data:
-                        self._encoded_callback(encoded_data)
                 except Exception as e:
-                    logger.warning(f"实时录音编码失败: {e}")
+                    logger.error(f"采集处理错误: {e}")
+                stats["processed_blocks"] += 1
 
-            # 步骤7: 通知音频监听器（解耦唤醒词检测）
-            for listener in self._audio_listeners:
+    def _process_capture_block(self, indata: np.ndarray):
+        """
+        采集处理：设备原生格式 → 服务端协议格式 转换流程：多声道/高采样率 → 下混+重采样 → 16kHz单声道 → Opus编码.
+        """
+        t0 = time.perf_counter()
+
+        # 步骤1: 声道下混（立体声/多声道 → 单声道）
+        if self._need_input_downmix:
+            # indata shape: (frames, channels)
+            audio_data = downmix_to_mono(indata, keepdims=False)
+        else:
+            audio_data = indata[:, 0]  # 已经是单声道
+
+        # 步骤2: 采样率转换（设备采样率 → 16kHz）
+        if self.input_resampler is not None:
+            audio_data = self._process_input_resampling(audio_data)
+            if audio_data is None:  # 数据不足，等待下一帧
+                return
+
+        # 步骤3: 验证帧大小
+        if len(audio_data) != AudioConfig.INPUT_FRAME_SIZE:
+            return
+
+        # 步骤4: 转换为 int16 供 Opus 编码和 AEC 处理
+        audio_data_int16 = (audio_data * 32768.0).astype(np.int16)
+        t1 = self._record_stage("convert", t0)
+
+        # 步骤5: AEC处理（如果启用）
+        if self._aec_enabled:
+            try:
+                # 采集延迟 = 设备输入延迟 + 原始采集缓冲区积压
+                backlog = self._capture_ring.available / (
+                    self.input_channels * self.device_input_sample_rate
+                )
+                self.audio_processor.set_capture_latency(self._input_latency + backlog)
+                audio_data_int16 = self.audio_processor.process_audio(audio_data_int16)
+            except Exception as e:
+                logger.warning(f"AEC处理失败，使用原始音频: {e}")
+        t2 = self._record_stage("aec", t1)
+
+        # 采集时间：预录编码帧与广播帧共用，唤醒词结束时刻可直接比较
+        frame_time = time.monotonic()
+
+        # 步骤6: Opus编码并实时发送
+        if self._encoded_callback:
+            try:
+                encode_start = time.perf_counter()
+                if self._native_opus:
+                    # 直接编码 int16 数组；数据包需交给网络层，拷贝一次
+                    encoded_data = bytes(self.opus_encoder.encode(audio_data_int16))
+                else:
+                    encoded_data = self.opus_encoder.encode(
+                        audio_data_int16.tobytes(), AudioConfig.INPUT_FRAME_SIZE
+                    )
+                self._encode_histogram.record(time.perf_counter() - encode_start)
+                if encoded_data:
+                    self._capture_stats["encoded_frames"] += 1
+                    peak = max(
+                        int(audio_data_int16.max()), -int(audio_data_int16.min())
+                    )
+                    self._last_frame_silent = peak < self._SILENCE_PEAK
+                    if self._encoded_preroll is not None:
+                        with self._preroll_lock:
+                            self._encoded_preroll.append((frame_time, encoded_data))
+                    self._dispatch_encoded(audio_data_int16, encoded_data)
+            except Exception as e:
+                logger.warning(f"实时录音编码失败: {e}")
+        t3 = self._record_stage("encode", t2)
+
+        # 步骤7: 发布只读帧（一次拷贝），订阅者与监听器共享（解耦唤醒词检测）
+        listeners = self._audio_listeners
+        if listeners or self._frame_broadcaster.has_subscribers:
+            frame = self._frame_broadcaster.publish(audio_data_int16, frame_time)
+            for listener in listeners:
                 try:
-                    listener.on_audio_data(audio_data_int16.copy())
+                    listener.on_audio_data(frame.int16)
                 except Exception as e:
                     logger.warning(f"音频监听器处理失败: {e}")
+        self._record_stage("listeners", t3)
 
-        except Exception as e:
-            logger.error(f"输入回调错误: {e}")
+    def _dispatch_encoded(self, pcm: np.ndarray, encoded_data: bytes):
+        """
+        经VAD门控（如启用）后交给编码回调；事件先于帧回调，保证起点事件先处理.
+        """
+        gate = self._vad_gate
+        if gate is None:
+            self._encoded_callback(encoded_data)
+            return
+
+        packets, event = gate.process(pcm, encoded_data)
+        if event and self._vad_event_callback:
+            try:
+                self._vad_event_callback(event)
+            except Exception as e:
+                logger.warning(f"VAD事件回调失败: {e}")
+        for packet in packets:
+            self._encoded_callback(packet)
+
+    def _record_stage(self, stage: str, start: float) -> float:
+        """记录一个处理阶段的耗时.
+
+        Returns:
+            当前时间，作为下一阶段的起点
+        """
+        now = time.perf_counter()
+        elapsed = now - start
+        self._stage_totals[stage] += elapsed
+        if elapsed > self._stage_max[stage]:
+            self._stage_max[stage] = elapsed
+        return now
+
+    def get_capture_stats(self) -> dict:
+        """获取采集管线统计.
+
+        Returns:
+            dict: 回调/丢弃/溢出计数、当前与峰值积压（设备帧数）、
+            各阶段平均与最大耗时（毫秒）
+        """
+        stats = dict(self._capture_stats)
+        block_size = self._capture_block.size if self._capture_block is not None else 0
+        stats["backlog"] = (
+            self._capture_ring.available // block_size if block_size else 0
+        )
+        processed = max(1, stats["processed_blocks"])
+        stats["stages"] = {
+            stage: {
+                "avg_ms": self._stage_totals[stage] * 1000 / processed,
+                "max_ms": self._stage_max[stage] * 1000,
+            }
+            for stage in self._CAPTURE_STAGES
+        }
+        return stats
 
     def _process_input_resampling(self, audio_data):
         """
-        输入重采样处理：设备采样率 → 16kHz 使用缓冲区累积数据，凑够一帧再返回.
+        输入重采样处理（采集工作线程）：设备采样率 → 16kHz 使用环形缓冲区累积数据，凑够一帧再返回.
         """
         try:
+            if self._reset_input_resample:
+                self._reset_input_resample = False
+                self._resample_input_buffer.clear()
+
             resampled_data = self.input_resampler.resample_chunk(audio_data, last=False)
             if len(resampled_data) > 0:
-                self._resample_input_buffer.extend(resampled_data)
+                written = self._resample_input_buffer.write(resampled_data)
+                self._input_resample_fill.record(self._resample_input_buffer.available)
+                if written < len(resampled_data):
+                    self._input_resample_dropped += len(resampled_data) - written
+                    logger.debug(
+                        f"输入重采样缓冲区已满，丢弃 {len(resampled_data) - written} 样本"
+                    )
 
             # 累积到目标帧大小
-            expected_frame_size = AudioConfig.INPUT_FRAME_SIZE
-            if len(self._resample_input_buffer) < expected_frame_size:
+            if self._resample_input_buffer.available < AudioConfig.INPUT_FRAME_SIZE:
                 return None
 
-            # 取出一帧
-            frame_data = []
-            for _ in range(expected_frame_size):
-                frame_data.append(self._resample_input_buffer.popleft())
-
-            return np.array(frame_data, dtype=np.float32)
+            # 取出一帧（写入复用的帧缓冲区）
+            self._resample_input_buffer.read_into(self._input_frame)
+            return self._input_frame
 
         except Exception as e:
             logger.error(f"输入重采样失败: {e}")
@@ -467,8 +811,11 @@ class AudioCodec:
         """
         输出回调：服务端协议格式 → 设备原生格式 转换流程：24kHz单声道 → 重采样+上混 → 多声道/高采样率.
         """
+        start = time.perf_counter()
         if status:
-            if "underflow" not in str(status).lower():
+            if "underflow" in str(status).lower():
+                self._output_underflows += 1
+            else:
                 logger.warning(f"输出流状态: {status}")
 
         try:
@@ -484,88 +831,96 @@ class AudioCodec:
             logger.error(f"输出回调错误: {e}")
             outdata.fill(0)
 
+        # 将实际播放的样本（含静音）作为AEC参考信号
+        if self._playback_reference:
+            latency = time_info.outputBufferDacTime - time_info.currentTime
+            self.audio_processor.push_playback(outdata[:, 0], latency)
+
+        buffered = self._output_buffer.buffered
+        self._playout_depth.record(buffered)
+        if self._decode_running and buffered < self._playout_lead_samples:
+            # 播放余量不足，提前唤醒解码线程
+            self._decode_event.set()
+        self._output_monitor.record(
+            time.perf_counter() - start, frames / self.device_output_sample_rate
+        )
+
     def _output_callback_direct(self, outdata, frames):
         """直接播放（设备支持24kHz时）
 
         处理流程:
-        1. 从队列取出单声道数据 (OUTPUT_FRAME_SIZE个样本)
-        2. 截取或填充到所需帧数
-        3. 转换 int16 → float32
-        4. 如需上混,复制到多声道;否则直接输出
+        1. 从播放缓冲区按样本读取所需帧数（不足部分补静音）
+        2. 转换 int16 → float32（写入预分配暂存区）
+        3. 如需上混,广播到多声道;否则直接输出
         """
-        try:
-            # 从播放队列获取音频数据（单声道 int16 数据）
-            audio_data = self._output_buffer.get_nowait()
-
-            # audio_data 是单声道数据,长度通常 = OUTPUT_FRAME_SIZE
-            # 截取或填充到所需帧数
-            if len(audio_data) >= frames:
-                mono_samples = audio_data[:frames]
-            else:
-                # 数据不足,填充静音
-                mono_samples = np.zeros(frames, dtype=np.int16)
-                mono_samples[: len(audio_data)] = audio_data
-
-            # 转换为 float32 用于播放
-            mono_samples_float = mono_samples.astype(np.float32) / 32768.0
-
-            # 声道处理
-            if self._need_output_upmix:
-                # 单声道 → 多声道（复制到所有声道）
-                multi_channel = upmix_mono_to_channels(
-                    mono_samples_float, self.output_channels
-                )
-                outdata[:] = multi_channel
-            else:
-                # 单声道输出
-                outdata[:, 0] = mono_samples_float
+        pcm = self._playout_pcm[:frames]
+        samples = self._playout_float[:frames]
 
-        except asyncio.QueueEmpty:
+        count = self._output_buffer.read_into(pcm)
+        if count == 0:
             # 无数据时输出静音
             outdata.fill(0)
+            return
+        self._turn_tracer.mark("first_played", after="first_audio")
+        if count < frames:
+            # 数据不足,填充静音
+            pcm[count:] = 0
+
+        # 转换为 float32 用于播放（原地运算，不额外分配）
+        samples[:] = pcm
+        samples *= 1.0 / 32768.0
+
+        # 声道处理：单声道直接写入，多声道按列广播
+        if self._need_output_upmix:
+            outdata[:] = samples[:, None]
+        else:
+            outdata[:, 0] = samples
 
     def _output_callback_with_resample(self, outdata, frames):
         """重采样播放（24kHz → 设备采样率）
 
         处理流程:
-        1. 从队列取出24kHz单声道 int16 数据
+        1. 从播放缓冲区读取24kHz单声道 int16 数据（每次一个协议帧）
         2. 转换为 float32 并重采样到设备采样率（仍为单声道）
-        3. 累积到缓冲区,凑够所需帧数
-        4. 如需上混,复制到多声道;否则直接输出
+        3. 累积到环形缓冲区,凑够所需帧数
+        4. 如需上混,广播到多声道;否则直接输出
         """
         try:
+            if self._reset_output_resample:
+                self._reset_output_resample = False
+                self._resample_output_buffer.clear()
+
+            pcm = self._playout_pcm[: AudioConfig.OUTPUT_FRAME_SIZE]
+            samples = self._playout_float[: AudioConfig.OUTPUT_FRAME_SIZE]
+
             # 持续处理24kHz单声道数据进行重采样
             # 注意: 缓冲区保存的是单声道数据,所以比较 frames 而非 frames*channels
-            while len(self._resample_output_buffer) < frames:
-                try:
-                    audio_data = self._output_buffer.get_nowait()
-                    # 转换 int16 → float32
-                    audio_data_float = audio_data.astype(np.float32) / 32768.0
-                    # 24kHz单声道 → 设备采样率单声道重采样
-                    resampled_data = self.output_resampler.resample_chunk(
-                        audio_data_float, last=False
-                    )
-                    if len(resampled_data) > 0:
-                        self._resample_output_buffer.extend(resampled_data)
-                except asyncio.QueueEmpty:
+            while self._resample_output_buffer.available < frames:
+                count = self._output_buffer.read_into(pcm)
+                if count == 0:
                     break
+                # 转换 int16 → float32
+                samples[:count] = pcm[:count]
+                samples[:count] *= 1.0 / 32768.0
+                # 24kHz单声道 → 设备采样率单声道重采样
+                resampled_data = self.output_resampler.resample_chunk(
+                    samples[:count], last=False
+                )
+                if len(resampled_data) > 0:
+                    self._resample_output_buffer.write(resampled_data)
+
+            self._output_resample_fill.record(self._resample_output_buffer.available)
 
             # 取出所需帧数的单声道数据
-            if len(self._resample_output_buffer) >= frames:
-                frame_data = []
-                for _ in range(frames):
-                    frame_data.append(self._resample_output_buffer.popleft())
-                mono_data = np.array(frame_data, dtype=np.float32)
+            if self._resample_output_buffer.available >= frames:
+                mono_data = self._output_frame[:frames]
+                self._resample_output_buffer.read_into(mono_data)
+                self._turn_tracer.mark("first_played", after="first_audio")
 
-                # 声道处理
+                # 声道处理：单声道直接写入，多声道按列广播（不额外分配）
                 if self._need_output_upmix:
-                    # 单声道 → 多声道（复制到所有声道）
-                    multi_channel = upmix_mono_to_channels(
-                        mono_data, self.output_channels
-                    )
-                    outdata[:] = multi_channel
+                    outdata[:] = mono_data[:, None]
                 else:
-                    # 单声道输出
                     outdata[:, 0] = mono_data
             else:
                 # 数据不足时输出静音
@@ -608,6 +963,48 @@ class AudioCodec:
         else:
             logger.info("已清除编码音频回调")
 
+    def get_encoded_preroll(self, since: float) -> List[bytes]:
+        """取出预录窗口中采集时间晚于 since 的编码帧（可在任意线程调用）
+
+        Args:
+            since: 起始时刻（time.monotonic），如唤醒词结束时刻
+
+        Returns:
+            按采集顺序排列的 Opus 数据包；未启用预录时为空
+        """
+        if self._encoded_preroll is None:
+            return []
+        with self._preroll_lock:
+            return [packet for t, packet in self._encoded_preroll if t > since]
+
+    @property
+    def last_frame_silent(self) -> bool:
+        """
+        当前编码帧是否为静音（仅在编码回调中读取有意义）.
+        """
+        return self._last_frame_silent
+
+    def set_vad_gate(
+        self, gate, event_callback: Optional[Callable[[str], None]] = None
+    ):
+        """设置上行VAD门控（None 表示关闭，所有编码帧直接上行）
+
+        Args:
+            gate: VadGate 实例或 None
+            event_callback: 门控事件回调（在采集工作线程调用），接收 VadEvent
+        """
+        self._vad_event_callback = event_callback
+        self._vad_gate = gate
+
+    def get_vad_stats(self) -> Optional[dict]:
+        """获取VAD门控统计.
+
+        Returns:
+            dict: 见 VadGate.get_stats，未启用时为 None
+        """
+        gate = self._vad_gate
+        return gate.get_stats() if gate is not None else None
+
     def add_audio_listener(self, listener: AudioListener):
         """添加音频监听器（解耦唤醒词检测等功能）
 
@@ -622,6 +1019,36 @@ class AudioCodec:
             self._audio_listeners.append(listener)
             logger.info(f"已添加音频监听器: {listener.__class__.__name__}")
 
+    def subscribe_frames(self, name: str) -> FrameSubscription:
+        """订阅采集帧（共享只读帧，独立游标，适合自行节奏消费的检测器）
+
+        Args:
+            name: 订阅者名称（用于统计）
+
+        Returns:
+            FrameSubscription: 通过 read() 非阻塞读取下一帧
+        """
+        subscription = self._frame_broadcaster.subscribe(name)
+        logger.info(f"已添加采集帧订阅: {name}")
+        return subscription
+
+    def unsubscribe_frames(self, subscription: FrameSubscription):
+        """取消采集帧订阅.
+
+        Args:
+            subscription: subscribe_frames 返回的订阅对象
+        """
+        self._frame_broadcaster.unsubscribe(subscription)
+        logger.info(f"已移除采集帧订阅: {subscription.name}")
+
+    def get_frame_stats(self) -> dict:
+        """获取采集帧广播统计.
+
+        Returns:
+            dict: 见 FrameBroadcaster.get_stats
+        """
+        return self._frame_broadcaster.get_stats()
+
     def remove_audio_listener(self, listener: AudioListener):
         """移除音频监听器.
 
@@ -632,82 +1059,319 @@ class AudioCodec:
             self._audio_listeners.remove(listener)
             logger.info(f"已移除音频监听器: {listener.__class__.__name__}")
 
-    async def write_audio(self, opus_data: bytes):
-        """解码并播放音频（服务端 Opus 数据 → 扬声器）
+    async def write_audio(self, opus_data: bytes, sequence: Optional[int] = None):
+        """接收服务端音频并排队播放（服务端 Opus 数据 → 扬声器）
 
         Args:
             opus_data: 服务端返回的 Opus 编码数据
+            sequence: 数据包序列号（可选），None 时按到达顺序编号
 
         流程:
-            Opus解码 → 24kHz单声道PCM → 播放队列 → 输出回调处理
+            抖动缓冲区 → 按播放进度 Opus 解码（丢包时 FEC/PLC）
+            → 24kHz单声道PCM → 播放缓冲区 → 输出回调处理
         """
+        if not self._jitter_enabled:
+            self._decode_to_playout(JitterAction.FRAME, opus_data)
+            return
+
+        if self._decode_running:
+            # 只缓存压缩数据，由解码线程按播放进度拉取
+            with self._jitter_lock:
+                self._jitter_buffer.put(opus_data, sequence)
+            self._decode_event.set()
+            return
+
+        self._jitter_buffer.put(opus_data, sequence)
+        self._ensure_jitter_task()
+        self._jitter_event.set()
+
+    async def write_audio_batch(self, frames):
+        """批量接收带序列号的服务端音频（一次加锁、一次唤醒）
+
+        Args:
+            frames: [(序列号, Opus数据), ...]，序列号为 None 时按到达顺序编号
+        """
+        if not self._jitter_enabled:
+            for _, opus_data in frames:
+                self._decode_to_playout(JitterAction.FRAME, opus_data)
+            return
+
+        if self._decode_running:
+            with self._jitter_lock:
+                for sequence, opus_data in frames:
+                    self._jitter_buffer.put(opus_data, sequence)
+            self._decode_event.set()
+            return
+
+        for sequence, opus_data in frames:
+            self._jitter_buffer.put(opus_data, sequence)
+        self._ensure_jitter_task()
+        self._jitter_event.set()
+
+    def _ensure_jitter_task(self):
+        """
+        按需启动抖动缓冲区出队任务.
+        """
+        if self._jitter_task is not None and not self._jitter_task.done():
+            return
+        if self._jitter_event is None:
+            self._jitter_event = asyncio.Event()
+        self._jitter_task = asyncio.create_task(
+            self._jitter_pump_loop(), name="audio:jitter_pump"
+        )
+
+    async def _jitter_pump_loop(self):
+        """抖动缓冲区出队循环.
+
+        播放缓冲区低于解码余量时逐帧从抖动缓冲区取包解码，
+        空闲时等待新数据包到达，不占用事件循环.
+        抖动缓冲区取空且播放余量耗尽时先调用一次 pop，记录欠载并结束当前讲话段，
+        使下一段重新预缓冲、重新计算迟到基准.
+        """
+        interval = AudioConfig.FRAME_DURATION / 1000 / 2
         try:
-            # Opus解码为24kHz PCM数据
-            pcm_data = self.opus_decoder.decode(
-                opus_data, AudioConfig.OUTPUT_FRAME_SIZE
-            )
+            while not self._is_closing:
+                if len(self._jitter_buffer) == 0:
+                    if self._output_buffer.buffered >= self._playout_lead_samples:
+                        # 播放余量未耗尽，下一包仍可能及时到达
+                        await asyncio.sleep(interval)
+                        continue
+                    self._jitter_buffer.pop()
+                    self._jitter_event.clear()
+                    await self._jitter_event.wait()
+                    continue
+
+                while self._output_buffer.buffered < self._playout_lead_samples:
+                    action, packet = self._jitter_buffer.pop()
+                    if action in (JitterAction.WAIT, JitterAction.UNDERRUN):
+                        break
+                    self._decode_to_playout(action, packet)
+
+                await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"抖动缓冲区出队任务异常: {e}", exc_info=True)
+
+    def _start_decode_worker(self):
+        """
+        启动解码线程（拉取式解码）.
+        """
+        self._decode_running = True
+        self._decode_thread = threading.Thread(
+            target=self._decode_loop, name="AudioDecodeWorker", daemon=True
+        )
+        self._decode_thread.start()
+        logger.info("下行音频使用拉取式解码（解码线程）")
+
+    def _stop_decode_worker(self):
+        """
+        停止解码线程.
+        """
+        self._decode_running = False
+        self._decode_event.set()
+        if self._decode_thread and self._decode_thread.is_alive():
+            self._decode_thread.join(timeout=1.0)
+        self._decode_thread = None
 
-            audio_array = np.frombuffer(pcm_data, dtype=np.int16)
+    def _decode_loop(self):
+        """解码线程：播放缓冲区低于解码余量时从抖动缓冲区拉取并解码.
+
+        由新数据包到达或输出回调发现余量不足时唤醒，
+        预缓冲期间按半帧间隔轮询，等待抖动缓冲区达到目标深度.
+        """
+        interval = AudioConfig.FRAME_DURATION / 1000 / 2
+        while self._decode_running:
+            self._decode_event.wait(timeout=interval)
+            self._decode_event.clear()
+
+            while (
+                self._decode_running
+                and self._output_buffer.buffered < self._playout_lead_samples
+            ):
+                with self._jitter_lock:
+                    action, packet = self._jitter_buffer.pop()
+                    generation = self._decode_generation
+                if action in (JitterAction.WAIT, JitterAction.UNDERRUN):
+                    break
+
+                # 解码不持锁，避免阻塞事件循环写入新数据包
+                audio_array = self._decode_packet(action, packet)
+                if audio_array is None:
+                    continue
+                with self._jitter_lock:
+                    if generation == self._decode_generation:
+                        self._write_playout(audio_array)
+
+    def _decode_to_playout(self, action: str, packet: Optional[bytes]):
+        """解码一帧并写入播放缓冲区.
+
+        Args:
+            action: JitterAction.FRAME / FEC / PLC
+            packet: 对应的 Opus 数据包（PLC 时为 None）
+        """
+        audio_array = self._decode_packet(action, packet)
+        if audio_array is not None:
+            self._write_playout(audio_array)
+
+    def _write_playout(self, audio_array: np.ndarray):
+        """
+        写入播放缓冲区（满时丢弃最旧数据，保证实时性）.
+        """
+        dropped_before = self._output_buffer.dropped_samples
+        self._output_buffer.write_nowait(audio_array)
+        if self._output_buffer.dropped_samples > dropped_before:
+            logger.warning("播放缓冲区已满，丢弃最旧音频")
+
+    def _decode_packet(
+        self, action: str, packet: Optional[bytes]
+    ) -> Optional[np.ndarray]:
+        """解码一帧.
+
+        Args:
+            action: JitterAction.FRAME / FEC / PLC
+            packet: 对应的 Opus 数据包（PLC 时为 None）
+
+        Returns:
+            24kHz 单声道 int16 样本，解码失败时返回 None
+        """
+        try:
+            start = time.perf_counter()
+            if self._native_opus:
+                # 解码到复用缓冲区，写入播放缓冲区时再拷贝
+                audio_array = self.opus_decoder.decode(
+                    None if action == JitterAction.PLC else packet,
+                    AudioConfig.OUTPUT_FRAME_SIZE,
+                    decode_fec=action == JitterAction.FEC,
+                )
+            elif action == JitterAction.FEC:
+                # 用下一包携带的带内FEC恢复当前帧，不含FEC时 libopus 自动退化为PLC
+                pcm_data = self.opus_decoder.decode(
+                    packet, AudioConfig.OUTPUT_FRAME_SIZE, decode_fec=True
+                )
+            elif action == JitterAction.PLC:
+                # 空数据触发 libopus 丢包隐藏
+                pcm_data = self.opus_decoder.decode(b"", AudioConfig.OUTPUT_FRAME_SIZE)
+            else:
+                pcm_data = self.opus_decoder.decode(
+                    packet, AudioConfig.OUTPUT_FRAME_SIZE
+                )
+            if not self._native_opus:
+                audio_array = np.frombuffer(pcm_data, dtype=np.int16)
+            self._decode_histogram.record(time.perf_counter() - start)
 
             expected_length = AudioConfig.OUTPUT_FRAME_SIZE * AudioConfig.CHANNELS
             if len(audio_array) != expected_length:
                 logger.warning(
                     f"解码音频长度异常: {len(audio_array)}, 期望: {expected_length}"
                 )
-                return
-
-            # 放入播放队列（使用工具函数安全入队）
-            if not safe_queue_put(
-                self._output_buffer, audio_array, replace_oldest=True
-            ):
-                logger.warning("播放队列已满，丢弃音频帧")
+                return None
+            return audio_array
 
-        except opuslib.OpusError as e:
+        except (opuslib.OpusError, opus_native.OpusNativeError) as e:
             logger.warning(f"Opus解码失败，丢弃此帧: {e}")
         except Exception as e:
-            logger.warning(f"音频写入失败，丢弃此帧: {e}")
+            logger.warning(f"音频解码失败，丢弃此帧: {e}")
+        return None
 
     async def write_pcm_direct(self, pcm_data: np.ndarray):
-        """直接写入 PCM 数据到播放队列（供 MusicPlayer 使用）
+        """直接写入 PCM 数据到播放缓冲区（供 MusicPlayer 使用）
 
         Args:
-            pcm_data: 24kHz 单声道 PCM 数据 (np.int16)
+            pcm_data: 24kHz 单声道 PCM 数据 (np.int16)，长度任意
 
         说明:
-            此方法绕过 Opus 解码，直接将 PCM 数据写入播放队列。
+            此方法绕过 Opus 解码，直接将 PCM 数据写入播放缓冲区。
             主要用于本地音乐播放，数据已由 FFmpeg 解码为目标格式。
+            播放缓冲区按样本读取，无需填充或截断到整帧；缓冲区满时阻塞等待。
         """
         try:
-            # 验证数据格式
-            expected_length = AudioConfig.OUTPUT_FRAME_SIZE * AudioConfig.CHANNELS
-
-            # 如果数据长度不匹配，进行填充或截断
-            if len(pcm_data) != expected_length:
-                if len(pcm_data) < expected_length:
-                    # 填充静音
-                    padded = np.zeros(expected_length, dtype=np.int16)
-                    padded[: len(pcm_data)] = pcm_data
-                    pcm_data = padded
-                    logger.debug(
-                        f"PCM 数据不足，填充静音: {len(pcm_data)} → {expected_length}"
-                    )
-                else:
-                    # 截断多余数据
-                    pcm_data = pcm_data[:expected_length]
-                    logger.debug(
-                        f"PCM 数据过长，截断: {len(pcm_data)} → {expected_length}"
-                    )
-
-            # 放入播放队列（不替换旧数据，阻塞等待）
-            if not safe_queue_put(self._output_buffer, pcm_data, replace_oldest=False):
-                # 队列满时阻塞等待
-                await asyncio.wait_for(self._output_buffer.put(pcm_data), timeout=2.0)
+            await self._output_buffer.write(
+                pcm_data, policy=OverflowPolicy.BLOCK, timeout=2.0
+            )
 
         except asyncio.TimeoutError:
-            logger.warning("播放队列阻塞超时，丢弃 PCM 帧")
+            logger.warning("播放缓冲区阻塞超时，丢弃 PCM 帧")
         except Exception as e:
             logger.warning(f"写入 PCM 数据失败: {e}")
 
+    def get_playout_stats(self) -> dict:
+        """获取播放缓冲区填充统计.
+
+        Returns:
+            dict: 见 PlayoutBuffer.get_stats
+        """
+        return self._output_buffer.get_stats()
+
+    def get_jitter_stats(self) -> dict:
+        """获取抖动缓冲区统计.
+
+        Returns:
+            dict: 见 JitterBuffer.get_stats
+        """
+        return self._jitter_buffer.get_stats()
+
+    def get_health_snapshot(self) -> dict:
+        """获取音频实时健康快照（供CLI/GUI/MCP诊断读取，可在任意线程调用）
+
+        Returns:
+            dict: 回调耗时与截止时间、xrun计数、丢弃计数、各缓冲区水位（毫秒）
+            及 Opus 编解码耗时
+        """
+        capture = self._capture_stats
+        playout = self._output_buffer.get_stats()
+        jitter = self._jitter_buffer.get_stats()
+        frames = self._frame_broadcaster.get_stats()
+
+        output_ms = 1000.0 / AudioConfig.OUTPUT_SAMPLE_RATE
+        device_out_ms = 1000.0 / (
+            self.device_output_sample_rate or AudioConfig.OUTPUT_SAMPLE_RATE
+        )
+        block_ms = 1000.0 * (self._device_input_frame_size or 0) / (
+            self.device_input_sample_rate or AudioConfig.INPUT_SAMPLE_RATE
+        )
+
+        return {
+            "timestamp": time.time(),
+            "callbacks": {
+                "input": self._input_monitor.snapshot(),
+                "output": self._output_monitor.snapshot(),
+            },
+            "xruns": {
+                "input_overflows": capture["overflows"],
+                "output_underflows": self._output_underflows,
+                "input_deadline_misses": self._input_monitor.deadline_misses,
+                "output_deadline_misses": self._output_monitor.deadline_misses,
+                "playout_underruns": playout["underruns"],
+                "jitter_underruns": jitter["underruns"],
+            },
+            "dropped": {
+                "capture_blocks": capture["dropped_blocks"],
+                "input_resample_samples": self._input_resample_dropped,
+                "playout_samples": playout["dropped_samples"],
+                "jitter_packets": jitter["overflow_drops"] + jitter["late"],
+                "subscriber_frames": sum(
+                    s["dropped"] for s in frames["subscribers"].values()
+                ),
+            },
+            "levels_ms": {
+                "capture_backlog": self._capture_backlog.snapshot(block_ms),
+                "input_resampler": self._input_resample_fill.snapshot(
+                    1000.0 / AudioConfig.INPUT_SAMPLE_RATE
+                ),
+                "output_resampler": self._output_resample_fill.snapshot(
+                    device_out_ms
+                ),
+                "playout": self._playout_depth.snapshot(output_ms),
+                "jitter": jitter["depth_ms"],
+                "jitter_target": jitter["target_depth_ms"],
+            },
+            "opus": {
+                "encode": self._encode_histogram.snapshot(),
+                "decode": self._decode_histogram.snapshot(),
+            },
+        }
+
     async def reinitialize_stream(self, is_input: bool = True):
         """重建音频流（处理设备错误/断开）
 
@@ -783,31 +1447,28 @@ class AudioCodec:
             - 唤醒词触发时打断旧音频
             - 错误恢复时清空脏数据
         """
-        cleared_count = 0
-
-        # 清空播放队列
-        while not self._output_buffer.empty():
-            try:
-                self._output_buffer.get_nowait()
-                cleared_count += 1
-            except asyncio.QueueEmpty:
-                break
+        # 丢弃尚未解码的数据包，并作废解码线程中已出队的帧
+        with self._jitter_lock:
+            dropped_packets = self._jitter_buffer.reset()
+            self._decode_generation += 1
 
-        # 清空重采样缓冲区
-        if self._resample_input_buffer:
-            cleared_count += len(self._resample_input_buffer)
-            self._resample_input_buffer.clear()
+            # 清空播放缓冲区（由输出回调在下一次读取时跳过）
+            cleared_count = self._output_buffer.clear()
 
-        if self._resample_output_buffer:
-            cleared_count += len(self._resample_output_buffer)
-            self._resample_output_buffer.clear()
+        # 清空重采样缓冲区（请求回调线程执行）
+        if self._resample_input_buffer is not None:
+            cleared_count += self._resample_input_buffer.available
+            self._reset_input_resample = True
 
-        if cleared_count > 0:
-            logger.info(f"清空音频队列，丢弃 {cleared_count} 帧音频数据")
+        if self._resample_output_buffer is not None:
+            cleared_count += self._resample_output_buffer.available
+            self._reset_output_resample = True
 
-        if cleared_count > 100:
-            gc.collect()
-            logger.debug("执行垃圾回收以释放内存")
+        if cleared_count > 0 or dropped_packets > 0:
+            logger.info(
+                f"清空音频队列，丢弃 {cleared_count} 个音频样本、"
+                f"{dropped_packets} 个待解码数据包"
+            )
 
     # ============= AEC 控制方法 =============
 
@@ -875,6 +1536,19 @@ class AudioCodec:
             # 等待回调完全停止
             await asyncio.sleep(0.05)
 
+            # 停止采集和解码工作线程
+            await asyncio.to_thread(self._stop_capture_worker)
+            await asyncio.to_thread(self._stop_decode_worker)
+
+            # 停止抖动缓冲区出队任务
+            if self._jitter_task and not self._jitter_task.done():
+                self._jitter_task.cancel()
+                try:
+                    await self._jitter_task
+                except asyncio.CancelledError:
+                    pass
+            self._jitter_task = None
+
             # 2. 清空回调和监听器
             self._encoded_callback = None
             self._audio_listeners.clear()
@@ -883,6 +1557,8 @@ class AudioCodec:
             await self.clear_audio_queue()
 
             # 4. 关闭AEC处理器
+            self._playback_reference = False
+            self._aec_enabled = False
             if self.audio_processor:
                 try:
                     await self.audio_processor.close()
@@ -898,6 +1574,10 @@ class AudioCodec:
             self.output_resampler = None
 
             # 6. 释放编解码器
+            if self._native_opus:
+                self.opus_encoder.close()
+                self.opus_decoder.close()
+                self._native_opus = False
             self.opus_encoder = None
             self.opus_decoder = None
 
@@ -0,0 +1,172 @@
+from bisect import bisect_left
+from typing import Sequence
+
+# 默认分桶上界（微秒），覆盖音频回调与编解码的常见耗时范围
+DEFAULT_BOUNDS_US = (
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    20000,
+    50000,
+    100000,
+)
+
+
+class LatencyHistogram:
+    """
+    耗时直方图（单写者，无锁）
+
+    固定分桶，记录时只做一次二分查找和几次整数累加，可在实时回调中使用；
+    读取方拷贝计数做快照，读到的可能是相邻两次记录之间的状态，足够用于诊断。
+    """
+
+    def __init__(self, bounds_us: Sequence[int] = DEFAULT_BOUNDS_US):
+        """初始化直方图.
+
+        Args:
+            bounds_us: 递增的分桶上界（微秒），超出最后一个上界的计入溢出桶
+        """
+        self._bounds = [b / 1e6 for b in bounds_us]
+        self._bounds_us = tuple(bounds_us)
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def record(self, seconds: float):
+        """
+        记录一次耗时（秒）.
+        """
+        self._counts[bisect_left(self._bounds, seconds)] += 1
+        self._count += 1
+        self._total += seconds
+        if seconds > self._max:
+            self._max = seconds
+
+    def _percentile_us(self, counts: list, total: int, q: float) -> float:
+        """
+        按分桶估算分位数（返回所在桶的上界，溢出桶返回最大值）.
+        """
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if count and seen >= rank:
+                if index < len(self._bounds_us):
+                    return float(self._bounds_us[index])
+                break
+        return self._max * 1e6
+
+    def snapshot(self) -> dict:
+        """获取直方图快照.
+
+        Returns:
+            dict: 次数、平均/最大耗时、P50/P95/P99 估算（微秒）及各桶计数
+        """
+        counts = list(self._counts)
+        total = sum(counts)
+        if not total:
+            return {"count": 0}
+        return {
+            "count": total,
+            "avg_us": round(self._total / max(1, self._count) * 1e6, 1),
+            "max_us": round(self._max * 1e6, 1),
+            "p50_us": self._percentile_us(counts, total, 0.50),
+            "p95_us": self._percentile_us(counts, total, 0.95),
+            "p99_us": self._percentile_us(counts, total, 0.99),
+            "buckets": {
+                **{f"<={b}": c for b, c in zip(self._bounds_us, counts) if c},
+                **({"overflow": counts[-1]} if counts[-1] else {}),
+            },
+        }
+
+
+class LevelGauge:
+    """
+    水位计（单写者，无锁）：记录最近值、平均值和峰值.
+    """
+
+    def __init__(self):
+        self._last = 0
+        self._peak = 0
+        self._total = 0
+        self._count = 0
+
+    def record(self, value: int):
+        """
+        记录一次水位.
+        """
+        self._last = value
+        self._total += value
+        self._count += 1
+        if value > self._peak:
+            self._peak = value
+
+    def snapshot(self, scale: float = 1.0) -> dict:
+        """获取水位快照.
+
+        Args:
+            scale: 换算系数（如样本数 → 毫秒）
+
+        Returns:
+            dict: 最近值、平均值和峰值（已换算）
+        """
+        count = max(1, self._count)
+        return {
+            "last": round(self._last * scale, 1),
+            "avg": round(self._total / count * scale, 1),
+            "peak": round(self._peak * scale, 1),
+        }
+
+
+class CallbackMonitor:
+    """
+    实时回调监控：耗时直方图 + 超出回调周期（截止时间）的次数.
+    """
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self._deadline = 0.0
+        self._deadline_misses = 0
+        self._worst_ratio = 0.0
+
+    def record(self, elapsed: float, deadline: float):
+        """记录一次回调.
+
+        Args:
+            elapsed: 回调耗时（秒）
+            deadline: 本次回调对应的音频时长（秒），即回调必须完成的期限
+        """
+        self.histogram.record(elapsed)
+        self._deadline = deadline
+        if deadline > 0:
+            ratio = elapsed / deadline
+            if ratio > self._worst_ratio:
+                self._worst_ratio = ratio
+            if ratio >= 1.0:
+                self._deadline_misses += 1
+
+    @property
+    def deadline_misses(self) -> int:
+        """
+        超出回调周期的次数.
+        """
+        return self._deadline_misses
+
+    def snapshot(self) -> dict:
+        """获取回调监控快照.
+
+        Returns:
+            dict: 耗时直方图、回调周期（毫秒）、超时次数和最坏占用比例
+        """
+        return {
+            **self.histogram.snapshot(),
+            "deadline_ms": round(self._deadline * 1000, 2),
+            "deadline_misses": self._deadline_misses,
+            "worst_budget_ratio": round(self._worst_ratio, 3),
+        }
@@ -0,0 +1,291 @@
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+
+class AudioFrame:
+    """
+    只读音频帧（所有订阅者共享同一实例）
+
+    - int16: 原始样本（只读数组）
+    - float32: 归一化到 [-1, 1) 的样本，首次访问时生成并缓存
+    - pcm_bytes: 原始字节，首次访问时生成并缓存
+
+    缓存视图在多个线程同时首次访问时可能各自生成一次，结果相同，无需加锁。
+    """
+
+    __slots__ = ("sequence", "timestamp", "_int16", "_float32", "_bytes")
+
+    def __init__(self, samples: np.ndarray, sequence: int, timestamp: float):
+        """创建音频帧（拷贝一次样本并设为只读）
+
+        Args:
+            samples: int16 单声道样本
+            sequence: 帧序号（从0开始单调递增）
+            timestamp: 发布时间（time.monotonic）
+        """
+        data = np.array(samples, dtype=np.int16)
+        data.flags.writeable = False
+        self._int16 = data
+        self._float32: Optional[np.ndarray] = None
+        self._bytes: Optional[bytes] = None
+        self.sequence = sequence
+        self.timestamp = timestamp
+
+    def __len__(self) -> int:
+        """
+        样本数.
+        """
+        return len(self._int16)
+
+    @property
+    def int16(self) -> np.ndarray:
+        """
+        int16 样本（只读）.
+        """
+        return self._int16
+
+    @property
+    def float32(self) -> np.ndarray:
+        """
+        float32 归一化样本（只读，延迟生成）.
+        """
+        samples = self._float32
+        if samples is None:
+            samples = self._int16.astype(np.float32)
+            samples *= 1.0 / 32768.0
+            samples.flags.writeable = False
+            self._float32 = samples
+        return samples
+
+    @property
+    def pcm_bytes(self) -> bytes:
+        """
+        int16 PCM 字节（延迟生成）.
+        """
+        data = self._bytes
+        if data is None:
+            data = self._int16.tobytes()
+            self._bytes = data
+        return data
+
+
+class FrameSubscription:
+    """
+    帧订阅：每个订阅者持有独立的读取游标，落后超过缓冲容量的帧计入丢弃.
+    """
+
+    def __init__(self, broadcaster: "FrameBroadcaster", name: str):
+        self.name = name
+        self._broadcaster = broadcaster
+        self._cursor = broadcaster.published
+        self._read = 0
+        self._dropped = 0
+
+    @property
+    def lag(self) -> int:
+        """
+        尚未读取的帧数.
+        """
+        return max(0, self._broadcaster.published - self._cursor)
+
+    @property
+    def dropped(self) -> int:
+        """
+        因读取过慢被覆盖而丢弃的帧数.
+        """
+        return self._dropped
+
+    def read(self) -> Optional[AudioFrame]:
+        """读取下一帧（非阻塞）
+
+        Returns:
+            下一帧，没有新帧时返回 None
+        """
+        broadcaster = self._broadcaster
+        capacity = broadcaster.capacity
+        while True:
+            head = broadcaster.published
+            if self._cursor >= head:
+                return None
+
+            oldest = head - capacity
+            if self._cursor < oldest:
+                self._dropped += oldest - self._cursor
+                self._cursor = oldest
+
+            frame = broadcaster._slots[self._cursor % capacity]
+            if frame is None or frame.sequence != self._cursor:
+                # 读取过程中槽位被新帧覆盖，重新计算游标
+                continue
+
+            self._cursor += 1
+            self._read += 1
+            return frame
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[AudioFrame]:
+        """读取下一帧（阻塞，供工作线程使用，没有新帧时休眠而不是轮询）
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等到新帧或被唤醒
+
+        Returns:
+            下一帧；超时或被 interrupt 唤醒时返回 None
+        """
+        frame = self.read()
+        if frame is None:
+            self._broadcaster.wait_for(self._cursor, timeout)
+            frame = self.read()
+        return frame
+
+    def interrupt(self):
+        """
+        唤醒阻塞在 wait 上的读取线程（停止/暂停时使用）.
+        """
+        self._broadcaster.notify_waiters()
+
+    def seek_latest(self) -> int:
+        """跳过所有未读帧（如暂停期间积压的旧数据），不计入丢弃.
+
+        Returns:
+            跳过的帧数
+        """
+        skipped = self.lag
+        self._cursor = self._broadcaster.published
+        return skipped
+
+    def close(self):
+        """
+        取消订阅.
+        """
+        self._broadcaster.unsubscribe(self)
+
+    def get_stats(self) -> dict:
+        """
+        获取订阅统计（已读/积压/丢弃帧数）.
+        """
+        return {"read": self._read, "lag": self.lag, "dropped": self._dropped}
+
+
+class FrameBroadcaster:
+    """
+    采集帧广播（单生产者/多订阅者）
+
+    每帧只发布一次（一次拷贝），放入固定容量的槽位数组；
+    订阅者按各自游标读取，互不影响，读取过慢时最旧的帧被覆盖。
+    生产者只修改槽位和发布计数，订阅者只修改自己的游标，无需加锁；
+    仅当有订阅者阻塞等待时，发布后才经条件变量唤醒。
+    """
+
+    def __init__(self, capacity: int = 100):
+        """初始化帧广播.
+
+        Args:
+            capacity: 保留的最近帧数
+        """
+        if capacity <= 0:
+            raise ValueError(f"帧广播容量必须大于0: {capacity}")
+
+        self.capacity = capacity
+        self._slots: List[Optional[AudioFrame]] = [None] * capacity
+        self._published = 0
+        # 写时复制，遍历时无需加锁
+        self._subscriptions: List[FrameSubscription] = []
+        # 阻塞读取：无等待者时发布不触碰锁
+        self._cond = threading.Condition()
+        self._waiters = 0
+
+    @property
+    def published(self) -> int:
+        """
+        已发布的帧数（即下一帧的序号）.
+        """
+        return self._published
+
+    @property
+    def has_subscribers(self) -> bool:
+        """
+        是否有订阅者.
+        """
+        return bool(self._subscriptions)
+
+    def publish(
+        self, samples: np.ndarray, timestamp: Optional[float] = None
+    ) -> AudioFrame:
+        """发布一帧（生产者调用）
+
+        Args:
+            samples: int16 单声道样本，内部拷贝一次
+            timestamp: 采集时间（time.monotonic），默认取当前时间
+
+        Returns:
+            发布的只读帧
+        """
+        sequence = self._published
+        frame = AudioFrame(
+            samples, sequence, time.monotonic() if timestamp is None else timestamp
+        )
+        # 先写槽位再推进发布计数，保证订阅者看到的都是完整帧
+        self._slots[sequence % self.capacity] = frame
+        self._published = sequence + 1
+        if self._waiters:
+            self.notify_waiters()
+        return frame
+
+    def wait_for(self, cursor: int, timeout: Optional[float] = None) -> bool:
+        """等待发布计数超过 cursor（订阅者调用）
+
+        先登记等待者再检查发布计数：生产者推进计数后才检查等待者，
+        两者顺序相反，因此不会错过唤醒。
+
+        Args:
+            cursor: 订阅者的读取游标
+            timeout: 最长等待秒数
+
+        Returns:
+            是否已有新帧
+        """
+        with self._cond:
+            self._waiters += 1
+            try:
+                if self._published <= cursor:
+                    self._cond.wait(timeout)
+            finally:
+                self._waiters -= 1
+        return self._published > cursor
+
+    def notify_waiters(self):
+        """
+        唤醒所有阻塞等待的订阅者.
+        """
+        with self._cond:
+            self._cond.notify_all()
+
+    def subscribe(self, name: str) -> FrameSubscription:
+        """订阅帧（从下一帧开始读取）
+
+        Args:
+            name: 订阅者名称（用于统计）
+        """
+        subscription = FrameSubscription(self, name)
+        self._subscriptions = self._subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription: FrameSubscription):
+        """
+        取消订阅.
+        """
+        self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+
+    def get_stats(self) -> dict:
+        """获取广播统计.
+
+        Returns:
+            dict: 已发布帧数及每个订阅者的读取/积压/丢弃计数
+        """
+        return {
+            "published": self._published,
+            "subscribers": {s.name: s.get_stats() for s in self._subscriptions},
+        }
@@ -0,0 +1,290 @@
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+
+class JitterAction:
+    """
+    JitterBuffer.pop 的返回动作.
+    """
+
+    FRAME = "frame"  # 正常帧：解码返回的数据包
+    FEC = "fec"  # 当前帧丢失，用下一包的带内FEC恢复
+    PLC = "plc"  # 当前帧丢失且无FEC可用，使用丢包隐藏
+    WAIT = "wait"  # 预缓冲中，暂不输出
+    UNDERRUN = "underrun"  # 播放中缓冲区耗尽
+
+
+class JitterBuffer:
+    """
+    自适应抖动缓冲区（位于 Opus 解码器之前，缓存压缩数据包）
+
+    工作方式：
+    - 每个数据包带序列号；未提供时按到达顺序自动编号（WebSocket/TCP 不会丢包，只有抖动）
+    - 以“到达时间 - 序号×帧长”的最小值为基准，计算每个包的迟到量，
+      目标深度 = 最近迟到量的 P95 + 一帧，限制在 [min_depth_ms, max_depth_ms]
+    - 讲话段开始或欠载后先预缓冲到目标深度，再由播放端按需逐帧取出
+    - 到达间隔超过 talkspurt_gap_ms 视为新讲话段，重新计算迟到基准（句间停顿不计入抖动）
+    - 缺帧时优先返回下一包用于 FEC 解码，否则返回 PLC
+    """
+
+    def __init__(
+        self,
+        frame_duration_ms: int,
+        min_depth_ms: Optional[int] = None,
+        max_depth_ms: int = 600,
+        max_packets: int = 500,
+        history_size: int = 100,
+        talkspurt_gap_ms: int = 1000,
+    ):
+        """初始化抖动缓冲区.
+
+        Args:
+            frame_duration_ms: 每个数据包的时长（毫秒）
+            min_depth_ms: 最小目标深度（毫秒），默认一帧
+            max_depth_ms: 最大目标深度（毫秒）
+            max_packets: 最多缓存的数据包数，超出时丢弃最旧的包
+            history_size: 用于估算抖动的迟到量样本数
+            talkspurt_gap_ms: 缓冲区为空时超过该到达间隔视为新讲话段
+        """
+        self.frame_duration_ms = frame_duration_ms
+        self.min_depth_ms = min_depth_ms or frame_duration_ms
+        self.max_depth_ms = max(max_depth_ms, self.min_depth_ms)
+        self.max_packets = max_packets
+
+        self._frame_s = frame_duration_ms / 1000.0
+        self._talkspurt_gap_s = talkspurt_gap_ms / 1000.0
+        self._packets: Dict[int, bytes] = {}
+        self._lateness = deque(maxlen=history_size)
+        self._target_depth_ms = self.min_depth_ms
+
+        # 序列号状态
+        self._next_seq: Optional[int] = None  # 下一个要播放的序号
+        self._auto_seq = -1  # 自动编号的最后一个序号
+        self._highest_seq: Optional[int] = None
+        self._anchor: Optional[float] = None  # 最早到达基准
+        self._started = False  # 是否已完成预缓冲
+        self._starved = False  # 播放中是否发生过欠载
+        self._prebuffer_since: Optional[float] = None  # 开始预缓冲的时间
+        self._last_arrival: Optional[float] = None  # 上一个包的到达时间
+
+        # 统计
+        self._received = 0
+        self._played = 0
+        self._late = 0
+        self._starved_arrivals = 0
+        self._duplicates = 0
+        self._lost = 0
+        self._fec_frames = 0
+        self._plc_frames = 0
+        self._underruns = 0
+        self._overflow_drops = 0
+
+    # ============= 写入 =============
+
+    def put(
+        self,
+        packet: bytes,
+        sequence: Optional[int] = None,
+        arrival: Optional[float] = None,
+    ) -> bool:
+        """放入一个数据包.
+
+        Args:
+            packet: Opus 数据包
+            sequence: 序列号，None 表示按到达顺序自动编号
+            arrival: 到达时间（time.monotonic），默认取当前时间
+
+        Returns:
+            True=已缓存, False=迟到或重复被丢弃
+        """
+        if arrival is None:
+            arrival = time.monotonic()
+
+        if (
+            not self._packets
+            and self._last_arrival is not None
+            and arrival - self._last_arrival > self._talkspurt_gap_s
+        ):
+            # 长时间无包：上一讲话段已结束，按新讲话段重新预缓冲并计算基准
+            self._started = False
+            self._starved = False
+            self._anchor = None
+            self._prebuffer_since = None
+        self._last_arrival = arrival
+
+        if sequence is None:
+            self._auto_seq += 1
+            sequence = self._auto_seq
+            if self._starved:
+                # 播放端已因等待该包而欠载（包仍会缓存并播放，不计为丢弃）
+                self._starved_arrivals += 1
+                self._starved = False
+        else:
+            self._auto_seq = max(self._auto_seq, sequence)
+
+        self._received += 1
+
+        if self._next_seq is None:
+            self._next_seq = sequence
+        elif sequence < self._next_seq:
+            # 对应的播放时刻已经过去（已被隐藏或跳过）
+            self._late += 1
+            return False
+
+        if sequence in self._packets:
+            self._duplicates += 1
+            return False
+
+        self._update_jitter(sequence, arrival)
+
+        if not self._started and self._prebuffer_since is None:
+            self._prebuffer_since = arrival
+        self._packets[sequence] = packet
+        if self._highest_seq is None or sequence > self._highest_seq:
+            self._highest_seq = sequence
+
+        # 容量保护：丢弃最旧的包
+        while len(self._packets) > self.max_packets:
+            oldest = min(self._packets)
+            del self._packets[oldest]
+            self._overflow_drops += 1
+            self._next_seq = max(self._next_seq, oldest + 1)
+
+        return True
+
+    def _update_jitter(self, sequence: int, arrival: float) -> None:
+        """
+        根据到达时间更新迟到量统计和目标深度.
+        """
+        offset = arrival - sequence * self._frame_s
+        if self._anchor is None or offset < self._anchor:
+            self._anchor = offset
+        self._lateness.append(offset - self._anchor)
+
+        ordered = sorted(self._lateness)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        target = p95 * 1000.0 + self.frame_duration_ms
+        self._target_depth_ms = min(
+            self.max_depth_ms, max(self.min_depth_ms, target)
+        )
+
+    # ============= 读出 =============
+
+    @property
+    def target_depth_ms(self) -> float:
+        """
+        当前目标缓冲深度（毫秒）.
+        """
+        return self._target_depth_ms
+
+    @property
+    def depth_ms(self) -> float:
+        """
+        当前缓存的数据时长（毫秒）.
+        """
+        if self._next_seq is None or self._highest_seq is None:
+            return 0.0
+        span = self._highest_seq - self._next_seq + 1
+        return max(0, span) * self.frame_duration_ms
+
+    def __len__(self) -> int:
+        """
+        当前缓存的数据包数.
+        """
+        return len(self._packets)
+
+    def pop(self, now: Optional[float] = None) -> Tuple[str, Optional[bytes]]:
+        """取出下一帧的处理方式.
+
+        Args:
+            now: 当前时间（time.monotonic），默认取当前时间
+
+        Returns:
+            (action, packet):
+            - (FRAME, 当前帧数据包)
+            - (FEC, 下一帧数据包) 需以 decode_fec=True 解码
+            - (PLC, None) 需以空数据解码做丢包隐藏
+            - (WAIT, None) / (UNDERRUN, None) 暂无可输出数据
+        """
+        if not self._packets:
+            if self._started:
+                self._started = False
+                self._starved = True
+                self._underruns += 1
+                # 重新积累抖动统计基准，下一段按新的到达节奏计算
+                self._anchor = None
+                return JitterAction.UNDERRUN, None
+            return JitterAction.WAIT, None
+
+        if not self._started:
+            if now is None:
+                now = time.monotonic()
+            waited_ms = (now - self._prebuffer_since) * 1000.0
+            # 数据不足目标深度时等待，但最多等待目标深度时长（避免短句尾部卡住）
+            target = self._target_depth_ms
+            if self.depth_ms < target and waited_ms < target:
+                return JitterAction.WAIT, None
+            self._started = True
+            self._starved = False
+            self._prebuffer_since = None
+
+        seq = self._next_seq
+        self._next_seq += 1
+
+        packet = self._packets.pop(seq, None)
+        if packet is not None:
+            self._played += 1
+            return JitterAction.FRAME, packet
+
+        # 当前帧缺失：后面还有包，说明丢失（或迟到到已无法播放）
+        self._lost += 1
+        next_packet = self._packets.get(seq + 1)
+        if next_packet is not None:
+            self._fec_frames += 1
+            return JitterAction.FEC, next_packet
+        self._plc_frames += 1
+        return JitterAction.PLC, None
+
+    def reset(self) -> int:
+        """清空缓冲区并重新开始（统计保留）
+
+        Returns:
+            被丢弃的数据包数
+        """
+        dropped = len(self._packets)
+        self._packets.clear()
+        self._next_seq = None
+        self._highest_seq = None
+        self._anchor = None
+        self._started = False
+        self._starved = False
+        self._prebuffer_since = None
+        self._last_arrival = None
+        self._auto_seq = -1
+        return dropped
+
+    def get_stats(self) -> dict:
+        """获取抖动缓冲区统计.
+
+        Returns:
+            dict: 目标/当前深度、抖动估计及各类计数
+            （late 为迟到被丢弃的包，starved_arrivals 为欠载后到达、仍会播放的包）
+        """
+        lateness_ms = max(self._lateness) * 1000.0 if self._lateness else 0.0
+        return {
+            "target_depth_ms": self._target_depth_ms,
+            "depth_ms": self.depth_ms,
+            "packets": len(self._packets),
+            "max_lateness_ms": lateness_ms,
+            "received": self._received,
+            "played": self._played,
+            "late": self._late,
+            "starved_arrivals": self._starved_arrivals,
+            "duplicates": self._duplicates,
+            "lost": self._lost,
+            "fec_frames": self._fec_frames,
+            "plc_frames": self._plc_frames,
+            "underruns": self._underruns,
+            "overflow_drops": self._overflow_drops,
+        }
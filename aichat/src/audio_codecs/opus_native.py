@@ -0,0 +1,366 @@
+# libopus 原生调用层：直接通过 ctypes 调用 opus_loader 已加载的 libopus，
+# 编码读取调用方的 int16 数组、解码写入 int16 数组，输出复用缓冲区，
+# 热路径上不像 opuslib 那样逐帧创建中间 bytes / 数组对象
+
+import ctypes
+from typing import Optional, Sequence
+
+import numpy as np
+
+from src.utils.opus_loader import get_opus_library
+
+APPLICATION_VOIP = 2048
+APPLICATION_AUDIO = 2049
+APPLICATION_RESTRICTED_LOWDELAY = 2051
+
+# 单个 Opus 包的最大字节数（libopus 推荐值）
+MAX_PACKET_BYTES = 4000
+
+_lib: Optional[ctypes.CDLL] = None
+
+
+class OpusNativeError(Exception):
+    """
+    libopus 调用失败.
+    """
+
+
+def _load_library() -> ctypes.CDLL:
+    """
+    加载 libopus 并声明函数签名（只执行一次）.
+    """
+    global _lib
+    if _lib is not None:
+        return _lib
+
+    lib = get_opus_library()
+    if lib is None:
+        raise OpusNativeError("未找到opus库")
+
+    c_int, c_int32, c_void_p = ctypes.c_int, ctypes.c_int32, ctypes.c_void_p
+
+    lib.opus_encoder_create.argtypes = [c_int32, c_int, c_int, ctypes.POINTER(c_int)]
+    lib.opus_encoder_create.restype = c_void_p
+    lib.opus_encoder_destroy.argtypes = [c_void_p]
+    lib.opus_encoder_destroy.restype = None
+    # 数组参数以整数地址传入，调用时不创建 ctypes 指针对象
+    lib.opus_encode.argtypes = [c_void_p, c_void_p, c_int, c_void_p, c_int32]
+    lib.opus_encode.restype = c_int32
+
+    lib.opus_decoder_create.argtypes = [c_int32, c_int, ctypes.POINTER(c_int)]
+    lib.opus_decoder_create.restype = c_void_p
+    lib.opus_decoder_destroy.argtypes = [c_void_p]
+    lib.opus_decoder_destroy.restype = None
+    # 数据包以 bytes 直接传入（不拷贝），None 表示丢包隐藏
+    lib.opus_decode.argtypes = [
+        c_void_p,
+        ctypes.c_char_p,
+        c_int32,
+        c_void_p,
+        c_int,
+        c_int,
+    ]
+    lib.opus_decode.restype = c_int
+
+    lib.opus_strerror.argtypes = [c_int]
+    lib.opus_strerror.restype = ctypes.c_char_p
+
+    _lib = lib
+    return lib
+
+
+def is_available() -> bool:
+    """
+    检查原生 libopus 是否可用.
+    """
+    try:
+        _load_library()
+        return True
+    except (OpusNativeError, AttributeError):
+        return False
+
+
+def _check(result: int) -> int:
+    """
+    检查 libopus 返回值，负数为错误码.
+    """
+    if result < 0:
+        message = _lib.opus_strerror(result)
+        raise OpusNativeError(message.decode() if message else f"opus错误 {result}")
+    return result
+
+
+def _int16_address(array: np.ndarray) -> int:
+    """
+    获取 int16 连续数组的数据地址.
+    """
+    if array.dtype != np.int16 or not array.flags.c_contiguous:
+        raise ValueError("需要C连续的 int16 数组")
+    return array.ctypes.data
+
+
+class NativeOpusEncoder:
+    """
+    Opus 编码器（原生调用，输出写入复用缓冲区）.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        channels: int = 1,
+        application: int = APPLICATION_VOIP,
+        max_packet_bytes: int = MAX_PACKET_BYTES,
+    ):
+        """创建编码器.
+
+        Args:
+            sample_rate: 采样率（8000/12000/16000/24000/48000）
+            channels: 声道数
+            application: APPLICATION_VOIP / APPLICATION_AUDIO / ...
+            max_packet_bytes: 单个数据包最大字节数
+        """
+        self._lib = _load_library()
+        error = ctypes.c_int(0)
+        self._state = self._lib.opus_encoder_create(
+            sample_rate, channels, application, ctypes.byref(error)
+        )
+        _check(error.value)
+        if not self._state:
+            raise OpusNativeError("创建Opus编码器失败")
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.max_packet_bytes = max_packet_bytes
+        self._packet = bytearray(max_packet_bytes)
+        self._packet_view = memoryview(self._packet)
+        self._packet_address = ctypes.addressof(
+            (ctypes.c_char * max_packet_bytes).from_buffer(self._packet)
+        )
+
+    def encode_into(self, pcm: np.ndarray, out: np.ndarray) -> int:
+        """编码一帧到调用方缓冲区.
+
+        Args:
+            pcm: 一帧 int16 样本（交错多声道）
+            out: uint8 输出缓冲区
+
+        Returns:
+            数据包字节数
+        """
+        if out.dtype != np.uint8 or not out.flags.c_contiguous:
+            raise ValueError("输出缓冲区需为C连续的 uint8 数组")
+        return _check(
+            self._lib.opus_encode(
+                self._state,
+                _int16_address(pcm),
+                len(pcm) // self.channels,
+                out.ctypes.data,
+                len(out),
+            )
+        )
+
+    def encode(self, pcm: np.ndarray) -> memoryview:
+        """编码一帧到内部复用缓冲区.
+
+        Args:
+            pcm: 一帧 int16 样本（交错多声道）
+
+        Returns:
+            数据包视图，仅在下一次 encode 前有效（需保留时请 bytes() 拷贝）
+        """
+        size = _check(
+            self._lib.opus_encode(
+                self._state,
+                _int16_address(pcm),
+                len(pcm) // self.channels,
+                self._packet_address,
+                self.max_packet_bytes,
+            )
+        )
+        return self._packet_view[:size]
+
+    def encode_batch(
+        self, frames: np.ndarray, out: np.ndarray, lengths: np.ndarray
+    ) -> int:
+        """批量编码多帧.
+
+        Args:
+            frames: (帧数, 每帧样本数) 的 int16 C连续数组
+            out: (帧数, 每包最大字节数) 的 uint8 C连续数组
+            lengths: 输出各数据包字节数（整数数组，长度不小于帧数）
+
+        Returns:
+            编码的帧数
+        """
+        if frames.ndim != 2 or out.ndim != 2 or len(out) < len(frames):
+            raise ValueError("frames/out 需为二维数组且 out 行数不小于帧数")
+        if out.dtype != np.uint8 or not out.flags.c_contiguous:
+            raise ValueError("输出缓冲区需为C连续的 uint8 数组")
+
+        encode = self._lib.opus_encode
+        state = self._state
+        frame_size = frames.shape[1] // self.channels
+        pcm_address = _int16_address(frames)
+        pcm_stride = frames.strides[0]
+        out_address = out.ctypes.data
+        out_stride = out.strides[0]
+        max_bytes = out.shape[1]
+        for index in range(len(frames)):
+            lengths[index] = _check(
+                encode(
+                    state,
+                    pcm_address + index * pcm_stride,
+                    frame_size,
+                    out_address + index * out_stride,
+                    max_bytes,
+                )
+            )
+        return len(frames)
+
+    def close(self):
+        """
+        释放编码器.
+        """
+        if self._state:
+            self._lib.opus_encoder_destroy(self._state)
+            self._state = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class NativeOpusDecoder:
+    """
+    Opus 解码器（原生调用，直接写入 int16 数组）.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, max_frame_ms: int = 120):
+        """创建解码器.
+
+        Args:
+            sample_rate: 采样率（8000/12000/16000/24000/48000）
+            channels: 声道数
+            max_frame_ms: 单帧最大时长（毫秒），决定内部缓冲区大小
+        """
+        self._lib = _load_library()
+        error = ctypes.c_int(0)
+        self._state = self._lib.opus_decoder_create(
+            sample_rate, channels, ctypes.byref(error)
+        )
+        _check(error.value)
+        if not self._state:
+            raise OpusNativeError("创建Opus解码器失败")
+
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self._pcm = np.zeros(sample_rate * max_frame_ms // 1000 * channels, np.int16)
+        self._pcm_address = self._pcm.ctypes.data
+
+    def decode_into(
+        self,
+        packet: Optional[bytes],
+        out: np.ndarray,
+        frame_size: int,
+        decode_fec: bool = False,
+    ) -> int:
+        """解码一帧到调用方缓冲区.
+
+        Args:
+            packet: Opus 数据包，None 或空表示丢包隐藏（PLC）
+            out: int16 输出数组，容量不小于 frame_size × 声道数
+            frame_size: 每声道样本数（PLC/FEC 时决定恢复时长）
+            decode_fec: 是否解码数据包中的带内FEC（恢复上一帧）
+
+        Returns:
+            每声道解码的样本数
+        """
+        if len(out) < frame_size * self.channels:
+            raise ValueError("输出缓冲区容量不足")
+        return _check(
+            self._lib.opus_decode(
+                self._state,
+                packet or None,
+                len(packet) if packet else 0,
+                _int16_address(out),
+                frame_size,
+                int(decode_fec),
+            )
+        )
+
+    def decode(
+        self, packet: Optional[bytes], frame_size: int, decode_fec: bool = False
+    ) -> np.ndarray:
+        """解码一帧到内部复用缓冲区.
+
+        Args:
+            packet: Opus 数据包，None 或空表示丢包隐藏（PLC）
+            frame_size: 每声道样本数
+            decode_fec: 是否解码带内FEC
+
+        Returns:
+            int16 样本视图，仅在下一次 decode 前有效
+        """
+        if frame_size * self.channels > len(self._pcm):
+            raise ValueError("帧长超过解码缓冲区容量")
+        samples = _check(
+            self._lib.opus_decode(
+                self._state,
+                packet or None,
+                len(packet) if packet else 0,
+                self._pcm_address,
+                frame_size,
+                int(decode_fec),
+            )
+        )
+        return self._pcm[: samples * self.channels]
+
+    def decode_batch(
+        self, packets: Sequence[Optional[bytes]], out: np.ndarray, frame_size: int
+    ) -> int:
+        """批量解码多帧（连续写入输出数组）.
+
+        Args:
+            packets: 数据包序列，None 表示该帧丢失（PLC）
+            out: int16 C连续输出数组，容量不小于 帧数 × frame_size × 声道数
+            frame_size: 每帧每声道样本数
+
+        Returns:
+            写入的总样本数（含所有声道）
+        """
+        if len(out) < len(packets) * frame_size * self.channels:
+            raise ValueError("输出缓冲区容量不足")
+
+        decode = self._lib.opus_decode
+        state = self._state
+        address = _int16_address(out)
+        total = 0
+        for packet in packets:
+            samples = _check(
+                decode(
+                    state,
+                    packet or None,
+                    len(packet) if packet else 0,
+                    address + total * 2,  # int16 每样本2字节
+                    frame_size,
+                    0,
+                )
+            )
+            total += samples * self.channels
+        return total
+
+    def close(self):
+        """
+        释放解码器.
+        """
+        if self._state:
+            self._lib.opus_decoder_destroy(self._state)
+            self._state = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
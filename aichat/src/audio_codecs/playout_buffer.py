@@ -0,0 +1,237 @@
+import asyncio
+import threading
+from typing import Optional
+
+import numpy as np
+
+from src.audio_codecs.ring_buffer import AudioRingBuffer
+
+
+class OverflowPolicy:
+    """
+    播放缓冲区写满时的处理策略.
+    """
+
+    DROP_OLDEST = "drop_oldest"  # 丢弃最旧的样本，保证实时性（TTS）
+    BLOCK = "block"  # 阻塞生产者直到有空间（本地音乐）
+
+
+class PlayoutBuffer:
+    """
+    事件循环 → PortAudio 输出回调 之间的单生产者/单消费者播放缓冲区
+
+    线程模型：
+    - 生产者（事件循环或解码线程）：write / clear，多个生产者之间用锁互斥
+    - 消费者（输出回调线程）：read_into
+    - 双方只修改各自的位置与计数器，消费者不加锁，也不触碰任何 asyncio 对象
+
+    丢弃最旧数据和清空都通过“丢弃截止位置”实现：生产者只记录位置，
+    由消费者在下一次读取时跳过，避免跨线程修改读位置。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int,
+        capacity_ms: int,
+        policy: str = OverflowPolicy.DROP_OLDEST,
+        headroom_ms: int = 1000,
+    ):
+        """初始化播放缓冲区.
+
+        Args:
+            sample_rate: 样本采样率（单声道 int16）
+            capacity_ms: 逻辑容量（毫秒），超出时按策略处理
+            policy: 默认溢出策略，见 OverflowPolicy
+            headroom_ms: 物理余量（毫秒），用于承载尚未被消费者跳过的旧数据
+        """
+        self.sample_rate = sample_rate
+        self.capacity_ms = capacity_ms
+        self.policy = policy
+
+        self._capacity = max(1, int(sample_rate * capacity_ms / 1000))
+        headroom = max(1, int(sample_rate * headroom_ms / 1000))
+        self._ring = AudioRingBuffer(self._capacity + headroom, dtype=np.int16)
+
+        # 生产者写入：丢弃截止位置（绝对样本位置）
+        self._discard_until = 0
+        # 生产者之间互斥（消费者不使用）
+        self._producer_lock = threading.Lock()
+
+        # 生产者计数
+        self._written_samples = 0
+        self._dropped_samples = 0
+        self._peak_samples = 0
+
+        # 消费者计数
+        self._played_samples = 0
+        self._underruns = 0
+        self._was_playing = False
+
+    # ============= 生产者接口（事件循环/解码线程） =============
+
+    @property
+    def capacity(self) -> int:
+        """
+        逻辑容量（样本数）.
+        """
+        return self._capacity
+
+    @property
+    def dropped_samples(self) -> int:
+        """
+        累计丢弃的样本数.
+        """
+        return self._dropped_samples
+
+    @property
+    def buffered(self) -> int:
+        """
+        当前有效缓冲样本数（扣除待丢弃部分）.
+        """
+        write_pos = self._ring.write_position
+        start = max(self._ring.read_position, self._discard_until)
+        return max(0, write_pos - start)
+
+    def write_nowait(self, samples: np.ndarray) -> int:
+        """写入样本，写满时丢弃最旧数据.
+
+        Args:
+            samples: 单声道 int16 样本
+
+        Returns:
+            实际写入的样本数
+        """
+        count = len(samples)
+        if count == 0:
+            return 0
+
+        with self._producer_lock:
+            return self._write_locked(samples, count)
+
+    def _write_locked(self, samples: np.ndarray, count: int) -> int:
+        """
+        写入样本（调用方已持有生产者锁）.
+        """
+        # 只保留最新的 capacity 个样本
+        if count > self._capacity:
+            self._dropped_samples += count - self._capacity
+            samples = samples[-self._capacity :]
+            count = self._capacity
+
+        overflow = self.buffered + count - self._capacity
+        if overflow > 0:
+            self._discard_until = (
+                max(self._ring.read_position, self._discard_until) + overflow
+            )
+            self._dropped_samples += overflow
+
+        written = self._ring.write(samples)
+        if written < count:
+            # 消费者长时间未运行（输出流停止），物理空间耗尽
+            self._dropped_samples += count - written
+        self._written_samples += written
+        self._peak_samples = max(self._peak_samples, self.buffered)
+        return written
+
+    async def write(
+        self,
+        samples: np.ndarray,
+        policy: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """按溢出策略写入样本.
+
+        Args:
+            samples: 单声道 int16 样本
+            policy: 溢出策略，默认使用构造时的策略
+            timeout: BLOCK 策略下的最长等待时间（秒），None 表示一直等待
+
+        Returns:
+            实际写入的样本数
+
+        Raises:
+            asyncio.TimeoutError: BLOCK 策略等待超时
+        """
+        policy = policy or self.policy
+        if policy != OverflowPolicy.BLOCK:
+            return self.write_nowait(samples)
+
+        total = 0
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while total < len(samples):
+            with self._producer_lock:
+                space = min(self._capacity - self.buffered, self._ring.free)
+                if space > 0:
+                    chunk = samples[total : total + space]
+                    written = self._ring.write(chunk)
+                    self._written_samples += written
+                    total += written
+                    self._peak_samples = max(self._peak_samples, self.buffered)
+                    continue
+
+            if deadline is not None and loop.time() >= deadline:
+                raise asyncio.TimeoutError()
+            # 按需要腾出的时长休眠，最少5ms，避免空转
+            deficit = len(samples) - total
+            await asyncio.sleep(max(0.005, deficit / self.sample_rate / 2))
+        return total
+
+    def clear(self) -> int:
+        """清空缓冲区（生产者调用，由消费者下一次读取时生效）
+
+        Returns:
+            被丢弃的样本数
+        """
+        with self._producer_lock:
+            pending = self.buffered
+            self._discard_until = self._ring.write_position
+            return pending
+
+    def get_stats(self) -> dict:
+        """获取缓冲区填充统计.
+
+        Returns:
+            dict: 容量、当前/峰值填充、写入/播放/丢弃样本数、欠载次数
+        """
+        buffered = self.buffered
+        return {
+            "capacity_ms": self.capacity_ms,
+            "buffered_samples": buffered,
+            "buffered_ms": buffered * 1000 / self.sample_rate,
+            "fill_ratio": buffered / self._capacity,
+            "peak_ms": self._peak_samples * 1000 / self.sample_rate,
+            "written_samples": self._written_samples,
+            "played_samples": self._played_samples,
+            "dropped_samples": self._dropped_samples,
+            "underruns": self._underruns,
+            "policy": self.policy,
+        }
+
+    # ============= 消费者接口（输出回调线程） =============
+
+    def read_into(self, out: np.ndarray) -> int:
+        """读出样本到调用方提供的数组（不分配内存）
+
+        Args:
+            out: 目标 int16 数组
+
+        Returns:
+            实际读出的样本数，不足部分由调用方补静音
+        """
+        ring = self._ring
+        skip = self._discard_until - ring.read_position
+        if skip > 0:
+            ring.skip(skip)
+
+        count = ring.read_into(out)
+        self._played_samples += count
+
+        # 播放中途数据不足记为一次欠载，空闲时的静音不计
+        if count < len(out):
+            if self._was_playing:
+                self._underruns += 1
+            self._was_playing = False
+        else:
+            self._was_playing = True
+        return count
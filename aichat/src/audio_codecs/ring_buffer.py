@@ -0,0 +1,144 @@
+from typing import Optional, Union
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    预分配的数组环形缓冲区（单生产者/单消费者）
+
+    设计要点：
+    - 底层为固定容量的 NumPy 数组，运行期间不再分配内存
+    - 批量写入/批量读出，环绕通过两段切片完成，每次调用的 Python 开销为 O(1)
+    - 读写位置为单调递增计数器，写入方只修改写位置，读出方只修改读位置，
+      因此一个线程写、另一个线程读时无需加锁
+    - 写满时只写入能放下的部分（丢弃新数据），由调用方决定如何处理
+    """
+
+    def __init__(self, capacity: int, dtype: Union[np.dtype, str] = np.float32):
+        """初始化环形缓冲区.
+
+        Args:
+            capacity: 最大可容纳的样本数
+            dtype: 样本数据类型（如 np.float32 / np.int16）
+        """
+        if capacity <= 0:
+            raise ValueError(f"环形缓冲区容量必须大于0: {capacity}")
+
+        self._buffer = np.zeros(capacity, dtype=dtype)
+        self._capacity = capacity
+        self._read_pos = 0
+        self._write_pos = 0
+
+    @property
+    def capacity(self) -> int:
+        """
+        缓冲区容量（样本数）.
+        """
+        return self._capacity
+
+    @property
+    def dtype(self) -> np.dtype:
+        """
+        样本数据类型.
+        """
+        return self._buffer.dtype
+
+    @property
+    def read_position(self) -> int:
+        """
+        累计读出位置（单调递增的绝对样本位置）.
+        """
+        return self._read_pos
+
+    @property
+    def write_position(self) -> int:
+        """
+        累计写入位置（单调递增的绝对样本位置）.
+        """
+        return self._write_pos
+
+    @property
+    def available(self) -> int:
+        """
+        可读样本数.
+        """
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self) -> int:
+        """
+        可写样本数.
+        """
+        return self._capacity - (self._write_pos - self._read_pos)
+
+    def write(self, data: np.ndarray) -> int:
+        """批量写入样本（生产者调用）
+
+        Args:
+            data: 一维样本数组，类型不同时按缓冲区 dtype 转换
+
+        Returns:
+            实际写入的样本数（空间不足时小于 len(data)）
+        """
+        count = min(len(data), self.free)
+        if count <= 0:
+            return 0
+
+        start = self._write_pos % self._capacity
+        first = min(count, self._capacity - start)
+        self._buffer[start : start + first] = data[:first]
+        if count > first:
+            self._buffer[: count - first] = data[first:count]
+
+        # 先写数据再推进写位置，保证读出方看到的都是完整数据
+        self._write_pos += count
+        return count
+
+    def read_into(self, out: np.ndarray, count: Optional[int] = None) -> int:
+        """批量读出样本到调用方提供的数组（消费者调用）
+
+        Args:
+            out: 目标数组，从下标0开始写入
+            count: 期望读取的样本数，默认为 len(out)
+
+        Returns:
+            实际读出的样本数（数据不足时小于期望值，out 剩余部分保持不变）
+        """
+        if count is None:
+            count = len(out)
+        count = min(count, len(out), self.available)
+        if count <= 0:
+            return 0
+
+        start = self._read_pos % self._capacity
+        first = min(count, self._capacity - start)
+        out[:first] = self._buffer[start : start + first]
+        if count > first:
+            out[first:count] = self._buffer[: count - first]
+
+        self._read_pos += count
+        return count
+
+    def skip(self, count: int) -> int:
+        """丢弃最旧的样本（消费者调用）
+
+        Args:
+            count: 要丢弃的样本数
+
+        Returns:
+            实际丢弃的样本数
+        """
+        count = min(count, self.available)
+        if count <= 0:
+            return 0
+        self._read_pos += count
+        return count
+
+    def clear(self) -> int:
+        """清空缓冲区（消费者调用）
+
+        Returns:
+            被丢弃的样本数
+        """
+        return self.skip(self.available)
@@ -0,0 +1,164 @@
+import math
+from collections import deque
+from typing import List, Optional
+
+import numpy as np
+
+from src.audio_codecs.frame_broadcast import AudioFrame
+from src.utils.config_manager import ConfigManager
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class KwsGate:
+    """
+    唤醒词引擎前置能量门控（自适应噪声底）
+
+    - 每帧用一次向量点积计算电平，高于噪声底 threshold_db 即打开门控
+    - 关闭期间只保留最近 preroll_ms 的帧；打开时先补送预录帧，唤醒词起音不丢失
+    - 电平回落后保持 hangover_ms 继续送帧，让识别器看到词尾和端点静音
+    - 只有门控打开时才运行唤醒词模型，静音房间里引擎几乎不占 CPU
+
+    只在一个线程中调用 process；get_stats 可在任意线程读取。
+    """
+
+    def __init__(
+        self,
+        frame_duration_ms: int,
+        threshold_db: float = 8.0,
+        min_level_db: float = -55.0,
+        preroll_ms: int = 300,
+        hangover_ms: int = 1000,
+    ):
+        """初始化门控.
+
+        Args:
+            frame_duration_ms: 每帧时长（毫秒）
+            threshold_db: 高于噪声底多少分贝判为有声
+            min_level_db: 打开门控的最低电平（dBFS）
+            preroll_ms: 关闭期间保留、打开时补送的时长
+            hangover_ms: 电平回落后继续送帧的时长
+        """
+        self.threshold_db = threshold_db
+        self.min_level_db = min_level_db
+
+        def frames(ms: int) -> int:
+            return max(0, math.ceil(ms / frame_duration_ms))
+
+        self._hangover_frames = frames(hangover_ms)
+        self._preroll: deque = deque(maxlen=max(1, frames(preroll_ms)))
+
+        self._noise_floor_db = -60.0
+        self._level_db = -100.0
+        self._open = False
+        self._hangover_left = 0
+
+        # 统计
+        self._frames_total = 0
+        self._frames_passed = 0
+        self._openings = 0
+
+    def reset(self):
+        """
+        关闭门控并丢弃预录帧（暂停恢复后调用，噪声底保留）.
+        """
+        self._open = False
+        self._hangover_left = 0
+        self._preroll.clear()
+
+    def _measure(self, samples: np.ndarray) -> float:
+        """
+        计算帧电平（dBFS，输入为归一化 float32）.
+        """
+        energy = float(np.dot(samples, samples)) / max(1, len(samples))
+        return 10.0 * math.log10(energy + 1e-10)
+
+    def _is_active(self, level_db: float) -> bool:
+        """
+        判定是否有声并更新噪声底（下降快、上升慢）.
+        """
+        threshold = max(self._noise_floor_db + self.threshold_db, self.min_level_db)
+        active = level_db > threshold
+        if not active:
+            rate = 0.3 if level_db < self._noise_floor_db else 0.05
+        else:
+            rate = 0.002
+        self._noise_floor_db += rate * (level_db - self._noise_floor_db)
+        return active
+
+    def process(self, frame: AudioFrame) -> List[AudioFrame]:
+        """处理一帧.
+
+        Args:
+            frame: 共享只读采集帧（使用其缓存的 float32 视图）
+
+        Returns:
+            需要送入唤醒词引擎的帧（按顺序），门控关闭时为空
+        """
+        self._frames_total += 1
+        level_db = self._measure(frame.float32)
+        self._level_db = level_db
+        active = self._is_active(level_db)
+
+        if self._open:
+            if active:
+                self._hangover_left = self._hangover_frames
+            elif self._hangover_left > 0:
+                self._hangover_left -= 1
+            else:
+                self._open = False
+
+            if self._open:
+                self._frames_passed += 1
+                return [frame]
+
+        elif active:
+            # 打开门控：补送预录帧
+            self._open = True
+            self._openings += 1
+            self._hangover_left = self._hangover_frames
+            frames = list(self._preroll)
+            frames.append(frame)
+            self._preroll.clear()
+            self._frames_passed += len(frames)
+            return frames
+
+        self._preroll.append(frame)
+        return []
+
+    def get_stats(self) -> dict:
+        """获取门控统计.
+
+        Returns:
+            dict: 当前电平/噪声底、门控状态、打开次数及占空比（送入引擎的帧比例）
+        """
+        total = self._frames_total
+        return {
+            "open": self._open,
+            "level_db": round(self._level_db, 1),
+            "noise_floor_db": round(self._noise_floor_db, 1),
+            "frames_total": total,
+            "frames_passed": self._frames_passed,
+            "openings": self._openings,
+            "duty_cycle": self._frames_passed / total if total else 0.0,
+        }
+
+
+def create_kws_gate(frame_duration_ms: int) -> Optional[KwsGate]:
+    """
+    根据 KWS_GATE_OPTIONS 创建唤醒词前置门控，未启用时返回 None.
+    """
+    config = ConfigManager.get_instance()
+    if not config.get_config("KWS_GATE_OPTIONS.ENABLED", True):
+        return None
+
+    gate = KwsGate(
+        frame_duration_ms,
+        threshold_db=config.get_config("KWS_GATE_OPTIONS.THRESHOLD_DB", 8.0),
+        min_level_db=config.get_config("KWS_GATE_OPTIONS.MIN_LEVEL_DB", -55.0),
+        preroll_ms=config.get_config("KWS_GATE_OPTIONS.PREROLL_MS", 300),
+        hangover_ms=config.get_config("KWS_GATE_OPTIONS.HANGOVER_MS", 1000),
+    )
+    logger.info("已启用唤醒词前置能量门控")
+    return gate
@@ -0,0 +1,225 @@
+import math
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class VadEvent:
+    """
+    VAD 门控事件.
+    """
+
+    SPEECH_START = "speech_start"  # 检测到语音起点
+    ENDPOINT = "endpoint"  # 语音结束后静音达到端点时长
+
+
+class VadGate:
+    """
+    客户端语音活动门控（能量检测 + 自适应噪声底）
+
+    - 静音帧不上行，只保留最近的若干编码帧作为预录；语音起点时先补发预录帧，
+      避免丢失起音
+    - 语音结束后保留一段拖尾（hangover）继续发送
+    - 静音期间每隔 keepalive_ms 发送一帧，避免服务端长时间收不到数据
+    - 语音结束后静音达到 endpoint_ms 时产生一次端点事件，用于本地结束监听
+
+    process 在采集工作线程调用；reset 可在任意线程请求，由下一次 process 执行。
+    """
+
+    def __init__(
+        self,
+        frame_duration_ms: int,
+        threshold_db: float = 10.0,
+        min_level_db: float = -50.0,
+        min_speech_ms: int = 60,
+        hangover_ms: int = 300,
+        preroll_ms: int = 180,
+        endpoint_ms: int = 800,
+        keepalive_ms: int = 1000,
+    ):
+        """初始化VAD门控.
+
+        Args:
+            frame_duration_ms: 每帧时长（毫秒）
+            threshold_db: 高于噪声底多少分贝判为语音
+            min_level_db: 判为语音的最低电平（dBFS）
+            min_speech_ms: 连续语音达到该时长才确认语音起点
+            hangover_ms: 语音结束后继续发送的时长
+            preroll_ms: 静音期间保留、在语音起点补发的时长
+            endpoint_ms: 语音结束后判定端点的静音时长，0 表示关闭本地端点检测
+            keepalive_ms: 静音期间保活帧间隔，0 表示完全不发送静音帧
+        """
+        self.frame_duration_ms = frame_duration_ms
+        self.threshold_db = threshold_db
+        self.min_level_db = min_level_db
+
+        def frames(ms: int) -> int:
+            return max(0, math.ceil(ms / frame_duration_ms))
+
+        self._onset_frames = max(1, frames(min_speech_ms))
+        self._hangover_frames = frames(hangover_ms)
+        self._endpoint_frames = frames(endpoint_ms)
+        self._keepalive_frames = frames(keepalive_ms)
+        self._preroll: deque = deque(maxlen=max(1, frames(preroll_ms)))
+
+        self._reset_requested = False
+        self._reset_state()
+
+        # 统计
+        self._frames_total = 0
+        self._frames_sent = 0
+        self._frames_saved = 0
+        self._bytes_saved = 0
+        self._speech_segments = 0
+        self._endpoints = 0
+
+    def _reset_state(self):
+        """
+        重置检测状态（统计保留，未发送的预录帧计入节省）.
+        """
+        self._noise_floor_db = -60.0
+        self._level_db = -100.0
+        self._in_speech = False
+        self._speech_run = 0
+        self._hangover_left = 0
+        self._silence_run = 0
+        self._since_keepalive = 0
+        self._had_speech = False
+        self._count_preroll_saved()
+
+    def _count_preroll_saved(self):
+        """
+        丢弃预录帧并计入节省统计.
+        """
+        for packet in self._preroll:
+            self._frames_saved += 1
+            self._bytes_saved += len(packet)
+        self._preroll.clear()
+
+    def request_reset(self):
+        """
+        请求重置门控状态（下一帧生效，可跨线程调用）.
+        """
+        self._reset_requested = True
+
+    def _measure(self, pcm: np.ndarray) -> float:
+        """
+        计算帧电平（dBFS）.
+        """
+        samples = pcm.astype(np.float32)
+        energy = float(np.dot(samples, samples)) / max(1, len(samples))
+        return 10.0 * math.log10(energy / (32768.0 * 32768.0) + 1e-10)
+
+    def _is_speech(self, level_db: float) -> bool:
+        """
+        判定是否为语音并更新噪声底（下降快、上升慢）.
+        """
+        threshold = max(self._noise_floor_db + self.threshold_db, self.min_level_db)
+        speech = level_db > threshold
+        if not speech:
+            rate = 0.3 if level_db < self._noise_floor_db else 0.05
+        else:
+            # 语音期间极缓慢上调，防止环境噪声突然升高后一直判为语音
+            rate = 0.002
+        self._noise_floor_db += rate * (level_db - self._noise_floor_db)
+        return speech
+
+    def process(
+        self, pcm: np.ndarray, packet: bytes
+    ) -> Tuple[List[bytes], Optional[str]]:
+        """处理一帧.
+
+        Args:
+            pcm: 该帧的 int16 样本（用于检测）
+            packet: 该帧的编码数据
+
+        Returns:
+            (需要发送的编码帧列表（按顺序）, 事件或 None)
+        """
+        if self._reset_requested:
+            self._reset_requested = False
+            self._reset_state()
+
+        self._frames_total += 1
+        level_db = self._measure(pcm)
+        self._level_db = level_db
+        speech = self._is_speech(level_db)
+
+        if speech:
+            self._speech_run += 1
+            self._silence_run = 0
+        else:
+            self._speech_run = 0
+            self._silence_run += 1
+
+        if self._in_speech:
+            if speech:
+                self._hangover_left = self._hangover_frames
+            elif self._hangover_left > 0:
+                self._hangover_left -= 1
+            else:
+                self._in_speech = False
+
+            if self._in_speech:
+                self._frames_sent += 1
+                return [packet], None
+
+        elif self._speech_run >= self._onset_frames:
+            # 语音起点：补发预录帧（含已判为语音但尚未确认的帧）
+            self._in_speech = True
+            self._had_speech = True
+            self._speech_segments += 1
+            self._hangover_left = self._hangover_frames
+            packets = list(self._preroll)
+            packets.append(packet)
+            self._preroll.clear()
+            self._frames_sent += len(packets)
+            self._since_keepalive = 0
+            return packets, VadEvent.SPEECH_START
+
+        # 静音：放入预录，按保活间隔发送一帧
+        event = None
+        if (
+            self._had_speech
+            and self._endpoint_frames
+            and self._silence_run >= self._endpoint_frames
+        ):
+            self._had_speech = False
+            self._endpoints += 1
+            event = VadEvent.ENDPOINT
+
+        self._since_keepalive += 1
+        if self._keepalive_frames and self._since_keepalive >= self._keepalive_frames:
+            # 保活帧之前的预录帧不再补发，保证上行帧顺序
+            self._since_keepalive = 0
+            self._count_preroll_saved()
+            self._frames_sent += 1
+            return [packet], event
+
+        if len(self._preroll) == self._preroll.maxlen:
+            evicted = self._preroll[0]
+            self._frames_saved += 1
+            self._bytes_saved += len(evicted)
+        self._preroll.append(packet)
+        return [], event
+
+    def get_stats(self) -> dict:
+        """获取门控统计.
+
+        Returns:
+            dict: 当前电平/噪声底、语音状态及节省的帧数和字节数
+        """
+        total = max(1, self._frames_total)
+        return {
+            "in_speech": self._in_speech,
+            "level_db": round(self._level_db, 1),
+            "noise_floor_db": round(self._noise_floor_db, 1),
+            "frames_total": self._frames_total,
+            "frames_sent": self._frames_sent,
+            "frames_saved": self._frames_saved,
+            "bytes_saved": self._bytes_saved,
+            "saved_ratio": self._frames_saved / total,
+            "speech_segments": self._speech_segments,
+            "endpoints": self._endpoints,
+        }
@@ -3,14 +3,12 @@ Wake Word Detector sử dụng Vosk STT để phát hiện "Bạn ơi"
 """
 import asyncio
 import json
-import queue
 import threading
 import time
 from pathlib import Path
-from typing import Callable, Optional
-
-import numpy as np
+from typing import Callable, List, Optional, Tuple
 
+from src.audio_processing.kws_gate import create_kws_gate
 from src.constants.constants import AudioConfig
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
@@ -26,24 +24,189 @@ except ImportError:
     logger.warning("Vosk chưa được cài đặt. Chạy: pip install vosk")
 
 
+# Token rác của Vosk: mọi âm thanh ngoài wake phrase trong chế độ grammar
+GARBAGE_TOKEN = "[unk]"
+
+
+class VoskPhraseDecoder:
+    """
+    Bộ giải mã wake phrase trên một KaldiRecognizer (không thread-safe).
+
+    - open: từ vựng mở, chỉ xét kết quả cuối (sau khi recognizer phát hiện
+      điểm kết thúc câu, trễ 0.5-1.5s)
+    - grammar: grammar chỉ gồm các wake phrase và token rác, xét cả partial
+      hypothesis; partial phải giữ nguyên qua `partial_stable` chunk liên tiếp
+      và độ tin cậy của các từ trong phrase phải đạt `min_confidence`
+    """
+
+    MODES = ("open", "grammar")
+
+    def __init__(
+        self,
+        model,
+        wake_phrases: List[str],
+        mode: str = "grammar",
+        min_confidence: float = 0.6,
+        partial_stable: int = 2,
+        sample_rate: int = AudioConfig.INPUT_SAMPLE_RATE,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Chế độ Vosk không hợp lệ: {mode}")
+
+        self.mode = mode
+        self.wake_phrases = [p.lower().strip() for p in wake_phrases if p.strip()]
+        self.min_confidence = min_confidence
+        self.partial_stable = max(1, int(partial_stable))
+
+        if mode == "grammar":
+            grammar = json.dumps(
+                self.wake_phrases + [GARBAGE_TOKEN], ensure_ascii=False
+            )
+            self.recognizer = KaldiRecognizer(model, sample_rate, grammar)
+            if hasattr(self.recognizer, "SetPartialWords"):
+                # Cần vosk >= 0.3.45 để partial có độ tin cậy từng từ
+                self.recognizer.SetPartialWords(True)
+        else:
+            self.recognizer = KaldiRecognizer(model, sample_rate)
+        self.recognizer.SetWords(True)
+
+        self._last_partial = ""
+        self._partial_hits = 0
+        # Tổng số giây audio đã đưa vào recognizer; Reset() không xóa vì Vosk giữ
+        # thời điểm start/end của từ tính liên tục từ đầu luồng
+        self._stream_s = 0.0
+        self._sample_rate = sample_rate
+        self.rejected = 0
+
+    def accept(self, pcm: bytes) -> Optional[Tuple[str, str, str, float]]:
+        """Đưa PCM int16 vào recognizer.
+
+        Returns:
+            (phrase, text, nguồn "final"/"partial", số giây audio đã đưa vào sau
+            khi wake phrase kết thúc) khi phát hiện, ngược lại None
+        """
+        self._stream_s += len(pcm) / 2 / self._sample_rate
+        recognizer = self.recognizer
+        if recognizer.AcceptWaveform(pcm):
+            self._last_partial = ""
+            self._partial_hits = 0
+            result = json.loads(recognizer.Result())
+            text = result.get("text", "").lower().strip()
+            if not text or text == GARBAGE_TOKEN:
+                return None
+            logger.info(f"[VOSK] Nhận diện: '{text}'")
+            return self._check(text, result.get("result", []), "final")
+
+        if self.mode != "grammar":
+            # Không check partial result ở chế độ open để tránh trigger sai
+            return None
+
+        partial = json.loads(recognizer.PartialResult())
+        text = partial.get("partial", "").lower().strip()
+        if text == self._last_partial:
+            self._partial_hits += 1
+        else:
+            self._last_partial = text
+            self._partial_hits = 1
+        if not text or self._partial_hits < self.partial_stable:
+            return None
+        return self._check(text, partial.get("partial_result", []), "partial")
+
+    def reset(self):
+        """
+        Xóa trạng thái câu đang giải mã (giữ mốc thời gian của luồng).
+        """
+        self.recognizer.Reset()
+        self._last_partial = ""
+        self._partial_hits = 0
+
+    def _check(self, text: str, words: list, source: str):
+        phrase = self.find_phrase(text)
+        if phrase is None:
+            return None
+        matched = self.phrase_words(words, phrase)
+        if self.mode == "grammar":
+            confidence = min((float(w.get("conf", 1.0)) for w in matched), default=1.0)
+            if confidence < self.min_confidence:
+                self.rejected += 1
+                logger.debug(
+                    f"[VOSK] Bỏ qua '{phrase}' ({source}), độ tin cậy {confidence:.2f}"
+                )
+                return None
+        # Thời điểm kết thúc từ cuối (giây, tính từ đầu luồng) -> phần audio sau nó;
+        # không có thông tin từng từ thì coi như phrase kết thúc ở chunk hiện tại
+        end = matched[-1].get("end") if matched else None
+        tail_s = max(0.0, self._stream_s - float(end)) if end is not None else 0.0
+        return phrase, text, source, tail_s
+
+    def find_phrase(self, text: str) -> Optional[str]:
+        """
+        Tìm wake phrase xuất hiện như một chuỗi từ hoàn chỉnh trong text.
+        """
+        padded = f" {' '.join(text.split())} "
+        for phrase in self.wake_phrases:
+            if f" {phrase} " in padded:
+                return phrase
+        return None
+
+    @staticmethod
+    def phrase_words(words: list, phrase: str) -> list:
+        """Các mục từ (word/conf/start/end) ứng với lần xuất hiện cuối của phrase.
+
+        Không có thông tin từng từ (vosk cũ, partial không hỗ trợ) thì trả về [],
+        khi đó độ tin cậy coi là 1.0.
+        """
+        phrase_words = phrase.split()
+        n = len(phrase_words)
+        tokens = [w.get("word", "").lower() for w in words]
+        for i in range(len(tokens) - n, -1, -1):
+            if tokens[i : i + n] == phrase_words:
+                return words[i : i + n]
+        return []
+
+
 class VoskWakeWordDetector:
     """
     Phát hiện wake word "Bạn ơi" sử dụng Vosk STT cục bộ.
     """
 
+    # Ghi log CPU/giây audio sau mỗi khoảng audio này (giây)
+    STATS_LOG_INTERVAL = 300.0
+
     def __init__(self):
         self.audio_codec = None
         self.is_running_flag = False
         self.paused = False
-        self.detection_task = None
         self._main_loop = None  # Lưu main event loop
 
-        # Audio queue - dùng threading.Queue vì on_audio_data được gọi từ thread khác
-        self._audio_queue = queue.Queue(maxsize=100)
+        # Worker thread chạy recognizer; event được set khi không tạm dừng
+        self._worker: Optional[threading.Thread] = None
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+
+        # Thống kê CPU (chỉ worker thread ghi)
+        self._stats = {
+            "chunks": 0,
+            "audio_s": 0.0,
+            "fed_audio_s": 0.0,
+            "cpu_s": 0.0,
+            "thread_cpu_s": 0.0,
+            "max_chunk_ms": 0.0,
+            "detections": 0,
+            "partial_detections": 0,
+        }
+        self._next_report_s = self.STATS_LOG_INTERVAL
+
+        # Đăng ký nhận frame (frame chỉ đọc dùng chung, con trỏ đọc riêng)
+        self._subscription = None
+        # Cổng năng lượng: chỉ chạy recognizer khi có âm thanh
+        self._gate = None
 
         # Chống trigger liên tục
         self.last_detection_time = 0
         self.detection_cooldown = 2.0  # 2 giây cooldown
+        # Thời điểm thu (time.monotonic) kết thúc wake phrase lần phát hiện gần nhất
+        self.last_wake_end: Optional[float] = None
 
         # Callbacks
         self.on_detected_callback: Optional[Callable] = None
@@ -52,6 +215,7 @@ class VoskWakeWordDetector:
         # Vosk components
         self.model = None
         self.recognizer = None
+        self.decoder: Optional[VoskPhraseDecoder] = None
 
         # Config
         config = ConfigManager.get_instance()
@@ -66,11 +230,24 @@ class VoskWakeWordDetector:
             self.enabled = False
             return
 
-        # Wake phrase để phát hiện
-        self.wake_phrases = ["hello"]
-        
+        # Wake phrase để phát hiện và chế độ giải mã
+        self.wake_phrases = config.get_config(
+            "WAKE_WORD_OPTIONS.VOSK_WAKE_PHRASES", ["hello"]
+        )
+        self.mode = config.get_config("WAKE_WORD_OPTIONS.VOSK_MODE", "grammar")
+        if self.mode not in VoskPhraseDecoder.MODES:
+            logger.warning(f"VOSK_MODE không hợp lệ: {self.mode}, dùng 'grammar'")
+            self.mode = "grammar"
+        self.min_confidence = config.get_config(
+            "WAKE_WORD_OPTIONS.VOSK_MIN_CONFIDENCE", 0.6
+        )
+        self.partial_stable = config.get_config(
+            "WAKE_WORD_OPTIONS.VOSK_PARTIAL_STABLE", 2
+        )
+
         # Khởi tạo Vosk model
         self._init_vosk_model(config)
+        self._gate = create_kws_gate(AudioConfig.FRAME_DURATION)
 
     def _init_vosk_model(self, config):
         """Khởi tạo Vosk model"""
@@ -100,10 +277,19 @@ class VoskWakeWordDetector:
 
             logger.info(f"Đang tải Vosk model từ: {model_dir}")
             self.model = Model(str(model_dir))
-            self.recognizer = KaldiRecognizer(self.model, AudioConfig.INPUT_SAMPLE_RATE)
-            self.recognizer.SetWords(True)
-            
-            logger.info("Vosk Wake Word Detector khởi tạo thành công!")
+            self.decoder = VoskPhraseDecoder(
+                self.model,
+                self.wake_phrases,
+                mode=self.mode,
+                min_confidence=self.min_confidence,
+                partial_stable=self.partial_stable,
+            )
+            self.recognizer = self.decoder.recognizer
+
+            logger.info(
+                f"Vosk Wake Word Detector khởi tạo thành công! "
+                f"(mode={self.mode}, phrases={self.decoder.wake_phrases})"
+            )
             
         except Exception as e:
             logger.error(f"Lỗi khởi tạo Vosk: {e}", exc_info=True)
@@ -113,37 +299,18 @@ class VoskWakeWordDetector:
         """Đăng ký callback khi phát hiện wake word"""
         self.on_detected_callback = callback
 
-    def on_audio_data(self, audio_data: np.ndarray):
-        """Nhận audio data từ AudioCodec (observer pattern)
-        
-        Lưu ý: Method này được gọi từ audio thread (không có event loop),
-        nên phải dùng threading.Queue thay vì asyncio.Queue
-        """
-        if not self.enabled or not self.is_running_flag or self.paused:
-            return
-
-        try:
-            # Dùng threading.Queue vì được gọi từ thread khác
-            self._audio_queue.put_nowait(audio_data.copy())
-        except queue.Full:
-            try:
-                self._audio_queue.get_nowait()
-                self._audio_queue.put_nowait(audio_data.copy())
-            except queue.Empty:
-                pass
-
     async def start(self, audio_codec) -> bool:
         """Bắt đầu wake word detection"""
         if not self.enabled:
             logger.warning("Wake word không được bật")
             return False
 
-        if not self.model or not self.recognizer:
+        if not self.model or not self.decoder:
             logger.error("Vosk model chưa được khởi tạo")
             return False
 
         try:
-            # Lưu main event loop để đảm bảo detection loop chạy trong đúng loop
+            # Lưu main event loop để chuyển kết quả từ worker thread về loop
             try:
                 self._main_loop = asyncio.get_running_loop()
                 logger.info(f"[VOSK] Event loop: {type(self._main_loop).__name__}")
@@ -154,144 +321,175 @@ class VoskWakeWordDetector:
             self.audio_codec = audio_codec
             self.is_running_flag = True
             self.paused = False
-
-            # Đăng ký nhận audio
-            self.audio_codec.add_audio_listener(self)
-
-            # Bắt đầu detection loop trong main event loop
-            self.detection_task = asyncio.create_task(self._detection_loop())
-
-            logger.info("Vosk Wake Word Detector đã bắt đầu!")
+            self._resume_event.set()
+
+            # Đăng ký nhận audio frame
+            self._subscription = self.audio_codec.subscribe_frames("vosk_kws")
+
+            # Recognizer chạy trên thread riêng, đọc frame kiểu blocking;
+            # AcceptWaveform nặng CPU không còn chặn event loop
+            self._worker = threading.Thread(
+                target=self._worker_loop,
+                args=(self._subscription,),
+                name="vosk-kws",
+                daemon=True,
+            )
+            self._worker.start()
+
+            logger.info("Vosk Wake Word Detector đã bắt đầu (worker thread)!")
             return True
-            
+
         except Exception as e:
             logger.error(f"Lỗi khởi động Vosk detector: {e}", exc_info=True)
             self.enabled = False
             return False
 
-    async def _detection_loop(self):
-        """Vòng lặp phát hiện wake word
-        
-        Chạy trong main event loop để có thể dùng asyncio
+    def _worker_loop(self, subscription):
+        """Vòng lặp nhận diện trên worker thread.
+
+        Không có frame mới thì ngủ trên subscription.wait (không polling);
+        khi tạm dừng thì chờ resume event, không đọc frame và không tốn CPU.
         """
-        audio_buffer = b""
-        
-        # Đảm bảo đang chạy trong event loop
-        try:
-            loop = asyncio.get_running_loop()
-            logger.debug(f"[VOSK] Detection loop chạy trong event loop: {type(loop).__name__}")
-        except RuntimeError as e:
-            logger.error(f"[VOSK] Detection loop không có event loop: {e}")
-            return
-        
         while self.is_running_flag:
             try:
                 if self.paused:
-                    await asyncio.sleep(0.1)
-                    continue
-
-                # Lấy audio từ queue (threading.Queue)
-                try:
-                    audio_data = self._audio_queue.get_nowait()
-                except queue.Empty:
-                    await asyncio.sleep(0.01)
+                    self._resume_event.wait()
+                    if not self.is_running_flag:
+                        break
+                    # Bỏ qua frame cũ tích lũy và trạng thái câu nói dở trước khi dừng
+                    subscription.seek_latest()
+                    self.decoder.reset()
+                    if self._gate:
+                        self._gate.reset()
                     continue
 
-                if audio_data is None or len(audio_data) == 0:
+                frame = subscription.wait(timeout=0.5)
+                if frame is None or len(frame) == 0:
                     continue
 
-                # Chuyển đổi sang bytes
-                if audio_data.dtype == np.float32:
-                    audio_bytes = (audio_data * 32767).astype(np.int16).tobytes()
-                elif audio_data.dtype == np.int16:
-                    audio_bytes = audio_data.tobytes()
-                else:
-                    audio_bytes = audio_data.astype(np.int16).tobytes()
-
-                # Đưa vào recognizer
-                if self.recognizer.AcceptWaveform(audio_bytes):
-                    result = json.loads(self.recognizer.Result())
-                    text = result.get("text", "").lower().strip()
-                    
-                    if text:
-                        logger.info(f"[VOSK] Nhận diện: '{text}'")
-                        await self._check_wake_word(text)
-                # Không check partial result để tránh trigger sai
-
-            except asyncio.CancelledError:
-                logger.info("[VOSK] Detection loop bị cancel")
-                break
-            except RuntimeError as e:
-                if "no running event loop" in str(e):
-                    logger.error(f"[VOSK] Lỗi: không có event loop trong detection loop: {e}")
-                    # Thử lấy lại event loop từ main_loop
-                    if self._main_loop and not self._main_loop.is_closed():
-                        logger.info("[VOSK] Thử tiếp tục với main_loop...")
-                        await asyncio.sleep(0.1)
-                    else:
-                        logger.error("[VOSK] Main loop không có hoặc đã đóng, dừng detection")
+                self._stats["audio_s"] += len(frame) / AudioConfig.INPUT_SAMPLE_RATE
+                self._report_stats()
+                frames = self._gate.process(frame) if self._gate else (frame,)
+                for gated in frames:
+                    hit = self._accept_frame(gated)
+                    if hit and not self.paused and self._accept_detection(*hit[:3]):
+                        # Thời điểm thu của cuối wake phrase (cho pre-roll sau wake)
+                        self.last_wake_end = gated.timestamp - hit[3]
+                        self._post_detection(hit[0], hit[1])
                         break
-                else:
-                    logger.error(f"[VOSK] RuntimeError trong detection loop: {e}")
-                    await asyncio.sleep(0.1)
+
             except Exception as e:
-                logger.error(f"[VOSK] Lỗi trong detection loop: {e}", exc_info=True)
-                await asyncio.sleep(0.1)
+                logger.error(f"[VOSK] Lỗi trong worker thread: {e}", exc_info=True)
+                time.sleep(0.1)
+
+        logger.debug("[VOSK] Worker thread đã kết thúc")
 
-    async def _check_wake_word(self, text: str):
-        """Kiểm tra xem text có chứa wake word không"""
+    def _accept_frame(self, frame) -> Optional[Tuple[str, str, str, float]]:
+        """Đưa một frame vào decoder và đo CPU time của thread.
+
+        Returns:
+            Kết quả VoskPhraseDecoder.accept khi phát hiện wake phrase
+        """
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+
+        # Dùng bytes đã cache trong frame (chỉ chuyển đổi một lần)
+        hit = self.decoder.accept(frame.pcm_bytes)
+
+        cpu_now = time.thread_time()
+        stats = self._stats
+        stats["chunks"] += 1
+        stats["fed_audio_s"] += len(frame) / AudioConfig.INPUT_SAMPLE_RATE
+        stats["cpu_s"] += cpu_now - cpu_start
+        stats["thread_cpu_s"] = cpu_now
+        stats["max_chunk_ms"] = max(
+            stats["max_chunk_ms"], (time.perf_counter() - wall_start) * 1000
+        )
+        return hit
+
+    def _report_stats(self):
+        """
+        Định kỳ ghi log CPU/giây audio và tỷ lệ audio qua cổng năng lượng.
+        """
+        stats = self._stats
+        if stats["audio_s"] < self._next_report_s:
+            return
+        self._next_report_s = stats["audio_s"] + self.STATS_LOG_INTERVAL
+        logger.info(
+            f"[VOSK] CPU/giây audio: {stats['cpu_s'] / stats['audio_s']:.3f}s "
+            f"({stats['audio_s']:.0f}s audio, qua cổng "
+            f"{stats['fed_audio_s'] / stats['audio_s']:.0%}, chunk tối đa "
+            f"{stats['max_chunk_ms']:.1f}ms)"
+        )
+
+    def _accept_detection(self, phrase: str, text: str, source: str) -> bool:
+        """Áp dụng cooldown cho một lần phát hiện (worker thread).
+
+        Returns:
+            True nếu cần báo về main loop
+        """
         # Chống trigger liên tục
         current_time = time.time()
         if current_time - self.last_detection_time < self.detection_cooldown:
+            return False
+
+        logger.info(f"[WAKE] Phát hiện '{phrase}' ({source}) trong: '{text}'")
+        self.last_detection_time = current_time
+        if source == "partial":
+            self._stats["partial_detections"] += 1
+
+        # Reset recognizer để tránh lặp lại (cùng thread với AcceptWaveform)
+        self.decoder.reset()
+        return True
+
+    def _post_detection(self, phrase: str, text: str):
+        """
+        Chuyển sự kiện phát hiện từ worker thread về main event loop.
+        """
+        self._stats["detections"] += 1
+        loop = self._main_loop
+        if loop is None or loop.is_closed():
             return
+        asyncio.run_coroutine_threadsafe(self._notify_detected(phrase, text), loop)
 
-        # Tách các từ trong text
-        words = text.split()
-        
-        # Kiểm tra wake phrases - phải là từ riêng biệt, không phải substring
-        for phrase in self.wake_phrases:
-            # Kiểm tra phrase là từ riêng biệt trong text
-            if phrase in words or text.strip() == phrase:
-                logger.info(f"[WAKE] Phát hiện '{phrase}' trong: '{text}'")
-                self.last_detection_time = current_time
-                
-                # Reset recognizer để tránh lặp lại
-                self.recognizer.Reset()
-                
-                # Gọi callback
-                if self.on_detected_callback:
-                    try:
-                        if asyncio.iscoroutinefunction(self.on_detected_callback):
-                            await self.on_detected_callback(phrase, text)
-                        else:
-                            self.on_detected_callback(phrase, text)
-                    except Exception as e:
-                        logger.error(f"Lỗi callback wake word: {e}")
-                break
+    async def _notify_detected(self, phrase: str, text: str):
+        """
+        Gọi callback phát hiện wake word (main event loop).
+        """
+        if not self.is_running_flag or not self.on_detected_callback:
+            return
+        try:
+            if asyncio.iscoroutinefunction(self.on_detected_callback):
+                await self.on_detected_callback(phrase, text)
+            else:
+                self.on_detected_callback(phrase, text)
+        except Exception as e:
+            logger.error(f"Lỗi callback wake word: {e}")
 
     async def stop(self):
         """Dừng detector"""
         self.is_running_flag = False
+        self._resume_event.set()
 
-        if self.audio_codec:
-            self.audio_codec.remove_audio_listener(self)
+        subscription = self._subscription
+        if subscription:
+            subscription.interrupt()
 
-        if self.detection_task:
-            self.detection_task.cancel()
-            try:
-                await self.detection_task
-            except asyncio.CancelledError:
-                pass
+        # Đợi worker thoát trước khi giải phóng recognizer (không chặn event loop)
+        worker = self._worker
+        if worker and worker.is_alive():
+            await asyncio.to_thread(worker.join, 2.0)
+            if worker.is_alive():
+                logger.warning("[VOSK] Worker thread chưa thoát sau 2 giây")
+        self._worker = None
 
-        # Clear queue
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except queue.Empty:
-                break
+        if self.audio_codec and subscription:
+            self.audio_codec.unsubscribe_frames(subscription)
+        self._subscription = None
 
         # Cleanup Vosk model để tránh nanobind leak
         try:
+            self.decoder = None
             if self.recognizer:
                 self.recognizer = None
             if self.model:
@@ -303,10 +501,35 @@ class VoskWakeWordDetector:
         logger.info("Vosk Wake Word Detector đã dừng")
 
     def pause(self):
-        """Tạm dừng detection"""
+        """Tạm dừng detection (worker thread dừng hẳn, không tốn CPU)"""
         self.paused = True
+        self._resume_event.clear()
+        if self._subscription:
+            self._subscription.interrupt()
 
     def resume(self):
         """Tiếp tục detection"""
         self.paused = False
+        self._resume_event.set()
 
+    def get_stats(self) -> dict:
+        """Lấy thống kê CPU của recognizer.
+
+        Returns:
+            dict: số chunk, giây audio đã nhận / đã qua cổng vào recognizer,
+            CPU time trong recognizer, CPU time trên mỗi giây audio đã nhận,
+            chunk chậm nhất (ms), số lần phát hiện và thống kê cổng năng lượng
+        """
+        stats = dict(self._stats)
+        audio_s = stats["audio_s"]
+        stats["cpu_per_audio_s"] = stats["cpu_s"] / audio_s if audio_s else 0.0
+        stats["engine"] = "vosk"
+        stats["mode"] = self.mode
+        stats["rejected_low_confidence"] = self.decoder.rejected if self.decoder else 0
+        stats["paused"] = self.paused
+        stats["running"] = bool(self._worker and self._worker.is_alive())
+        if self._subscription:
+            stats["lag_frames"] = self._subscription.lag
+        if self._gate:
+            stats["gate"] = self._gate.get_stats()
+        return stats
@@ -3,9 +3,9 @@ import time
 from pathlib import Path
 from typing import Callable, Optional
 
-import numpy as np
 import sherpa_onnx
 
+from src.audio_processing.kws_gate import create_kws_gate
 from src.constants.constants import AudioConfig
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
@@ -23,8 +23,13 @@ class WakeWordDetector:
         self.paused = False
         self.detection_task = None
 
-        # 音频数据队列（用于异步处理）
-        self._audio_queue = asyncio.Queue(maxsize=100)
+        # 采集帧订阅（共享只读帧，独立游标）
+        self._subscription = None
+        # 前置能量门控：只有检测到声音时才运行模型
+        self._gate = None
+
+        # 最近一次唤醒词结束的采集时刻（time.monotonic），供唤醒预录截取
+        self.last_wake_end: Optional[float] = None
 
         # 防重复触发机制
         self.last_detection_time = 0
@@ -53,6 +58,7 @@ class WakeWordDetector:
         self._load_config(config)
         self._init_kws_model()
         self._validate_config()
+        self._gate = create_kws_gate(AudioConfig.FRAME_DURATION)
 
     def _load_config(self, config):
         """
@@ -145,23 +151,6 @@ class WakeWordDetector:
         """
         self.on_detected_callback = callback
 
-    def on_audio_data(self, audio_data: np.ndarray):
-        if not self.enabled or not self.is_running_flag or self.paused:
-            return
-
-        try:
-            # 将音频数据放入队列，由检测循环异步处理
-            self._audio_queue.put_nowait(audio_data.copy())
-        except asyncio.QueueFull:
-            # 队列满时丢弃最旧数据
-            try:
-                self._audio_queue.get_nowait()
-                self._audio_queue.put_nowait(audio_data.copy())
-            except asyncio.QueueEmpty:
-                self._audio_queue.put_nowait(audio_data.copy())
-        except Exception as e:
-            logger.debug(f"音频数据入队失败: {e}")
-
     async def start(self, audio_codec) -> bool:
         if not self.enabled:
             logger.warning("唤醒词功能未启用")
@@ -179,13 +168,13 @@ class WakeWordDetector:
             # 创建检测流
             self.stream = self.keyword_spotter.create_stream()
 
-            # 注册为音频监听器（观察者模式）
-            self.audio_codec.add_audio_listener(self)
+            # 订阅采集帧（共享只读帧，按自身节奏读取）
+            self._subscription = self.audio_codec.subscribe_frames("sherpa_kws")
 
             # 启动检测任务
             self.detection_task = asyncio.create_task(self._detection_loop())
 
-            logger.info("Sherpa-ONNX KeywordSpotter检测器启动成功（观察者模式）")
+            logger.info("Sherpa-ONNX KeywordSpotter检测器启动成功（帧订阅模式）")
             return True
         except Exception as e:
             logger.error(f"启动KeywordSpotter检测器失败: {e}")
@@ -202,6 +191,10 @@ class WakeWordDetector:
         while self.is_running_flag:
             try:
                 if self.paused:
+                    # 暂停期间不处理积压的旧帧
+                    self._subscription.seek_latest()
+                    if self._gate:
+                        self._gate.reset()
                     await asyncio.sleep(0.1)
                     continue
 
@@ -238,35 +231,36 @@ class WakeWordDetector:
         处理音频数据.
         """
         try:
-            if not self.stream:
+            if not self.stream or not self._subscription:
                 return
 
-            try:
-                audio_data = self._audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
+            frame = self._subscription.read()
+            if frame is None or len(frame) == 0:
                 return
 
-            if audio_data is None or len(audio_data) == 0:
+            # 门控关闭（静音）时不运行模型；打开时连同预录帧一起送入
+            frames = self._gate.process(frame) if self._gate else (frame,)
+            if not frames:
                 return
 
-            # 转换音频格式为 float32
-            if audio_data.dtype == np.int16:
-                samples = audio_data.astype(np.float32) / 32768.0
-            else:
-                samples = audio_data.astype(np.float32)
+            for gated in frames:
+                # 使用帧缓存的 float32 视图（多个订阅者共享，只转换一次）
+                self.stream.accept_waveform(
+                    sample_rate=self.sample_rate, waveform=gated.float32
+                )
 
-            # 提供音频数据给KeywordSpotter
-            self.stream.accept_waveform(sample_rate=self.sample_rate, waveform=samples)
-
-            # 检查是否准备好解码
-            if self.keyword_spotter.is_ready(self.stream):
+            # 检查是否准备好解码（补送预录帧后可能有多段待解码）
+            while self.keyword_spotter.is_ready(self.stream):
                 self.keyword_spotter.decode_stream(self.stream)
                 result = self.keyword_spotter.get_result(self.stream)
 
                 if result:
+                    # 关键词在触发帧内结束（num_trailing_blanks 很小）
+                    self.last_wake_end = frames[-1].timestamp
                     await self._handle_detection_result(result)
                     # 重置流状态
                     self.keyword_spotter.reset_stream(self.stream)
+                    break
 
         except Exception as e:
             logger.error(f"KWS音频处理错误: {e}", exc_info=True)
@@ -299,9 +293,10 @@ class WakeWordDetector:
         """
         self.is_running_flag = False
 
-        # 从AudioCodec移除监听器
-        if self.audio_codec:
-            self.audio_codec.remove_audio_listener(self)
+        # 取消采集帧订阅
+        if self.audio_codec and self._subscription:
+            self.audio_codec.unsubscribe_frames(self._subscription)
+        self._subscription = None
 
         if self.detection_task:
             self.detection_task.cancel()
@@ -310,15 +305,21 @@ class WakeWordDetector:
             except asyncio.CancelledError:
                 pass
 
-        # 清空队列
-        while not self._audio_queue.empty():
-            try:
-                self._audio_queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-
         logger.info("Sherpa-ONNX KeywordSpotter检测器已停止")
 
+    def get_stats(self) -> dict:
+        """获取检测器统计.
+
+        Returns:
+            dict: 引擎名称、暂停状态及前置门控占空比
+        """
+        stats = {"engine": "sherpa-onnx", "paused": self.paused}
+        if self._subscription:
+            stats["lag_frames"] = self._subscription.lag
+        if self._gate:
+            stats["gate"] = self._gate.get_stats()
+        return stats
+
     def _validate_config(self):
         """
         验证配置参数.
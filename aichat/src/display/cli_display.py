@@ -210,6 +210,8 @@ class CliDisplay(BaseDisplay):
         elif cmd == "x":
             if self.abort_callback:
                 await self.command_queue.put(self.abort_callback)
+        elif cmd == "d":
+            self._show_audio_health()
         else:
             if self.send_text_callback:
                 await self.send_text_callback(cmd)
@@ -225,9 +227,38 @@ class CliDisplay(BaseDisplay):
         """
         将帮助信息写入顶部内容显示区，而非直接打印。
         """
-        help_text = "r: Bắt đầu/Dừng | x: Ngắt | q: Thoát | h: Trợ giúp | Khác: Gửi văn bản"
+        help_text = (
+            "r: Bắt đầu/Dừng | x: Ngắt | d: Âm thanh | q: Thoát | h: Trợ giúp "
+            "| Khác: Gửi văn bản"
+        )
         self._dash_text = help_text
 
+    def _show_audio_health(self):
+        """
+        将音频健康快照摘要写入顶部内容显示区.
+        """
+        from src.application import Application
+
+        codec = getattr(Application.get_instance(), "audio_codec", None)
+        if codec is None:
+            self._dash_text = "Âm thanh: chưa khởi tạo"
+            return
+
+        health = codec.get_health_snapshot()
+        callbacks = health["callbacks"]
+        xruns = health["xruns"]
+        levels = health["levels_ms"]
+        self._dash_text = (
+            f"in p99={callbacks['input'].get('p99_us', 0):.0f}us "
+            f"out p99={callbacks['output'].get('p99_us', 0):.0f}us | "
+            f"overflow={xruns['input_overflows']} "
+            f"underflow={xruns['output_underflows']} "
+            f"miss={xruns['input_deadline_misses']}/"
+            f"{xruns['output_deadline_misses']} | "
+            f"playout={levels['playout']['last']}ms "
+            f"jitter={levels['jitter']:.0f}ms"
+        )
+
     async def _init_screen(self):
         """
         初始化屏幕并渲染两块区域（显示区 + 输入区）。
@@ -1,8 +1,8 @@
 import asyncio
-import json
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.iot.thing import Thing
+from src.utils import json_codec
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -34,23 +34,28 @@ class ThingManager:
     def add_thing(self, thing: Thing) -> None:
         self.things.append(thing)
 
-    async def get_descriptors_json(self) -> str:
+    async def get_descriptors(self) -> List[Dict]:
         """
-        获取所有设备的描述符JSON.
+        获取所有设备的描述符（对象形式，由协议层随消息一起编码）.
         """
         # 由于get_descriptor_json()是同步方法（返回静态数据），
         # 这里保持简单的同步调用即可
-        descriptors = [thing.get_descriptor_json() for thing in self.things]
-        return json.dumps(descriptors)
+        return [thing.get_descriptor_json() for thing in self.things]
 
-    async def get_states_json(self, delta=False) -> Tuple[bool, str]:
-        """获取所有设备的状态JSON.
+    async def get_descriptors_json(self) -> str:
+        """
+        获取所有设备的描述符JSON.
+        """
+        return json_codec.dumps(await self.get_descriptors())
+
+    async def get_states(self, delta=False) -> Tuple[bool, List[Dict]]:
+        """获取所有设备的状态（对象形式，由协议层随消息一起编码）.
 
         Args:
             delta: 是否只返回变化的部分，True表示只返回变化的部分
 
         Returns:
-            Tuple[bool, str]: 返回是否有状态变化的布尔值和JSON字符串
+            Tuple[bool, List[Dict]]: 返回是否有状态变化的布尔值和状态列表
         """
         if not delta:
             self.last_states.clear()
@@ -79,9 +84,21 @@ class ThingManager:
             if isinstance(state_json, dict):
                 states.append(state_json)
             else:
-                states.append(json.loads(state_json))  # 转换JSON字符串为字典
+                states.append(json_codec.loads(state_json))  # 转换JSON字符串为字典
 
-        return changed, json.dumps(states)
+        return changed, states
+
+    async def get_states_json(self, delta=False) -> Tuple[bool, str]:
+        """获取所有设备的状态JSON.
+
+        Args:
+            delta: 是否只返回变化的部分，True表示只返回变化的部分
+
+        Returns:
+            Tuple[bool, str]: 返回是否有状态变化的布尔值和JSON字符串
+        """
+        changed, states = await self.get_states(delta)
+        return changed, json_codec.dumps(states)
 
     async def get_states_json_str(self) -> str:
         """
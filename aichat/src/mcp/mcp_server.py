@@ -4,12 +4,12 @@ Reference: https://modelcontextprotocol.io/specification/2024-11-05
 """
 
 import asyncio
-import json
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from src.constants.system import SystemConstants
+from src.utils import json_codec
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -169,9 +169,11 @@ class McpTool:
             },
         }
 
-    async def call(self, arguments: Dict[str, Any]) -> str:
-        """
-        调用工具.
+    async def call(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """调用工具.
+
+        Returns:
+            MCP 工具结果对象（content / isError），由调用方直接放入响应，不再经 JSON 往返
         """
         try:
             # 解析参数
@@ -191,15 +193,11 @@ class McpTool:
             else:
                 text = str(result)
 
-            return json.dumps(
-                {"content": [{"type": "text", "text": text}], "isError": False}
-            )
+            return {"content": [{"type": "text", "text": text}], "isError": False}
 
         except Exception as e:
             logger.error(f"Error calling tool {self.name}: {e}", exc_info=True)
-            return json.dumps(
-                {"content": [{"type": "text", "text": str(e)}], "isError": True}
-            )
+            return {"content": [{"type": "text", "text": str(e)}], "isError": True}
 
 
 class McpServer:
@@ -362,13 +360,11 @@ class McpServer:
         """
         try:
             if isinstance(message, str):
-                data = json.loads(message)
+                data = json_codec.loads(message)
             else:
                 data = message
 
-            logger.info(
-                f"[MCP] 解析消息: {json.dumps(data, ensure_ascii=False, indent=2)}"
-            )
+            logger.info(f"[MCP] 解析消息: {data}")
 
             # 检查JSONRPC版本
             if data.get("jsonrpc") != "2.0":
@@ -452,7 +448,7 @@ class McpServer:
 
             # 检查大小
             tool_json = tool.to_json()
-            tool_size = len(json.dumps(tool_json))
+            tool_size = len(json_codec.dumps_bytes(tool_json))
 
             if total_size + tool_size + 100 > max_payload_size:
                 next_cursor = tool.name
@@ -500,7 +496,7 @@ class McpServer:
         try:
             result = await tool.call(arguments)
             logger.info(f"[MCP] 工具 {tool_name} 执行成功，结果: {result}")
-            await self._reply_result(id, json.loads(result))
+            await self._reply_result(id, result)
         except Exception as e:
             logger.error(f"[MCP] 工具 {tool_name} 执行失败: {e}", exc_info=True)
             await self._reply_error(id, str(e))
@@ -529,11 +525,11 @@ class McpServer:
         """
         payload = {"jsonrpc": "2.0", "id": id, "result": result}
 
-        result_len = len(json.dumps(result))
-        logger.info(f"[MCP] 发送成功响应: ID={id}, 结果长度={result_len}")
+        logger.info(f"[MCP] 发送成功响应: ID={id}")
 
+        # 直接传递对象，由协议层与外层消息一起编码一次
         if self._send_callback:
-            await self._send_callback(json.dumps(payload))
+            await self._send_callback(payload)
         else:
             logger.error("[MCP] 发送回调未设置!")
 
@@ -546,4 +542,4 @@ class McpServer:
         logger.error(f"[MCP] 发送错误响应: ID={id}, 错误={message}")
 
         if self._send_callback:
-            await self._send_callback(json.dumps(payload))
+            await self._send_callback(payload)
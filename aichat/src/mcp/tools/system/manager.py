@@ -10,7 +10,7 @@ from src.utils.logging_config import get_logger
 from .app_management.killer import kill_application, list_running_applications
 from .app_management.launcher import launch_application
 from .app_management.scanner import scan_installed_applications
-from .tools import get_volume, set_volume
+from .tools import get_audio_health, get_volume, set_volume
 
 logger = get_logger(__name__)
 
@@ -44,6 +44,11 @@ class SystemToolsManager:
                 add_tool, PropertyList, Property, PropertyType
             )
 
+            # 注册音频诊断工具
+            self._register_audio_health_tool(
+                add_tool, PropertyList, Property, PropertyType
+            )
+
             # 注册应用程序启动工具
             self._register_app_launcher_tool(
                 add_tool, PropertyList, Property, PropertyType
@@ -112,6 +117,31 @@ class SystemToolsManager:
         )
         logger.debug("[SystemManager] 注册音量获取工具成功")
 
+    def _register_audio_health_tool(
+        self, add_tool, PropertyList, Property, PropertyType
+    ):
+        """
+        注册音频诊断工具.
+        """
+        add_tool(
+            (
+                "self.audio.get_health",
+                "Get a real-time health snapshot of the local audio pipeline for "
+                "diagnosing crackling, dropouts or delay.\n"
+                "Use when user mentions: crackling, stuttering, choppy audio, audio "
+                "glitches, echo delay, '声音卡顿', '有杂音', '断断续续'.\n"
+                "Returns JSON with:\n"
+                "- callbacks: input/output callback time histograms vs deadline\n"
+                "- xruns: input overflows, output underflows, deadline misses\n"
+                "- dropped: dropped capture blocks, samples and packets\n"
+                "- levels_ms: resampler, playout and jitter buffer depth\n"
+                "- opus: encode/decode time histograms",
+                PropertyList([]),
+                get_audio_health,
+            )
+        )
+        logger.debug("[SystemManager] 注册音频诊断工具成功")
+
     def _register_app_launcher_tool(
         self, add_tool, PropertyList, Property, PropertyType
     ):
@@ -251,6 +281,7 @@ class SystemToolsManager:
         available_tools = [
             "set_volume",
             "get_volume",
+            "get_audio_health",
             "launch_application",
             "scan_installed_applications",
             "kill_application",
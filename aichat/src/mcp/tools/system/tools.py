@@ -4,6 +4,7 @@
 """
 
 import asyncio
+import json
 from typing import Any, Dict
 
 from src.utils.logging_config import get_logger
@@ -101,6 +102,44 @@ async def _get_audio_status() -> Dict[str, Any]:
         return {"volume": 50, "muted": False, "available": False, "error": str(e)}
 
 
+async def get_audio_health(args: Dict[str, Any]) -> str:
+    """
+    获取音频管线实时健康快照（回调耗时、xrun、丢弃计数、缓冲区水位、编解码耗时）.
+    """
+    try:
+        from src.application import Application
+
+        app = Application.get_instance()
+        codec = getattr(app, "audio_codec", None)
+        if codec is None:
+            return json.dumps(
+                {"success": False, "message": "音频编解码器未初始化"},
+                ensure_ascii=False,
+            )
+        health = codec.get_health_snapshot()
+        audio_plugin = app.plugins.get_plugin("audio")
+        if audio_plugin is not None:
+            health["uplink"] = audio_plugin.get_uplink_stats()
+        protocol = getattr(app, "protocol", None)
+        if hasattr(protocol, "get_udp_receive_stats"):
+            # MQTT/UDP 下行：乱序、重复、迟到、丢包计数
+            health["downlink"] = protocol.get_udp_receive_stats()
+        wake_plugin = app.plugins.get_plugin("wake_word")
+        detector = getattr(wake_plugin, "detector", None)
+        if hasattr(detector, "get_stats"):
+            # 唤醒词识别线程：每秒音频消耗的 CPU 时间
+            health["wake_word"] = detector.get_stats()
+        # 对话轮次各分段耗时 P50/P95
+        from src.utils.turn_tracer import TurnTracer
+
+        health["turns"] = TurnTracer.get_instance().get_summary()
+        return json.dumps({"success": True, "health": health}, ensure_ascii=False)
+
+    except Exception as e:
+        logger.error(f"[SystemTools] 获取音频健康状态失败: {e}", exc_info=True)
+        return json.dumps({"success": False, "message": str(e)}, ensure_ascii=False)
+
+
 def _get_application_status() -> Dict[str, Any]:
     """
     获取应用状态信息.
@@ -271,11 +271,8 @@ class TimerTask:
             if not tool:
                 raise ValueError(f"MCP工具不存在: {tool_name}")
 
-            # 执行MCP工具
-            result = await tool.call(arguments)
-
-            # 解析结果
-            result_data = json.loads(result)
+            # 执行MCP工具（返回结果对象）
+            result_data = await tool.call(arguments)
             is_success = not result_data.get("isError", False)
 
             if is_success:
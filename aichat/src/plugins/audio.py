@@ -1,15 +1,36 @@
 import asyncio
 import os
-from typing import Any, Optional
+import time
+from typing import Any, List, Optional
 
+from src.audio_codecs.aec_processor import AECProcessor
 from src.audio_codecs.audio_codec import AudioCodec
+from src.audio_codecs.audio_telemetry import LatencyHistogram
+from src.audio_processing.vad_gate import VadEvent, VadGate
+from src.constants.constants import AudioConfig, DeviceState, ListeningMode
 from src.plugins.base import Plugin
+from src.protocols.audio_uplink import AudioUplink, PreconnectBuffer
+from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
+from src.utils.turn_tracer import TurnTracer
 
 logger = get_logger(__name__)
 
-# 常量配置
-MAX_CONCURRENT_AUDIO_SENDS = 4
+# 唤醒到首个上行音频帧的耗时分桶（微秒）：含建连、hello 和 listen 指令往返
+WAKE_TO_UPLINK_BOUNDS_US = (
+    50000,
+    100000,
+    200000,
+    300000,
+    500000,
+    750000,
+    1000000,
+    1500000,
+    2000000,
+    3000000,
+    5000000,
+    10000000,
+)
 
 
 class AudioPlugin(Plugin):
@@ -21,8 +42,21 @@ class AudioPlugin(Plugin):
         self.app = None
         self.codec: Optional[AudioCodec] = None
         self._main_loop = None
-        self._send_sem = asyncio.Semaphore(MAX_CONCURRENT_AUDIO_SENDS)
+        # 上行发送管线：单发送协程按顺序发送编码帧
+        self._uplink: Optional[AudioUplink] = None
         self._in_silence_period = False  # 静默期标志，用于防止TTS尾音被捕获
+        # 实时模式上行VAD门控（可选）
+        self._vad_gate: Optional[VadGate] = None
+        self._vad_active = False
+        self._local_endpoint_sent = False  # 本地端点已发送 stop_listening
+        # 唤醒到首个上行帧发出的耗时
+        self._wake_time: Optional[float] = None
+        self._wake_to_uplink = LatencyHistogram(WAKE_TO_UPLINK_BOUNDS_US)
+        # 唤醒后建连期间的编码帧暂存，listen 指令发出后加速回放
+        self._preconnect: Optional[PreconnectBuffer] = None
+        self._replay_speed = 3.0
+        self._replay_task: Optional[asyncio.Task] = None
+        self._turn_tracer = TurnTracer.get_instance()
 
     async def setup(self, app: Any) -> None:
         self.app = app
@@ -32,12 +66,24 @@ class AudioPlugin(Plugin):
             return
 
         try:
-            self.codec = AudioCodec()
+            # 启用AEC时注入回声消除处理器（macOS/Linux 进程内处理）
+            aec_enabled = ConfigManager.get_instance().get_config(
+                "AEC_OPTIONS.ENABLED", False
+            )
+            audio_processor = AECProcessor() if aec_enabled else None
+
+            self.codec = AudioCodec(audio_processor=audio_processor)
             await self.codec.initialize()
 
-            # 设置编码音频回调：直接发送，不走队列
+            # 设置编码音频回调：入队后由上行发送协程按顺序发送
+            self._uplink = self._create_uplink()
+            self._uplink.start()
+            self._preconnect = self._create_preconnect()
             self.codec.set_encoded_callback(self._on_encoded_audio)
 
+            # 可选的上行VAD门控（仅实时模式启用）
+            self._vad_gate = self._create_vad_gate()
+
             # 暴露给应用，便于唤醒词插件使用
             self.app.audio_codec = self.codec
         except Exception as e:
@@ -52,7 +98,7 @@ class AudioPlugin(Plugin):
         if not self.codec:
             return
 
-        from src.constants.constants import DeviceState
+        self._update_vad_gate(state)
 
         # 如果进入监听状态，清空队列并等待硬件输出完全停止
         if state == DeviceState.LISTENING:
@@ -94,12 +140,26 @@ class AudioPlugin(Plugin):
         Args:
             data: 服务端返回的Opus编码音频数据
         """
+        self._turn_tracer.mark("first_audio")
         if self.codec:
             try:
                 await self.codec.write_audio(data)
             except Exception as e:
                 logger.debug(f"写入音频数据失败: {e}")
 
+    async def on_incoming_audio_batch(self, frames) -> None:
+        """接收一批带序列号的服务端音频（UDP通道已按序列号校验和重排）
+
+        Args:
+            frames: [(序列号, Opus数据), ...]
+        """
+        self._turn_tracer.mark("first_audio")
+        if self.codec:
+            try:
+                await self.codec.write_audio_batch(frames)
+            except Exception as e:
+                logger.debug(f"写入音频数据失败: {e}")
+
     async def _pause_music_for_tts(self):
         """
         TTS 开始时：先清空音频队列，再暂停音乐.
@@ -167,13 +227,13 @@ class AudioPlugin(Plugin):
         """
         完全关闭并释放音频资源.
         """
-        # 停止音频消费者任务
-        if self._audio_consumer_task and not self._audio_consumer_task.done():
-            self._audio_consumer_task.cancel()
-            try:
-                await self._audio_consumer_task
-            except asyncio.CancelledError:
-                pass
+        # 停止暂存回放和上行发送协程
+        await self._stop_preconnect_replay()
+        if self._preconnect:
+            self._preconnect.cancel()
+        if self._uplink:
+            await self._uplink.stop()
+            self._uplink = None
 
         if self.codec:
             try:
@@ -187,46 +247,266 @@ class AudioPlugin(Plugin):
         if self.app:
             self.app.audio_codec = None
 
+    def get_uplink_stats(self) -> Optional[dict]:
+        """获取上行发送统计（队列深度、发送延迟、丢弃计数）
+
+        Returns:
+            dict，未启用音频时返回 None
+        """
+        if not self._uplink:
+            return None
+        stats = self._uplink.get_stats()
+        stats["wake_to_first_frame"] = self._wake_to_uplink.snapshot()
+        if self._preconnect:
+            stats["preconnect"] = self._preconnect.get_stats()
+        return stats
+
+    def mark_wake_detected(self, timestamp: Optional[float] = None) -> None:
+        """记录唤醒时刻，下一次上行发送成功时统计唤醒到首帧的耗时.
+
+        Args:
+            timestamp: 唤醒时刻（time.monotonic），默认取当前时间
+        """
+        self._wake_time = time.monotonic() if timestamp is None else timestamp
+
+    def begin_preconnect_capture(self, wake_end: Optional[float] = None) -> None:
+        """唤醒时调用：开始暂存编码帧，直到 listen 指令发出后回放.
+
+        Args:
+            wake_end: 唤醒词结束的采集时刻（time.monotonic）；提供时先补入
+                编解码器预录窗口中此后的帧，唤醒词识别期间已说的话不会被截掉
+        """
+        if not self._preconnect:
+            return
+        if self._replay_task and not self._replay_task.done():
+            self._replay_task.cancel()
+        self._preconnect.start()
+        if wake_end is not None and self.codec:
+            # 先开始暂存再取预录：两者重叠的帧由 prepend 去重
+            prerolled = self._preconnect.prepend(
+                self.codec.get_encoded_preroll(wake_end)
+            )
+            if prerolled:
+                logger.debug(
+                    f"补入唤醒词之后的预录 {prerolled} 帧 "
+                    f"({prerolled * AudioConfig.FRAME_DURATION}ms)"
+                )
+
+    def flush_preconnect_capture(self) -> None:
+        """
+        listen 指令发出后调用：按序加速回放暂存帧，回放完毕后恢复实时上行.
+        """
+        if not self._preconnect or not self._preconnect.holding:
+            return
+        if self._replay_task and not self._replay_task.done():
+            return
+        self._replay_task = asyncio.create_task(
+            self._replay_preconnect(), name="audio:preconnect_replay"
+        )
+
+    def cancel_preconnect_capture(self) -> None:
+        """
+        建连失败或放弃本次唤醒时调用：丢弃暂存帧并恢复实时上行.
+        """
+        if self._replay_task and not self._replay_task.done():
+            self._replay_task.cancel()
+        if self._preconnect:
+            dropped = self._preconnect.cancel()
+            if dropped:
+                logger.debug(f"放弃建连期间暂存的 {dropped} 帧")
+
     # -------------------------
-    # 内部：直接发送录音音频（不走队列）
+    # 内部：上行发送管线
     # -------------------------
+    def _create_uplink(self) -> AudioUplink:
+        """
+        按 AUDIO_OPTIONS 创建上行发送管线.
+        """
+        config = ConfigManager.get_instance()
+        queue_ms = config.get_config("AUDIO_OPTIONS.UPLINK_QUEUE_MS", 1000)
+        return AudioUplink(
+            self._main_loop,
+            self._send_uplink_batch,
+            capacity=max(1, queue_ms // AudioConfig.FRAME_DURATION),
+            max_batch=config.get_config("AUDIO_OPTIONS.UPLINK_MAX_BATCH", 5),
+        )
+
+    def _create_preconnect(self) -> PreconnectBuffer:
+        """
+        按 AUDIO_OPTIONS 创建建连期间的暂存环.
+        """
+        config = ConfigManager.get_instance()
+        max_ms = config.get_config("AUDIO_OPTIONS.PRECONNECT_MAX_MS", 3000)
+        self._replay_speed = max(
+            1.0, float(config.get_config("AUDIO_OPTIONS.PRECONNECT_REPLAY_SPEED", 3.0))
+        )
+        return PreconnectBuffer(max(1, max_ms // AudioConfig.FRAME_DURATION))
+
     def _on_encoded_audio(self, encoded_data: bytes) -> None:
         """
-        音频线程回调：切换到主循环并直接发送（参考旧版本）
+        采集线程回调：编码帧入队（不创建任务），拥塞时按策略丢弃.
+        """
+        if not self.app or not self.app.running or not self._uplink:
+            return
+        # 唤醒后建连期间先暂存，回放完毕前实时帧也排在暂存帧之后
+        if self._preconnect is not None and self._preconnect.push(encoded_data):
+            return
+        self._uplink.push(encoded_data, silent=self.codec.last_frame_silent)
+
+    async def _replay_preconnect(self):
+        """按 PRECONNECT_REPLAY_SPEED 倍实时速率回放暂存帧.
+
+        回放期间新采集的帧继续进入暂存环，取空后暂存结束、恢复实时上行；
+        音频通道未打开时放弃暂存（不计入已回放）
         """
+        loop = asyncio.get_running_loop()
+        frame_seconds = AudioConfig.FRAME_DURATION / 1000
+        max_batch = self._uplink.max_batch if self._uplink else 5
+        start = loop.time()
+        replayed = 0
         try:
-            if not self.app or not self._main_loop or not self.app.running:
-                return
-            if self._main_loop.is_closed():
-                return
-            self._main_loop.call_soon_threadsafe(
-                self._schedule_send_audio, encoded_data
-            )
-        except Exception:
+            while True:
+                protocol = self.app.protocol if self.app else None
+                if not protocol or not protocol.is_audio_channel_opened():
+                    dropped = self._preconnect.cancel()
+                    logger.warning(f"音频通道未打开，放弃暂存的 {dropped} 帧")
+                    break
+                batch = self._preconnect.pop_batch(max_batch)
+                if not batch:
+                    break
+                await protocol.send_audio_batch(batch)
+                self._on_uplink_sent()
+                replayed += len(batch)
+                target = start + replayed * frame_seconds / self._replay_speed
+                delay = target - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            if replayed:
+                logger.debug(
+                    f"建连期间暂存的 {replayed} 帧已回放，"
+                    f"耗时 {(loop.time() - start) * 1000:.0f}ms"
+                )
+        except asyncio.CancelledError:
+            # 由调用方决定丢弃（cancel）或重新开始（start）暂存
             pass
+        except Exception as e:
+            logger.error(f"回放暂存音频失败: {e}", exc_info=True)
+            self._preconnect.cancel()
+
+    async def _stop_preconnect_replay(self):
+        task, self._replay_task = self._replay_task, None
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def _on_uplink_sent(self):
+        """
+        上行发送成功后调用：记录轮次里程碑，唤醒后首次发送时统计唤醒到首帧的耗时.
+        """
+        self._turn_tracer.mark("first_uplink")
+        if self._wake_time is None:
+            return
+        elapsed = time.monotonic() - self._wake_time
+        self._wake_time = None
+        # 超过30秒说明该次唤醒未能开始上行（如建连失败），不计入
+        if elapsed < 30:
+            self._wake_to_uplink.record(elapsed)
+            logger.info(f"唤醒到首个上行音频帧: {elapsed * 1000:.0f}ms")
+
+    async def _send_uplink_batch(self, frames: List[bytes]) -> bool:
+        """发送一组编码帧（上行发送协程调用）
+
+        Returns:
+            False 表示当前不应上行（通道未打开或不在采集状态），帧被跳过
+        """
+        protocol = self.app.protocol if self.app else None
+        if not protocol or not protocol.is_audio_channel_opened():
+            return False
+        if not self._should_send_microphone_audio():
+            return False
+        await protocol.send_audio_batch(frames)
+        self._on_uplink_sent()
+        return True
+
+    # -------------------------
+    # 内部：实时模式上行VAD门控与本地端点检测
+    # -------------------------
+    def _create_vad_gate(self) -> Optional[VadGate]:
+        """
+        根据 VAD_OPTIONS 创建门控，未启用时返回 None.
+        """
+        config = ConfigManager.get_instance()
+        if not config.get_config("VAD_OPTIONS.ENABLED", False):
+            return None
+
+        gate = VadGate(
+            AudioConfig.FRAME_DURATION,
+            threshold_db=config.get_config("VAD_OPTIONS.THRESHOLD_DB", 10),
+            hangover_ms=config.get_config("VAD_OPTIONS.HANGOVER_MS", 300),
+            preroll_ms=config.get_config("VAD_OPTIONS.PREROLL_MS", 180),
+            endpoint_ms=config.get_config("VAD_OPTIONS.ENDPOINT_MS", 800),
+            keepalive_ms=config.get_config("VAD_OPTIONS.KEEPALIVE_MS", 1000),
+        )
+        logger.info("已启用实时模式上行VAD门控")
+        return gate
+
+    def _update_vad_gate(self, state) -> None:
+        """
+        实时模式对话中启用门控，其他状态关闭（所有帧照常上行）.
+        """
+        if not self._vad_gate or not self.app:
+            return
+
+        active = self.app.get_listening_mode() == ListeningMode.REALTIME and state in (
+            DeviceState.LISTENING,
+            DeviceState.SPEAKING,
+        )
+        if active == self._vad_active:
+            return
+
+        self._vad_active = active
+        self._local_endpoint_sent = False
+        if active:
+            self._vad_gate.request_reset()
+            self.codec.set_vad_gate(self._vad_gate, self._on_vad_event)
+        else:
+            self.codec.set_vad_gate(None)
 
-    def _schedule_send_audio(self, encoded_data: bytes) -> None:
+    def _on_vad_event(self, event: str) -> None:
+        """采集线程回调：门控事件作为控制消息进入上行队列.
+
+        事件先于对应的帧回调触发，经上行发送协程按入队顺序处理，
+        控制指令与语音帧的先后顺序与采集顺序一致
         """
-        在主事件循环中调度发送任务.
+        uplink = self._uplink
+        if uplink is not None:
+            uplink.push_control(lambda: self._handle_vad_event(event))
+
+    async def _handle_vad_event(self, event: str) -> None:
+        """处理门控事件（上行发送协程）
+
+        - 端点：本地发送 stop_listening，无需等待服务端判定
+        - 端点之后再次检测到语音：先重新发送 start_listening，再发送语音帧
         """
         if not self.app or not self.app.running or not self.app.protocol:
             return
+        if self.app.get_listening_mode() != ListeningMode.REALTIME:
+            return
 
-        async def _send():
-            async with self._send_sem:
-                try:
-                    if not (
-                        self.app.protocol
-                        and self.app.protocol.is_audio_channel_opened()
-                    ):
-                        return
-                    if self._should_send_microphone_audio():
-                        await self.app.protocol.send_audio(encoded_data)
-                except Exception:
-                    pass
-
-        # 创建任务但不等待，实现"发完即忘"
-        self.app.spawn(_send(), name="audio:send")
+        protocol = self.app.protocol
+        if event == VadEvent.ENDPOINT and not self._local_endpoint_sent:
+            if not self.app.is_listening():
+                return
+            self._local_endpoint_sent = True
+            logger.info("本地端点检测：发送 stop_listening")
+            await protocol.send_stop_listening()
+        elif event == VadEvent.SPEECH_START and self._local_endpoint_sent:
+            self._local_endpoint_sent = False
+            logger.info("端点后检测到语音：重新发送 start_listening")
+            await protocol.send_start_listening(ListeningMode.REALTIME)
 
     def _should_send_microphone_audio(self) -> bool:
         """
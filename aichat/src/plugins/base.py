@@ -44,6 +44,13 @@ class Plugin:
         """
         await asyncio.sleep(0)
 
+    async def on_incoming_audio_batch(self, frames: Any) -> None:
+        """
+        收到一批音频数据时的通知（[(序列号, 数据), ...]），默认逐帧转发。
+        """
+        for _, data in frames:
+            await self.on_incoming_audio(data)
+
     async def on_device_state_changed(self, state: Any) -> None:
         """
         设备状态变更通知（由应用广播）。
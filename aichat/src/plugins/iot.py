@@ -30,11 +30,12 @@ class IoTPlugin(Plugin):
             from src.iot.thing_manager import ThingManager
 
             manager = ThingManager.get_instance()
-            descriptors_json = await manager.get_descriptors_json()
-            await self.app.protocol.send_iot_descriptors(descriptors_json)
+            # 直接传递对象，协议层只编码一次
+            descriptors = await manager.get_descriptors()
+            await self.app.protocol.send_iot_descriptors(descriptors)
 
-            changed, states_json = await manager.get_states_json(delta=False)
-            await self.app.protocol.send_iot_states(states_json)
+            changed, states = await manager.get_states(delta=False)
+            await self.app.protocol.send_iot_states(states)
         except Exception:
             pass
 
@@ -64,9 +65,9 @@ class IoTPlugin(Plugin):
 
             try:
                 # 执行后下发一次最新状态（只发变化）
-                changed, states_json = await manager.get_states_json(delta=True)
+                changed, states = await manager.get_states(delta=True)
                 if changed:
-                    await self.app.protocol.send_iot_states(states_json)
+                    await self.app.protocol.send_iot_states(states)
             except Exception:
                 pass
         except Exception:
@@ -70,6 +70,13 @@ class PluginManager:
             except Exception:
                 pass
 
+    async def notify_incoming_audio_batch(self, frames: Any) -> None:
+        for p in list(self._plugins):
+            try:
+                await p.on_incoming_audio_batch(frames)
+            except Exception:
+                pass
+
     async def notify_device_state_changed(self, state: Any) -> None:
         for p in list(self._plugins):
             try:
@@ -1,4 +1,4 @@
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 from src.mcp.mcp_server import McpServer
 from src.plugins.base import Plugin
@@ -21,7 +21,7 @@ class McpPlugin(Plugin):
         self._server = McpServer.get_instance()
 
         # 通过应用协议发送MCP响应
-        async def _send(msg: str):
+        async def _send(msg: Dict[str, Any]):
             try:
                 if not self.app or not getattr(self.app, "protocol", None):
                     return
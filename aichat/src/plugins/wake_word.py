@@ -4,6 +4,7 @@ from typing import Any
 from src.constants.constants import AbortReason, DeviceState
 from src.plugins.base import Plugin
 from src.utils.logging_config import get_logger
+from src.utils.turn_tracer import TurnTracer
 
 logger = get_logger(__name__)
 
@@ -173,6 +174,19 @@ class WakeWordPlugin(Plugin):
         # Phát hiện wake word: bắt đầu trò chuyện tự động
         logger.info(f"[WAKE_WORD_PLUGIN] Phát hiện wake word: '{wake_word}', full_text: '{full_text}'")
         try:
+            # 空闲时唤醒即开始新一轮对话的延迟追踪
+            if self.app.is_idle():
+                TurnTracer.get_instance().start_turn("wake")
+
+            # 记录唤醒时刻，用于统计唤醒到首个上行帧的耗时；
+            # 建连期间的麦克风帧先暂存，监听开始后补发
+            audio_plugin = self.app.plugins.get_plugin("audio")
+            if audio_plugin and self.app.is_idle():
+                audio_plugin.mark_wake_detected()
+                audio_plugin.begin_preconnect_capture(
+                    getattr(self.detector, "last_wake_end", None)
+                )
+
             # Pause detection ngay lập tức để tiết kiệm CPU
             if self.detector and not self._detection_paused:
                 self.detector.pause()
@@ -191,9 +205,21 @@ class WakeWordPlugin(Plugin):
                         logger.info("[WAKE_WORD_PLUGIN] Đã gửi 'Xin chào' cho AI Xiaozhi")
                         
                         # Bắt đầu cuộc trò chuyện tự động (keep_listening = True)
-                        await self.app.start_auto_conversation()
-                        logger.info("[WAKE_WORD_PLUGIN] Đã bắt đầu cuộc trò chuyện tự động")
-                    
+                        # Chỉ phát lại audio tạm giữ khi lệnh listen đã thực sự được gửi
+                        if await self.app.start_auto_conversation():
+                            logger.info(
+                                "[WAKE_WORD_PLUGIN] Đã bắt đầu cuộc trò chuyện tự động"
+                            )
+                            if audio_plugin:
+                                audio_plugin.flush_preconnect_capture()
+                        elif audio_plugin:
+                            logger.warning(
+                                "[WAKE_WORD_PLUGIN] Không gửi được lệnh listen"
+                            )
+                            audio_plugin.cancel_preconnect_capture()
+                    elif audio_plugin:
+                        audio_plugin.cancel_preconnect_capture()
+
                 elif self.app.is_speaking():
                     logger.info("[WAKE_WORD_PLUGIN] Đang nói, ngắt và bắt đầu lại...")
                     await self.app.abort_speaking(AbortReason.WAKE_WORD_DETECTED)
@@ -204,6 +230,9 @@ class WakeWordPlugin(Plugin):
                     logger.info(f"[WAKE_WORD_PLUGIN] Bỏ qua vì trạng thái: {self.app.device_state}")
         except Exception as e:
             logger.error(f"Lỗi xử lý wake word: {e}", exc_info=True)
+            audio_plugin = self.app.plugins.get_plugin("audio")
+            if audio_plugin:
+                audio_plugin.cancel_preconnect_capture()
 
     def _on_error(self, error):
         try:
@@ -0,0 +1,442 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, List, Optional
+
+from src.audio_codecs.audio_telemetry import LatencyHistogram
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 上行发送延迟分桶（微秒）：排队 + 发送，覆盖到网络拥塞时的秒级延迟
+SEND_LATENCY_BOUNDS_US = (
+    1000,
+    2000,
+    5000,
+    10000,
+    20000,
+    50000,
+    100000,
+    200000,
+    500000,
+    1000000,
+    2000000,
+)
+
+
+class AudioUplink:
+    """
+    上行音频发送管线（单发送协程 + 有界帧队列）
+
+    - 采集线程调用 push 入队（不创建任务，只短暂持锁），发送协程按顺序取出
+    - 每次最多取 max_batch 帧交给协议批量发送，由协议决定是否合并写入
+    - 拥塞策略：队列满时丢弃最旧的帧；积压超过拥塞水位时直接丢弃静音帧
+    - 控制消息（push_control）与帧同队列排队，由发送协程按入队顺序执行，不会被丢弃，
+      也不占用帧容量
+    - 统计发送延迟（入队到发送完成）和队列深度
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        send_batch: Callable[[List[bytes]], Awaitable[bool]],
+        capacity: int = 25,
+        max_batch: int = 5,
+        congestion_ratio: float = 0.5,
+    ):
+        """初始化上行发送管线.
+
+        Args:
+            loop: 发送协程所在的事件循环
+            send_batch: 批量发送回调（按顺序发送一组编码帧），
+                返回 False 表示当前不应发送、帧被跳过
+            capacity: 队列最多缓存的帧数，超出时丢弃最旧的帧
+            max_batch: 每次发送的最大帧数
+            congestion_ratio: 积压达到容量的该比例时开始丢弃静音帧
+        """
+        self._loop = loop
+        self._send_batch = send_batch
+        self.capacity = max(1, capacity)
+        self.max_batch = max(1, max_batch)
+        self._congestion_depth = max(1, int(self.capacity * congestion_ratio))
+
+        # (编码帧, 入队时间) 或 (控制回调, None)；丢弃最旧帧时要跳过控制消息，
+        # 入队、丢弃和出队都在锁内完成
+        self._queue: deque = deque()
+        self._lock = threading.Lock()
+        self._queued_controls = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._waiting = False
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        # 统计
+        self._latency = LatencyHistogram(SEND_LATENCY_BOUNDS_US)
+        self._pushed = 0
+        self._sent = 0
+        self._skipped = 0
+        self._batches = 0
+        self._dropped_oldest = 0
+        self._dropped_silent = 0
+        self._send_errors = 0
+        self._controls = 0
+        self._peak_depth = 0
+
+    def start(self):
+        """
+        启动发送协程（需在事件循环中调用）.
+        """
+        if self._task is not None and not self._task.done():
+            return
+        self._running = True
+        self._wakeup = asyncio.Event()
+        self._task = self._loop.create_task(self._run(), name="audio:uplink")
+
+    async def stop(self):
+        """
+        停止发送协程并丢弃未发送的帧.
+        """
+        self._running = False
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        with self._lock:
+            self._queue.clear()
+            self._queued_controls = 0
+
+    def push(self, packet: bytes, silent: bool = False) -> bool:
+        """入队一帧（可在任意线程调用）
+
+        Args:
+            packet: 编码后的音频帧
+            silent: 是否为静音帧（拥塞时优先丢弃）
+
+        Returns:
+            True=已入队, False=因拥塞丢弃
+        """
+        if not self._running:
+            return False
+
+        queue = self._queue
+        with self._lock:
+            depth = len(queue) - self._queued_controls
+            if silent and depth >= self._congestion_depth:
+                self._dropped_silent += 1
+                return False
+
+            if depth >= self.capacity:
+                # 丢弃最旧的帧，排在前面的控制消息全部保留
+                for index, (_, stamp) in enumerate(queue):
+                    if stamp is not None:
+                        del queue[index]
+                        self._dropped_oldest += 1
+                        depth -= 1
+                        break
+
+            queue.append((packet, time.monotonic()))
+            self._pushed += 1
+            if depth + 1 > self._peak_depth:
+                self._peak_depth = depth + 1
+
+        self._wake()
+        return True
+
+    def push_control(self, callback: Callable[[], Awaitable[None]]) -> bool:
+        """入队一条控制消息（可在任意线程调用）
+
+        发送协程发完此前入队的帧后在事件循环中 await callback()，
+        之后才发送此后入队的帧，用于保证控制消息与音频帧的先后顺序.
+
+        Args:
+            callback: 无参协程函数
+
+        Returns:
+            True=已入队, False=发送协程未运行
+        """
+        if not self._running:
+            return False
+        with self._lock:
+            self._queue.append((callback, None))
+            self._queued_controls += 1
+        self._wake()
+        return True
+
+    def _wake(self):
+        """
+        发送协程空闲等待中才唤醒，积压时不重复调度.
+        """
+        if self._waiting:
+            self._waiting = False
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # 事件循环已关闭
+                pass
+
+    def clear(self) -> int:
+        """丢弃所有未发送的帧（控制消息保留）
+
+        Returns:
+            丢弃的帧数
+        """
+        with self._lock:
+            controls = [item for item in self._queue if item[1] is None]
+            dropped = len(self._queue) - len(controls)
+            self._queue.clear()
+            self._queue.extend(controls)
+        return dropped
+
+    async def _run(self):
+        """
+        发送协程：按顺序批量取出并发送.
+        """
+        queue = self._queue
+        batch: List[bytes] = []
+        stamps: List[float] = []
+        try:
+            while self._running:
+                if not queue:
+                    # 先标记等待再复查队列，避免与 push 竞争丢失唤醒
+                    self._waiting = True
+                    if not queue:
+                        await self._wakeup.wait()
+                    self._wakeup.clear()
+                    self._waiting = False
+                    continue
+
+                batch.clear()
+                stamps.clear()
+                control = None
+                with self._lock:
+                    while queue and len(batch) < self.max_batch:
+                        item, stamp = queue[0]
+                        if stamp is None:
+                            # 控制消息：先发完已取出的帧，下一轮再执行
+                            if not batch:
+                                queue.popleft()
+                                self._queued_controls -= 1
+                                control = item
+                            break
+                        queue.popleft()
+                        batch.append(item)
+                        stamps.append(stamp)
+                if control is not None:
+                    await self._run_control(control)
+                    continue
+                if not batch:
+                    continue
+
+                try:
+                    sent = await self._send_batch(batch)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._send_errors += 1
+                    logger.debug(f"上行音频发送失败: {e}")
+                    continue
+
+                if sent is False:
+                    self._skipped += len(batch)
+                    continue
+                self._sent += len(batch)
+                self._batches += 1
+                now = time.monotonic()
+                for stamp in stamps:
+                    self._latency.record(now - stamp)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"上行音频发送协程异常: {e}", exc_info=True)
+
+    async def _run_control(self, callback: Callable[[], Awaitable[None]]):
+        """
+        执行一条控制消息（失败只记录，不影响后续帧）.
+        """
+        try:
+            await callback()
+            self._controls += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._send_errors += 1
+            logger.warning(f"上行控制消息执行失败: {e}")
+
+    def get_stats(self) -> dict:
+        """获取上行发送统计.
+
+        Returns:
+            dict: 当前/峰值队列深度、发送与丢弃计数、发送延迟分布
+        """
+        batches = max(1, self._batches)
+        return {
+            "depth": len(self._queue),
+            "peak_depth": self._peak_depth,
+            "capacity": self.capacity,
+            "pushed": self._pushed,
+            "sent": self._sent,
+            "skipped": self._skipped,
+            "avg_batch": round(self._sent / batches, 2),
+            "dropped_oldest": self._dropped_oldest,
+            "dropped_silent": self._dropped_silent,
+            "send_errors": self._send_errors,
+            "controls": self._controls,
+            "latency": self._latency.snapshot(),
+        }
+
+
+class PreconnectBuffer:
+    """
+    建连期间的上行帧暂存环（有界，线程安全）
+
+    - 唤醒时 start()，此后采集线程的编码帧先进入暂存环而不是上行队列
+    - 超过容量时丢弃最旧的帧（只保留最近的语音）
+    - 回放方按批 pop_batch 取出，取空时在同一把锁内结束暂存，
+      之后的帧直接走上行队列，保证回放帧与实时帧顺序不乱
+    """
+
+    def __init__(self, capacity: int):
+        """初始化暂存环.
+
+        Args:
+            capacity: 最多暂存的帧数
+        """
+        self.capacity = max(1, capacity)
+        self._frames: deque = deque()
+        self._lock = threading.Lock()
+        self._holding = False
+
+        # 统计
+        self.sessions = 0
+        self.held = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.cancelled = 0
+        self.prerolled = 0
+        self.peak = 0
+
+    @property
+    def holding(self) -> bool:
+        """
+        是否处于暂存状态.
+        """
+        return self._holding
+
+    def start(self, frames=()):
+        """开始暂存（丢弃上一次残留）
+
+        Args:
+            frames: 预先放入的帧（按时间顺序）
+        """
+        with self._lock:
+            self._frames.clear()
+            self._holding = True
+            self.sessions += 1
+            for packet in frames:
+                self._append_locked(packet)
+
+    def prepend(self, frames) -> int:
+        """在暂存帧之前补入开始暂存前采集的帧（如唤醒预录）.
+
+        start() 之后采集线程已暂存的帧也可能出现在 frames 中（同一数据包对象），
+        按对象身份跳过，保证不重不漏；超出容量时丢弃最旧的补入帧。
+
+        Args:
+            frames: 按时间顺序排列的帧
+
+        Returns:
+            实际补入的帧数
+        """
+        with self._lock:
+            if not self._holding:
+                return 0
+            held = {id(packet) for packet in self._frames}
+            earlier = [packet for packet in frames if id(packet) not in held]
+            room = self.capacity - len(self._frames)
+            if len(earlier) > room:
+                self.dropped += len(earlier) - room
+                earlier = earlier[len(earlier) - room :]
+            self._frames.extendleft(reversed(earlier))
+            self.held += len(earlier)
+            self.prerolled += len(earlier)
+            if len(self._frames) > self.peak:
+                self.peak = len(self._frames)
+            return len(earlier)
+
+    def push(self, packet: bytes) -> bool:
+        """暂存一帧（采集线程调用）
+
+        Returns:
+            True=已暂存, False=未处于暂存状态（调用方应直接上行）
+        """
+        if not self._holding:
+            return False
+        with self._lock:
+            if not self._holding:
+                return False
+            self._append_locked(packet)
+            return True
+
+    def _append_locked(self, packet: bytes):
+        if len(self._frames) >= self.capacity:
+            self._frames.popleft()
+            self.dropped += 1
+        self._frames.append(packet)
+        self.held += 1
+        if len(self._frames) > self.peak:
+            self.peak = len(self._frames)
+
+    def pop_batch(self, max_frames: int) -> list:
+        """按顺序取出一批暂存帧；已取空时结束暂存.
+
+        Returns:
+            帧列表，为空表示暂存已结束
+        """
+        with self._lock:
+            frames = self._frames
+            count = min(max_frames, len(frames))
+            batch = [frames.popleft() for _ in range(count)]
+            if not batch:
+                self._holding = False
+            self.replayed += len(batch)
+            return batch
+
+    def cancel(self) -> int:
+        """放弃暂存的帧并结束暂存（如建连失败）.
+
+        Returns:
+            丢弃的帧数
+        """
+        with self._lock:
+            dropped = len(self._frames)
+            self._frames.clear()
+            if self._holding:
+                self.cancelled += 1
+            self._holding = False
+            return dropped
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get_stats(self) -> dict:
+        """获取暂存统计.
+
+        Returns:
+            dict: 当前/峰值积压、暂存/预录补入/回放/丢弃帧数、会话与取消次数
+        """
+        return {
+            "holding": self._holding,
+            "depth": len(self._frames),
+            "peak": self.peak,
+            "capacity": self.capacity,
+            "sessions": self.sessions,
+            "held": self.held,
+            "prerolled": self.prerolled,
+            "replayed": self.replayed,
+            "dropped": self.dropped,
+            "cancelled": self.cancelled,
+        }
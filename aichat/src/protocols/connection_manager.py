@@ -0,0 +1,289 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ReconnectBackoff:
+    """
+    带抖动的指数退避
+
+    第 n 次重试的等待上限为 base × 2^(n-1)（不超过 cap），健康分越低上限越大；
+    实际等待在 [上限/2, 上限] 内随机，避免多台设备同时重连
+    """
+
+    def __init__(self, base: float = 0.5, cap: float = 30.0):
+        """初始化退避策略.
+
+        Args:
+            base: 首次重试的等待上限（秒）
+            cap: 等待上限的最大值（秒）
+        """
+        self.base = max(0.01, base)
+        self.cap = max(self.base, cap)
+        self.attempt = 0
+
+    def next_delay(self, health_score: float = 1.0) -> float:
+        """计算下一次重试前的等待时间.
+
+        Args:
+            health_score: 连接健康分（0~1），不健康时延长等待
+
+        Returns:
+            等待秒数
+        """
+        self.attempt += 1
+        ceiling = min(self.cap, self.base * (2 ** min(self.attempt - 1, 16)))
+        ceiling = min(self.cap, ceiling * (2.0 - max(0.0, min(1.0, health_score))))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def reset(self):
+        """
+        连接成功后重置重试次数.
+        """
+        self.attempt = 0
+
+
+class ConnectionHealth:
+    """
+    连接健康评分
+
+    - 分数为建连成功率的指数滑动平均（0~1），建立后很快断开的连接也计为失败
+    - 同时记录握手耗时的滑动平均，供诊断和备用连接决策使用
+    """
+
+    def __init__(self, alpha: float = 0.3, early_drop_seconds: float = 30.0):
+        """初始化健康评分.
+
+        Args:
+            alpha: 滑动平均系数，越大越偏重最近的结果
+            early_drop_seconds: 存活不足该时长即断开的连接计为失败
+        """
+        self.alpha = alpha
+        self.early_drop_seconds = early_drop_seconds
+        self.score = 1.0
+        self.connect_ms: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.drops = 0
+        self.consecutive_failures = 0
+
+    def _update(self, value: float):
+        self.score = self.score * (1 - self.alpha) + value * self.alpha
+
+    def record_success(self, seconds: float):
+        """
+        记录一次建连成功及其握手耗时.
+        """
+        self.successes += 1
+        self.consecutive_failures = 0
+        self._update(1.0)
+        ms = seconds * 1000
+        if self.connect_ms is None:
+            self.connect_ms = ms
+        else:
+            self.connect_ms = self.connect_ms * (1 - self.alpha) + ms * self.alpha
+
+    def record_failure(self):
+        """
+        记录一次建连失败.
+        """
+        self.failures += 1
+        self.consecutive_failures += 1
+        self._update(0.0)
+
+    def record_drop(self, uptime: float):
+        """记录一次连接断开.
+
+        Args:
+            uptime: 连接存活时长（秒）
+        """
+        self.drops += 1
+        if uptime < self.early_drop_seconds:
+            self._update(0.0)
+
+    def snapshot(self) -> dict:
+        """获取健康快照.
+
+        Returns:
+            dict: 健康分、握手耗时、成功/失败/断开计数
+        """
+        return {
+            "score": round(self.score, 3),
+            "connect_ms": (
+                round(self.connect_ms, 1) if self.connect_ms is not None else None
+            ),
+            "successes": self.successes,
+            "failures": self.failures,
+            "drops": self.drops,
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class StandbyConnection:
+    """
+    预热备用连接
+
+    后台保持一条已完成 TCP/TLS/WebSocket 握手、尚未发送 hello 的连接：
+    - 活动连接断开或首次唤醒时直接取用，只需一次 hello 往返
+    - 超过最大存活时间（避免被服务端当作空闲连接关闭）或已断开时自动替换
+    - 建连失败按退避重试；健康分过低时暂停预热，避免网络差时反复占用资源
+    """
+
+    def __init__(
+        self,
+        open_connection: Callable[[], Awaitable[Any]],
+        health: ConnectionHealth,
+        max_age: float = 50.0,
+        min_score: float = 0.3,
+        backoff: Optional[ReconnectBackoff] = None,
+    ):
+        """初始化备用连接.
+
+        Args:
+            open_connection: 建立一条新连接（完成握手）的协程函数
+            health: 与主连接共享的健康评分
+            max_age: 备用连接最大存活时间（秒）
+            min_score: 健康分低于该值时暂停预热
+            backoff: 建连失败时的退避策略
+        """
+        self._open_connection = open_connection
+        self._health = health
+        self.max_age = max_age
+        self.min_score = min_score
+        self._backoff = backoff or ReconnectBackoff(1.0, 60.0)
+        self._connection = None
+        self._created_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.taken = 0
+        self.refreshed = 0
+
+    def start(self):
+        """
+        启动（或唤醒）后台预热任务（需在事件循环中调用）.
+        """
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="ws:standby")
+        else:
+            self._wakeup.set()
+
+    async def stop(self):
+        """
+        停止预热并关闭备用连接.
+        """
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+        await self._discard()
+
+    def _usable(self) -> bool:
+        connection = self._connection
+        return (
+            connection is not None
+            and connection.close_code is None
+            and time.monotonic() - self._created_at < self.max_age
+        )
+
+    def take(self):
+        """取出可用的备用连接（取出后后台立即预热下一条）.
+
+        Returns:
+            已握手的连接，无可用连接时返回 None
+        """
+        if not self._usable():
+            return None
+        connection, self._connection = self._connection, None
+        self.taken += 1
+        if self._task is not None and not self._task.done():
+            self._wakeup.set()
+        return connection
+
+    async def _discard(self):
+        connection, self._connection = self._connection, None
+        if connection is not None and connection.close_code is None:
+            try:
+                await connection.close()
+            except Exception as e:
+                logger.debug(f"关闭备用连接失败: {e}")
+
+    async def _run(self):
+        """
+        预热循环：缺少可用备用连接时建立新连接，否则等待其过期或断开.
+        """
+        try:
+            while True:
+                if self._usable():
+                    remaining = self.max_age - (time.monotonic() - self._created_at)
+                    self._wakeup.clear()
+                    closed = asyncio.ensure_future(self._connection.wait_closed())
+                    woken = asyncio.ensure_future(self._wakeup.wait())
+                    try:
+                        await asyncio.wait(
+                            {closed, woken},
+                            timeout=max(0.1, remaining),
+                            return_when=asyncio.FIRST_COMPLETED,
+                        )
+                    finally:
+                        closed.cancel()
+                        woken.cancel()
+                    if self._connection is not None and not self._usable():
+                        self.refreshed += 1
+                        await self._discard()
+                    continue
+
+                await self._discard()
+                if self._health.score < self.min_score:
+                    # 网络不稳定时不预热，等主连接恢复后再唤醒
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+
+                start = time.monotonic()
+                try:
+                    connection = await self._open_connection()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._health.record_failure()
+                    delay = self._backoff.next_delay(self._health.score)
+                    logger.debug(f"预热备用连接失败: {e}，{delay:.1f}秒后重试")
+                    await asyncio.sleep(delay)
+                    continue
+
+                self._health.record_success(time.monotonic() - start)
+                self._backoff.reset()
+                self._connection = connection
+                self._created_at = time.monotonic()
+                logger.debug(
+                    f"备用连接已就绪，握手耗时 {(self._created_at - start) * 1000:.0f}ms"
+                )
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"备用连接预热任务异常: {e}", exc_info=True)
+
+    def snapshot(self) -> dict:
+        """获取备用连接状态.
+
+        Returns:
+            dict: 是否可用、已存活时间、取用次数和过期替换次数
+        """
+        ready = self._usable()
+        return {
+            "ready": ready,
+            "age_s": (
+                round(time.monotonic() - self._created_at, 1) if ready else None
+            ),
+            "taken": self.taken,
+            "refreshed": self.refreshed,
+        }
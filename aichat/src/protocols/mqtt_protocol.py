@@ -1,9 +1,7 @@
 import asyncio
-import json
 import socket
-import threading
 import time
-from typing import Tuple
+from typing import List, Tuple
 
 import paho.mqtt.client as mqtt
 from cryptography.hazmat.backends import default_backend
@@ -11,6 +9,16 @@ from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 
 from src.constants.constants import AudioConfig
 from src.protocols.protocol import Protocol
+from src.protocols.udp_audio import (
+    NONCE_SIZE,
+    MmsgSender,
+    ReorderWindow,
+    UdpAudioCipher,
+    UdpAudioProtocol,
+    flush_packets,
+    packet_sequence,
+)
+from src.utils import json_codec
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
@@ -24,8 +32,7 @@ class MqttProtocol(Protocol):
         self.loop = loop
         self.config = ConfigManager.get_instance()
         self.mqtt_client = None
-        self.udp_socket = None
-        self.udp_thread = None
+        self.udp_transport = None
         self.udp_running = False
         self.connected = False
 
@@ -55,6 +62,26 @@ class MqttProtocol(Protocol):
         self.local_sequence = 0
         self.remote_sequence = 0
 
+        # UDP音频热路径：会话级加解密（预分配包缓冲）和可选的 sendmmsg 批量发送
+        audio_options = self.config.get_config("AUDIO_OPTIONS", {}) or {}
+        self._udp_batch_slots = max(1, int(audio_options.get("UPLINK_MAX_BATCH", 5)))
+        self._udp_use_mmsg = bool(audio_options.get("UDP_SENDMMSG", False))
+        self._udp_cipher = None
+        self._udp_mmsg = None
+        self._udp_packets: List[memoryview] = []
+
+        # UDP接收：序列号校验 + 小窗口重排，解密后的帧按批交付音频管线
+        self._udp_reorder_window = int(audio_options.get("UDP_REORDER_WINDOW", 3))
+        self._udp_reorder_hold = audio_options.get("UDP_REORDER_HOLD_MS", 60) / 1000
+        self._udp_rx_batch_interval = audio_options.get("UDP_RX_BATCH_MS", 20) / 1000
+        self._udp_window = ReorderWindow(self._udp_reorder_window)
+        self._udp_rx_ready: List[Tuple[int, bytes]] = []
+        self._udp_rx_handle = None
+        self._udp_hold_handle = None
+        self._udp_rx_last_flush = 0.0
+        self._udp_rx_batches = 0
+        self._udp_rx_invalid = 0
+
         # 事件
         self.server_hello_event = asyncio.Event()
 
@@ -199,8 +226,8 @@ class MqttProtocol(Protocol):
         def on_message_callback(client, userdata, msg):
             try:
                 self._last_activity_time = time.time()  # 更新活动时间
-                payload = msg.payload.decode("utf-8")
-                self._handle_mqtt_message(payload)
+                # JSON 负载直接按字节解码，不先转成字符串
+                self._handle_mqtt_message(msg.payload)
             except Exception as e:
                 logger.error(f"处理MQTT消息时出错: {e}")
 
@@ -228,7 +255,7 @@ class MqttProtocol(Protocol):
                         lambda: self._on_connection_state_changed(False, reason)
                     )
 
-                # 停止UDP接收线程
+                # 关闭UDP音频通道
                 self._stop_udp_receiver()
 
                 # 只有在异常断开且启用自动重连时才尝试重连
@@ -321,7 +348,7 @@ class MqttProtocol(Protocol):
             }
 
             # 发送消息并等待响应
-            if not await self.send_text(json.dumps(hello_message)):
+            if not await self.send_text(json_codec.dumps(hello_message)):
                 logger.error("发送hello消息失败")
                 return False
 
@@ -333,23 +360,9 @@ class MqttProtocol(Protocol):
                     await self._on_network_error("等待响应超时")
                 return False
 
-            # 创建UDP套接字
+            # 创建UDP音频通道
             try:
-                if self.udp_socket:
-                    self.udp_socket.close()
-
-                self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-                self.udp_socket.settimeout(0.5)
-
-                # 启动UDP接收线程
-                if self.udp_thread and self.udp_thread.is_alive():
-                    self.udp_running = False
-                    self.udp_thread.join(1.0)
-
-                self.udp_running = True
-                self.udp_thread = threading.Thread(target=self._udp_receive_thread)
-                self.udp_thread.daemon = True
-                self.udp_thread.start()
+                await self._open_udp_channel()
 
                 self.connected = True
                 self._reconnect_attempts = 0  # 重置重连计数
@@ -376,7 +389,7 @@ class MqttProtocol(Protocol):
         处理MQTT消息.
         """
         try:
-            data = json.loads(payload)
+            data = json_codec.loads(payload)
             msg_type = data.get("type")
 
             if msg_type == "goodbye":
@@ -439,76 +452,185 @@ class MqttProtocol(Protocol):
                             self._on_incoming_json(json_data)
 
                     self.loop.call_soon_threadsafe(process_json)
-        except json.JSONDecodeError:
+        except json_codec.JSONDecodeError:
             logger.error(f"无效的JSON数据: {payload}")
         except Exception as e:
             logger.error(f"处理MQTT消息时出错: {e}")
 
-    def _udp_receive_thread(self):
-        """UDP接收线程.
+    async def _open_udp_channel(self):
+        """创建UDP音频通道.
 
-        参考 audio_player.py 的实现方式
+        密钥和nonce在此解码一次；套接字交给asyncio数据报传输，
+        发送不阻塞事件循环，收包回调直接在事件循环线程执行
         """
-        logger.info(
-            f"UDP接收线程已启动，监听来自 {self.udp_server}:{self.udp_port} 的数据"
+        self._close_udp_channel()
+
+        self._udp_window = ReorderWindow(self._udp_reorder_window)
+        self._udp_cipher = UdpAudioCipher(
+            self.aes_key, self.aes_nonce, slots=self._udp_batch_slots
+        )
+        self._udp_mmsg = (
+            MmsgSender(self._udp_cipher.slot_addresses)
+            if self._udp_use_mmsg and MmsgSender.is_available()
+            else None
         )
 
+        transport, _ = await self.loop.create_datagram_endpoint(
+            lambda: UdpAudioProtocol(
+                self._on_udp_datagram, self._on_udp_connection_lost
+            ),
+            remote_addr=(self.udp_server, self.udp_port),
+            family=socket.AF_INET,
+        )
+        self.udp_transport = transport
         self.udp_running = True
-        debug_counter = 0
+        logger.info(
+            f"UDP音频通道已建立: {self.udp_server}:{self.udp_port}"
+            f"{'（sendmmsg批量发送）' if self._udp_mmsg else ''}"
+        )
 
-        while self.udp_running:
-            try:
-                data, addr = self.udp_socket.recvfrom(4096)
-                debug_counter += 1
+    def _on_udp_datagram(self, data: bytes):
+        """处理收到的UDP音频数据包（事件循环线程）.
 
-                try:
-                    # 验证数据包
-                    if len(data) < 16:  # 至少需要16字节的nonce
-                        logger.error(f"无效的音频数据包大小: {len(data)}")
-                        continue
-
-                    # 分离nonce和加密数据
-                    received_nonce = data[:16]
-                    encrypted_audio = data[16:]
-
-                    # 使用AES-CTR解密
-                    decrypted = self.aes_ctr_decrypt(
-                        bytes.fromhex(self.aes_key), received_nonce, encrypted_audio
-                    )
+        只做序列号校验和重排，解密与交付合并到批量回调中
+        """
+        cipher = self._udp_cipher
+        if len(data) < NONCE_SIZE or (  # 至少需要16字节的nonce
+            cipher is not None and len(data) - NONCE_SIZE > cipher.max_payload
+        ):
+            self._udp_rx_invalid += 1
+            logger.debug(f"无效的音频数据包大小: {len(data)}")
+            return
+
+        sequence = packet_sequence(data)
+        window = self._udp_window
+        window.push(sequence, data, self._udp_rx_ready)
+        self.remote_sequence = sequence
+
+        if self._udp_rx_ready:
+            self._schedule_udp_delivery()
+        if len(window):
+            # 有缺口：超时后放弃等待
+            if self._udp_hold_handle is None:
+                self._udp_hold_handle = self.loop.call_later(
+                    self._udp_reorder_hold, self._on_udp_hold_timeout
+                )
+        elif self._udp_hold_handle is not None:
+            self._udp_hold_handle.cancel()
+            self._udp_hold_handle = None
 
-                    # 调试信息
-                    if debug_counter % 100 == 0:
-                        logger.debug(
-                            f"已解密音频数据包 #{debug_counter}, 大小: {len(decrypted)} 字节"
-                        )
+    def _on_udp_hold_timeout(self):
+        """
+        重排等待超时：跳过缺口，交付已暂存的包.
+        """
+        self._udp_hold_handle = None
+        if self._udp_window.flush(self._udp_rx_ready):
+            logger.debug(f"UDP音频丢包，累计 {self._udp_window.lost}")
+        if self._udp_rx_ready:
+            self._schedule_udp_delivery()
 
-                    # 处理解密后的音频数据
-                    if self._on_incoming_audio:
+    def _schedule_udp_delivery(self):
+        """安排一次批量交付.
 
-                        def process_audio(audio_data=decrypted):
-                            if asyncio.iscoroutinefunction(self._on_incoming_audio):
-                                coro = self._on_incoming_audio(audio_data)
-                                if coro is not None:
-                                    asyncio.create_task(coro)
-                            else:
-                                self._on_incoming_audio(audio_data)
+        距上次交付已超过批量间隔时在本轮事件循环立即交付（不增加首包延迟），
+        否则合并到间隔结束时一起交付
+        """
+        if self._udp_rx_handle is not None:
+            return
+        delay = self._udp_rx_last_flush + self._udp_rx_batch_interval - self.loop.time()
+        if delay <= 0:
+            self._udp_rx_handle = self.loop.call_soon(self._deliver_udp_audio)
+        else:
+            self._udp_rx_handle = self.loop.call_later(delay, self._deliver_udp_audio)
 
-                        self.loop.call_soon_threadsafe(process_audio)
+    def _deliver_udp_audio(self):
+        """
+        解密就绪的包并批量交付音频管线.
+        """
+        self._udp_rx_handle = None
+        self._udp_rx_last_flush = self.loop.time()
+        ready = self._udp_rx_ready
+        cipher = self._udp_cipher
+        if not ready:
+            return
+        if cipher is None:
+            ready.clear()
+            return
+
+        frames = []
+        for sequence, packet in ready:
+            # 单个包解密失败只丢弃该包，不影响同批其他包
+            try:
+                frames.append((sequence, cipher.open(packet)))
+            except Exception as e:
+                self._udp_rx_invalid += 1
+                logger.error(f"处理音频数据包错误: {e}")
+        ready.clear()
+        if not frames:
+            return
+        self._udp_rx_batches += 1
+
+        if self._on_incoming_audio_batch:
+            self._dispatch_audio_callback(self._on_incoming_audio_batch, frames)
+        elif self._on_incoming_audio:
+            for _, audio_data in frames:
+                self._dispatch_audio_callback(self._on_incoming_audio, audio_data)
+
+    @staticmethod
+    def _dispatch_audio_callback(callback, payload):
+        """
+        调用音频回调（协程回调创建任务执行）.
+        """
+        if asyncio.iscoroutinefunction(callback):
+            coro = callback(payload)
+            if coro is not None:
+                asyncio.create_task(coro)
+        else:
+            callback(payload)
 
-                except Exception as e:
-                    logger.error(f"处理音频数据包错误: {e}")
-                    continue
+    def get_udp_receive_stats(self) -> dict:
+        """获取UDP音频接收统计.
 
-            except socket.timeout:
-                # 超时是正常的，继续循环
-                pass
-            except Exception as e:
-                logger.error(f"UDP接收线程错误: {e}")
-                if not self.udp_running:
-                    break
-                time.sleep(0.1)  # 避免在错误情况下过度消耗CPU
+        Returns:
+            dict: 序列号校验与重排计数（乱序/重复/迟到/丢失）、交付批次和平均批大小
+        """
+        stats = self._udp_window.get_stats()
+        stats["invalid"] = self._udp_rx_invalid
+        stats["batches"] = self._udp_rx_batches
+        stats["avg_batch"] = round(stats["delivered"] / max(1, self._udp_rx_batches), 2)
+        return stats
 
-        logger.info("UDP接收线程已停止")
+    def _on_udp_connection_lost(self, transport, exc):
+        """
+        UDP传输关闭回调.
+        """
+        if transport is not self.udp_transport:
+            # 已被替换或主动关闭的旧传输
+            return
+        self.udp_running = False
+        self.udp_transport = None
+        if exc:
+            logger.warning(f"UDP音频通道异常关闭: {exc}")
+
+    def _close_udp_channel(self):
+        """
+        关闭UDP音频通道并释放会话加解密状态.
+        """
+        self.udp_running = False
+        transport, self.udp_transport = self.udp_transport, None
+        if transport is not None:
+            try:
+                transport.close()
+            except Exception as e:
+                logger.error(f"关闭UDP传输失败: {e}")
+        self._udp_cipher = None
+        self._udp_mmsg = None
+        for handle in (self._udp_rx_handle, self._udp_hold_handle):
+            if handle is not None:
+                handle.cancel()
+        self._udp_rx_handle = None
+        self._udp_hold_handle = None
+        self._udp_rx_ready.clear()
 
     async def send_text(self, message):
         """
@@ -531,47 +653,57 @@ class MqttProtocol(Protocol):
     async def send_audio(self, audio_data):
         """发送音频数据.
 
-        参考 audio_sender.py 的实现方式
+        包头（nonce）格式: 前缀 (2字节) + 长度 (2字节) + 原始nonce (8字节) + 序列号 (4字节)，
+        在预分配的包缓冲区中原地改写后加密，经数据报传输非阻塞发送
         """
-        if not self.udp_socket or not self.udp_server or not self.udp_port:
+        transport = self.udp_transport
+        cipher = self._udp_cipher
+        if transport is None or cipher is None:
             logger.error("UDP通道未初始化")
             return False
 
         try:
-            # 生成新的nonce (类似于 audio_sender.py 中的实现)
-            # 格式: 0x01 (1字节) + 0x00 (3字节) + 长度 (2字节) + 原始nonce (8字节) + 序列号 (8字节)
-            self.local_sequence = (self.local_sequence + 1) & 0xFFFFFFFF
-            new_nonce = (
-                self.aes_nonce[:4]  # 固定前缀
-                + format(len(audio_data), "04x")  # 数据长度
-                + self.aes_nonce[8:24]  # 原始nonce
-                + format(self.local_sequence, "08x")  # 序列号
-            )
-
-            encrypt_encoded_data = self.aes_ctr_encrypt(
-                bytes.fromhex(self.aes_key), bytes.fromhex(new_nonce), bytes(audio_data)
-            )
+            # sendto 会立即发送或拷贝进传输缓冲，槽位可直接复用
+            transport.sendto(cipher.seal(audio_data))
+            self.local_sequence = cipher.sequence
+            return True
+        except Exception as e:
+            logger.error(f"发送音频数据失败: {e}")
+            if self._on_network_error:
+                asyncio.create_task(self._on_network_error(f"发送音频数据失败: {e}"))
+            return False
 
-            # 拼接nonce和密文
-            packet = bytes.fromhex(new_nonce) + encrypt_encoded_data
+    async def send_audio_batch(self, frames):
+        """批量发送音频帧.
 
-            # 发送数据包
-            self.udp_socket.sendto(packet, (self.udp_server, self.udp_port))
+        每组最多占用全部发送槽位，支持时一次 sendmmsg 系统调用发出
 
-            # 每发送10个包打印一次日志
-            if self.local_sequence % 10 == 0:
-                logger.info(
-                    f"已发送音频数据包，序列号: {self.local_sequence}，目标: "
-                    f"{self.udp_server}:{self.udp_port}"
-                )
+        Args:
+            frames: 编码后的音频帧列表
+        """
+        transport = self.udp_transport
+        cipher = self._udp_cipher
+        if transport is None or cipher is None:
+            logger.error("UDP通道未初始化")
+            return False
 
-            self.local_sequence += 1
+        packets = self._udp_packets
+        slots = cipher.slots
+        try:
+            for offset in range(0, len(frames), slots):
+                packets.clear()
+                for slot, data in enumerate(frames[offset : offset + slots]):
+                    packets.append(cipher.seal(data, slot))
+                flush_packets(transport, packets, self._udp_mmsg)
+            self.local_sequence = cipher.sequence
             return True
         except Exception as e:
             logger.error(f"发送音频数据失败: {e}")
             if self._on_network_error:
                 asyncio.create_task(self._on_network_error(f"发送音频数据失败: {e}"))
             return False
+        finally:
+            packets.clear()
 
     async def open_audio_channel(self):
         """
@@ -591,7 +723,7 @@ class MqttProtocol(Protocol):
             # 如果有会话ID，发送goodbye消息
             if self.session_id:
                 goodbye_msg = {"type": "goodbye", "session_id": self.session_id}
-                await self.send_text(json.dumps(goodbye_msg))
+                await self.send_text(json_codec.dumps(goodbye_msg))
 
             # 处理goodbye
             await self._handle_goodbye()
@@ -617,7 +749,7 @@ class MqttProtocol(Protocol):
             return False
 
         # 检查UDP连接状态
-        return self.udp_socket is not None and self.udp_running
+        return self.udp_transport is not None and self.udp_running
 
     def aes_ctr_encrypt(self, key, nonce, plaintext):
         """AES-CTR模式加密函数
@@ -655,20 +787,9 @@ class MqttProtocol(Protocol):
         处理goodbye消息.
         """
         try:
-            # 停止UDP接收线程
-            if self.udp_thread and self.udp_thread.is_alive():
-                self.udp_running = False
-                self.udp_thread.join(1.0)
-                self.udp_thread = None
-            logger.info("UDP接收线程已停止")
-
-            # 关闭UDP套接字
-            if self.udp_socket:
-                try:
-                    self.udp_socket.close()
-                except Exception as e:
-                    logger.error(f"关闭UDP套接字失败: {e}")
-                self.udp_socket = None
+            # 关闭UDP音频通道
+            self._close_udp_channel()
+            logger.info("UDP音频通道已关闭")
 
             # 停止MQTT客户端
             if self.mqtt_client:
@@ -699,26 +820,15 @@ class MqttProtocol(Protocol):
 
     def _stop_udp_receiver(self):
         """
-        停止UDP接收线程和关闭UDP套接字.
+        关闭UDP音频通道（可在MQTT网络线程调用）.
         """
-        # 关闭UDP接收线程
-        if (
-            hasattr(self, "udp_thread")
-            and self.udp_thread
-            and self.udp_thread.is_alive()
-        ):
-            self.udp_running = False
-            try:
-                self.udp_thread.join(1.0)
-            except RuntimeError:
-                pass  # 处理线程已经终止的情况
-
-        # 关闭UDP套接字
-        if hasattr(self, "udp_socket") and self.udp_socket:
-            try:
-                self.udp_socket.close()
-            except Exception as e:
-                logger.error(f"关闭UDP套接字失败: {e}")
+        if not hasattr(self, "udp_transport") or self.udp_transport is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._close_udp_channel)
+        except RuntimeError:
+            # 事件循环已关闭
+            self._close_udp_channel()
 
     def __del__(self):
         """
@@ -905,6 +1015,7 @@ class MqttProtocol(Protocol):
                 f"{self.udp_server}:{self.udp_port}" if self.udp_server else None
             ),
             "session_id": self.session_id,
+            "udp_receive": self.get_udp_receive_stats(),
         }
 
     async def _cleanup_connection(self):
@@ -921,8 +1032,8 @@ class MqttProtocol(Protocol):
             except asyncio.CancelledError:
                 pass
 
-        # 停止UDP接收线程
-        self._stop_udp_receiver()
+        # 关闭UDP音频通道
+        self._close_udp_channel()
 
         # 停止MQTT客户端
         if self.mqtt_client:
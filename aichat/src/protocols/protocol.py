@@ -1,7 +1,7 @@
-import json
-
 from src.constants.constants import AbortReason, ListeningMode
+from src.utils import json_codec
 from src.utils.logging_config import get_logger
+from src.utils.turn_tracer import TurnTracer
 
 logger = get_logger(__name__)
 
@@ -12,6 +12,7 @@ class Protocol:
         # 初始化回调函数为None
         self._on_incoming_json = None
         self._on_incoming_audio = None
+        self._on_incoming_audio_batch = None
         self._on_audio_channel_opened = None
         self._on_audio_channel_closed = None
         self._on_network_error = None
@@ -31,6 +32,14 @@ class Protocol:
         """
         self._on_incoming_audio = callback
 
+    def on_incoming_audio_batch(self, callback):
+        """设置批量音频数据接收回调函数（支持时优先于逐帧回调）
+
+        Args:
+            callback: 回调函数，接收参数 [(sequence: int, data: bytes), ...]
+        """
+        self._on_incoming_audio_batch = callback
+
     def on_audio_channel_opened(self, callback):
         """
         设置音频通道打开回调函数.
@@ -77,12 +86,27 @@ class Protocol:
         """
         raise NotImplementedError("send_audio方法必须由子类实现")
 
+    async def send_audio_batch(self, frames):
+        """按顺序发送一组音频帧（默认逐帧发送，子类可合并写入）
+
+        Args:
+            frames: 编码后的音频帧列表
+        """
+        for data in frames:
+            await self.send_audio(data)
+
     def is_audio_channel_opened(self) -> bool:
         """
         检查音频通道是否打开的抽象方法，需要在子类中实现.
         """
         raise NotImplementedError("is_audio_channel_opened方法必须由子类实现")
 
+    def standby_ready(self) -> bool:
+        """
+        是否有可立即切换的备用连接（默认不支持）.
+        """
+        return False
+
     async def open_audio_channel(self) -> bool:
         """
         打开音频通道的抽象方法，需要在子类中实现.
@@ -102,7 +126,7 @@ class Protocol:
         message = {"session_id": self.session_id, "type": "abort"}
         if reason == AbortReason.WAKE_WORD_DETECTED:
             message["reason"] = "wake_word_detected"
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
 
     async def send_wake_word_detected(self, wake_word):
         """
@@ -114,7 +138,7 @@ class Protocol:
             "state": "detect",
             "text": wake_word,
         }
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
 
     async def send_start_listening(self, mode):
         """
@@ -131,14 +155,15 @@ class Protocol:
             "state": "start",
             "mode": mode_map[mode],
         }
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
+        TurnTracer.get_instance().mark("listen")
 
     async def send_stop_listening(self):
         """
         发送停止监听的消息.
         """
         message = {"session_id": self.session_id, "type": "listen", "state": "stop"}
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
 
     async def send_iot_descriptors(self, descriptors):
         """
@@ -147,7 +172,7 @@ class Protocol:
         try:
             # 解析描述符数据
             if isinstance(descriptors, str):
-                descriptors_data = json.loads(descriptors)
+                descriptors_data = json_codec.loads(descriptors)
             else:
                 descriptors_data = descriptors
 
@@ -170,7 +195,7 @@ class Protocol:
                 }
 
                 try:
-                    await self.send_text(json.dumps(message))
+                    await self.send_text(json_codec.dumps(message))
                 except Exception as e:
                     logger.error(
                         f"Failed to send JSON message for IoT descriptor "
@@ -178,7 +203,7 @@ class Protocol:
                     )
                     continue
 
-        except json.JSONDecodeError as e:
+        except json_codec.JSONDecodeError as e:
             logger.error(f"Failed to parse IoT descriptors: {e}")
             return
 
@@ -187,7 +212,7 @@ class Protocol:
         发送物联网设备状态信息.
         """
         if isinstance(states, str):
-            states_data = json.loads(states)
+            states_data = json_codec.loads(states)
         else:
             states_data = states
 
@@ -197,14 +222,14 @@ class Protocol:
             "update": True,
             "states": states_data,
         }
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
 
     async def send_mcp_message(self, payload):
         """
         发送MCP消息.
         """
         if isinstance(payload, str):
-            payload_data = json.loads(payload)
+            payload_data = json_codec.loads(payload)
         else:
             payload_data = payload
 
@@ -214,4 +239,4 @@ class Protocol:
             "payload": payload_data,
         }
 
-        await self.send_text(json.dumps(message))
+        await self.send_text(json_codec.dumps(message))
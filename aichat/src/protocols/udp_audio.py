@@ -0,0 +1,508 @@
+import asyncio
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 数据包头即 16 字节 AES-CTR 初始计数器:
+# [0:2] 固定前缀 | [2:4] 负载长度 | [4:12] 会话 nonce | [12:16] 序列号（大端）
+NONCE_SIZE = 16
+# 单个音频负载的最大字节数（不超过常见 MTU）
+MAX_PAYLOAD_BYTES = 1400
+
+_BLOCK = 16
+_MAX_BLOCKS = (MAX_PAYLOAD_BYTES + _BLOCK - 1) // _BLOCK
+_U64_MASK = (1 << 64) - 1
+_U128_MASK = (1 << 128) - 1
+_LENGTH = struct.Struct(">H")
+_SEQUENCE = struct.Struct(">I")
+_COUNTER = struct.Struct(">QQ")
+
+
+class UdpAudioCipher:
+    """
+    UDP 音频会话加解密（AES-CTR）
+
+    - 密钥和 nonce 在会话建立时解码一次，AES 上下文（ECB 模式）整个会话复用；
+      CTR 的密钥流由计数器块批量经 ECB 加密得到，逐包不再创建 Cipher 对象
+    - 发送包写入预分配的槽位，只原地改写包头中的长度和序列号
+    - 多个槽位供批量发送时同时持有多个待发送的包
+    """
+
+    def __init__(
+        self,
+        key_hex: str,
+        nonce_hex: str,
+        slots: int = 1,
+        max_payload: int = MAX_PAYLOAD_BYTES,
+    ):
+        """初始化会话加解密.
+
+        Args:
+            key_hex: 服务器下发的 AES 密钥（十六进制）
+            nonce_hex: 服务器下发的 16 字节 nonce（十六进制）
+            slots: 预分配的发送包槽位数
+            max_payload: 单包负载最大字节数
+        """
+        key = bytes.fromhex(key_hex)
+        nonce = bytes.fromhex(nonce_hex)
+        if len(nonce) != NONCE_SIZE:
+            raise ValueError(f"nonce 长度应为 {NONCE_SIZE} 字节: {len(nonce)}")
+
+        self._ecb = Cipher(
+            algorithms.AES(key), modes.ECB(), backend=default_backend()
+        ).encryptor()
+        self.max_payload = min(max_payload, _MAX_BLOCKS * _BLOCK)
+        self.sequence = 0
+
+        # 发送包槽位：包头预填会话 nonce
+        self._slots = []
+        self._slot_views = []
+        self._slot_arrays = []
+        for _ in range(max(1, slots)):
+            packet = bytearray(NONCE_SIZE + self.max_payload)
+            packet[:NONCE_SIZE] = nonce
+            self._slots.append(packet)
+            self._slot_views.append(memoryview(packet))
+            self._slot_arrays.append(np.frombuffer(packet, dtype=np.uint8))
+        self.slot_addresses = [
+            ctypes.addressof((ctypes.c_char * len(packet)).from_buffer(packet))
+            for packet in self._slots
+        ]
+
+        # 计数器块（大端 u64 对）和密钥流缓冲区
+        blocks = (self.max_payload + _BLOCK - 1) // _BLOCK
+        self._counters = np.zeros((blocks, 2), dtype=">u8")
+        self._counter_bytes = memoryview(self._counters).cast("B")
+        self._offsets = np.arange(blocks, dtype=np.uint64)
+        # update_into 要求输出缓冲区多留 block_size - 1 字节
+        self._keystream = bytearray(blocks * _BLOCK + _BLOCK - 1)
+        self._keystream_array = np.frombuffer(self._keystream, dtype=np.uint8)
+
+    @property
+    def slots(self) -> int:
+        """
+        发送包槽位数.
+        """
+        return len(self._slots)
+
+    def _fill_keystream(self, header, size: int) -> np.ndarray:
+        """按包头计数器生成 size 字节的密钥流.
+
+        Args:
+            header: 16 字节包头（初始计数器）
+            size: 需要的密钥流长度
+
+        Returns:
+            密钥流数组视图（下次调用前有效）
+        """
+        blocks = (size + _BLOCK - 1) >> 4
+        high, low = _COUNTER.unpack_from(header, 0)
+        counters = self._counters
+        if low + blocks <= _U64_MASK:
+            counters[:blocks, 0] = high
+            counters[:blocks, 1] = self._offsets[:blocks] + np.uint64(low)
+        else:
+            # 低 64 位即将溢出（极少见），逐块按 128 位计数器进位
+            base = (high << 64) | low
+            for index in range(blocks):
+                counter = (base + index) & _U128_MASK
+                counters[index, 0] = counter >> 64
+                counters[index, 1] = counter & _U64_MASK
+        self._ecb.update_into(self._counter_bytes[: blocks * _BLOCK], self._keystream)
+        return self._keystream_array[:size]
+
+    def seal(self, payload, slot: int = 0) -> memoryview:
+        """加密一帧并写入发送槽位（序列号自增）.
+
+        Args:
+            payload: 音频负载（bytes / memoryview）
+            slot: 槽位序号
+
+        Returns:
+            完整数据包视图（包头 + 密文），在该槽位下次 seal 前有效
+        """
+        size = len(payload)
+        if size > self.max_payload:
+            raise ValueError(f"音频负载过大: {size} > {self.max_payload}")
+
+        self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+        packet = self._slots[slot]
+        _LENGTH.pack_into(packet, 2, size)
+        _SEQUENCE.pack_into(packet, 12, self.sequence)
+        keystream = self._fill_keystream(packet, size)
+        np.bitwise_xor(
+            np.frombuffer(payload, dtype=np.uint8),
+            keystream,
+            out=self._slot_arrays[slot][NONCE_SIZE : NONCE_SIZE + size],
+        )
+        return self._slot_views[slot][: NONCE_SIZE + size]
+
+    def open(self, packet: bytes) -> bytes:
+        """解密收到的数据包.
+
+        Args:
+            packet: 包头 + 密文
+
+        Returns:
+            明文音频负载
+        """
+        size = len(packet) - NONCE_SIZE
+        if size <= 0:
+            return b""
+        if size > self.max_payload:
+            raise ValueError(f"音频数据包过大: {size} > {self.max_payload}")
+        keystream = self._fill_keystream(packet, size)
+        return np.bitwise_xor(
+            np.frombuffer(packet, dtype=np.uint8, offset=NONCE_SIZE), keystream
+        ).tobytes()
+
+
+def packet_sequence(packet) -> int:
+    """
+    读取数据包头中的序列号.
+    """
+    return _SEQUENCE.unpack_from(packet, 12)[0]
+
+
+class ReorderWindow:
+    """
+    接收端序列号校验与小窗口重排（单线程使用）
+
+    - 按序到达的包立即交付；乱序包暂存，缺口补齐后按序交付
+    - 暂存超过窗口大小（或调用方超时 flush）时放弃缺口，计为丢包
+    - 早于交付进度的包：曾判为丢失的计为迟到，否则计为重复
+    - 序列号为 32 位并按回绕比较，跳变过大时视为发送端重置并重新同步
+    """
+
+    _SEQ_MASK = 0xFFFFFFFF
+    _HALF_RANGE = 0x80000000
+
+    def __init__(self, window: int = 3, max_gap: int = 256):
+        """初始化重排窗口.
+
+        Args:
+            window: 最多暂存的乱序包数，0 表示不重排（缺口立即判丢）
+            max_gap: 超过该跨度的序列号跳变视为重新同步，不计丢包
+        """
+        self.window = max(0, window)
+        self.max_gap = max(1, max_gap)
+        self._expected: Optional[int] = None
+        self._held = {}
+        self._lost_recent = set()
+
+        self.received = 0
+        self.delivered = 0
+        self.reordered = 0
+        self.duplicates = 0
+        self.late = 0
+        self.lost = 0
+        self.resyncs = 0
+
+    def __len__(self):
+        return len(self._held)
+
+    def _distance(self, sequence: int) -> int:
+        """
+        序列号相对交付进度的距离（回绕比较，负数表示更早）.
+        """
+        delta = (sequence - self._expected) & self._SEQ_MASK
+        return delta - (self._SEQ_MASK + 1) if delta >= self._HALF_RANGE else delta
+
+    def push(self, sequence: int, packet, out: list) -> bool:
+        """放入一个数据包.
+
+        Args:
+            sequence: 包头序列号
+            packet: 数据包（原样交付）
+            out: 按序可交付的 (序列号, 数据包) 追加到此列表
+
+        Returns:
+            True=已接收（交付或暂存）, False=重复/迟到被丢弃
+        """
+        self.received += 1
+        if self._expected is None:
+            self._expected = sequence
+
+        distance = self._distance(sequence)
+        if abs(distance) > self.max_gap:
+            # 发送端序列号重置或长时间中断
+            self._resync(sequence, out)
+            distance = 0
+        elif distance < 0:
+            if sequence in self._lost_recent:
+                self._lost_recent.discard(sequence)
+                self.late += 1
+            else:
+                self.duplicates += 1
+            return False
+
+        if distance == 0:
+            self._deliver(sequence, packet, out)
+            self._drain(out)
+            return True
+
+        if sequence in self._held:
+            self.duplicates += 1
+            return False
+        self._held[sequence] = packet
+        self.reordered += 1
+        if len(self._held) > self.window:
+            self._skip_gap(out)
+        return True
+
+    def flush(self, out: list) -> int:
+        """放弃所有缺口，按序交付全部暂存包（等待超时时调用）.
+
+        Returns:
+            判为丢失的包数
+        """
+        lost = self.lost
+        while self._held:
+            self._skip_gap(out)
+        return self.lost - lost
+
+    def reset(self):
+        """
+        丢弃暂存包并清空交付进度（保留统计）.
+        """
+        self._expected = None
+        self._held.clear()
+        self._lost_recent.clear()
+
+    def _deliver(self, sequence: int, packet, out: list):
+        out.append((sequence, packet))
+        self.delivered += 1
+        self._expected = (sequence + 1) & self._SEQ_MASK
+
+    def _drain(self, out: list):
+        """
+        交付暂存中已连续的包.
+        """
+        held = self._held
+        while self._expected in held:
+            sequence = self._expected
+            self._deliver(sequence, held.pop(sequence), out)
+
+    def _skip_gap(self, out: list):
+        """
+        跳过交付进度到最早暂存包之间的缺口.
+        """
+        first = min(self._held, key=self._distance)
+        gap = self._distance(first)
+        if len(self._lost_recent) > self.max_gap:
+            self._lost_recent.clear()
+        for offset in range(gap):
+            self._lost_recent.add((self._expected + offset) & self._SEQ_MASK)
+        self.lost += gap
+        self._expected = first
+        self._drain(out)
+
+    def _resync(self, sequence: int, out: list):
+        """
+        序列号跳变：交付暂存包后从新序列号重新开始.
+        """
+        self.resyncs += 1
+        self.flush(out)
+        self._lost_recent.clear()
+        self._expected = sequence
+
+    def get_stats(self) -> dict:
+        """获取接收统计.
+
+        Returns:
+            dict: 接收/交付/乱序/重复/迟到/丢失计数、重新同步次数和当前暂存数
+        """
+        return {
+            "received": self.received,
+            "delivered": self.delivered,
+            "reordered": self.reordered,
+            "duplicates": self.duplicates,
+            "late": self.late,
+            "lost": self.lost,
+            "resyncs": self.resyncs,
+            "held": len(self._held),
+        }
+
+
+class _IoVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IoVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+_MSG_DONTWAIT = 0x40
+_sendmmsg = None
+
+
+def _load_sendmmsg():
+    """
+    加载 libc 的 sendmmsg（仅 Linux，只执行一次）.
+    """
+    global _sendmmsg
+    if _sendmmsg is not None or not sys.platform.startswith("linux"):
+        return _sendmmsg
+    try:
+        libc_path = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(libc_path, use_errno=True)
+        function = libc.sendmmsg
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = [
+        ctypes.c_int,
+        ctypes.POINTER(_MMsgHdr),
+        ctypes.c_uint,
+        ctypes.c_int,
+    ]
+    function.restype = ctypes.c_int
+    _sendmmsg = function
+    return function
+
+
+class MmsgSender:
+    """
+    批量 UDP 发送：一次 sendmmsg 系统调用发出多个数据包.
+
+    仅支持 Linux，套接字需已 connect（不逐包携带目标地址）；
+    各消息固定指向预分配的发送槽位，发送时只填写长度
+    """
+
+    def __init__(self, addresses: Sequence[int]):
+        """初始化批量发送器.
+
+        Args:
+            addresses: 发送槽位的内存地址（如 UdpAudioCipher.slot_addresses）
+        """
+        self._function = _load_sendmmsg()
+        self.capacity = len(addresses)
+        self._iovecs = (_IoVec * self.capacity)()
+        self._messages = (_MMsgHdr * self.capacity)()
+        for index, address in enumerate(addresses):
+            self._iovecs[index].iov_base = address
+            header = self._messages[index].msg_hdr
+            header.msg_iov = ctypes.pointer(self._iovecs[index])
+            header.msg_iovlen = 1
+
+    @staticmethod
+    def is_available() -> bool:
+        """
+        检查当前平台是否支持 sendmmsg.
+        """
+        return _load_sendmmsg() is not None
+
+    def send(self, fd: int, packets: Sequence[memoryview]) -> int:
+        """非阻塞批量发送（第 i 个包须位于第 i 个槽位）.
+
+        Args:
+            fd: 已 connect 的 UDP 套接字描述符
+            packets: 各槽位待发送的数据包视图
+
+        Returns:
+            实际发出的包数（发送缓冲区满时可能少于请求数，0 表示需回退）
+        """
+        count = min(len(packets), self.capacity)
+        iovecs = self._iovecs
+        for index in range(count):
+            iovecs[index].iov_len = len(packets[index])
+        sent = self._function(fd, self._messages, count, _MSG_DONTWAIT)
+        if sent < 0:
+            error = ctypes.get_errno()
+            if error in (errno.EAGAIN, errno.ENOBUFS):  # 交给传输层缓冲
+                return 0
+            raise OSError(error, os.strerror(error))
+        return sent
+
+
+class UdpAudioProtocol(asyncio.DatagramProtocol):
+    """
+    UDP 音频通道的 asyncio 协议：收包回调在事件循环线程执行，发送走非阻塞传输.
+    """
+
+    def __init__(
+        self,
+        on_datagram: Callable[[bytes], None],
+        on_closed: Optional[
+            Callable[[asyncio.DatagramTransport, Optional[Exception]], None]
+        ] = None,
+    ):
+        """初始化协议.
+
+        Args:
+            on_datagram: 收到数据包时的回调
+            on_closed: 传输关闭时的回调，参数为 (传输, 异常)
+        """
+        self._on_datagram = on_datagram
+        self._on_closed = on_closed
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.send_errors = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        try:
+            self._on_datagram(data)
+        except Exception as e:
+            logger.error(f"处理音频数据包错误: {e}")
+
+    def error_received(self, exc: Exception):
+        # UDP 的 ICMP 错误（如端口不可达）不中断通道，只计数
+        self.send_errors += 1
+        logger.debug(f"UDP通道错误: {exc}")
+
+    def connection_lost(self, exc: Optional[Exception]):
+        transport, self.transport = self.transport, None
+        if self._on_closed:
+            self._on_closed(transport, exc)
+
+
+def flush_packets(
+    transport: asyncio.DatagramTransport,
+    packets: List[memoryview],
+    mmsg: Optional[MmsgSender] = None,
+) -> int:
+    """发送一组数据包（优先 sendmmsg，一次系统调用），剩余部分交给传输层.
+
+    Args:
+        transport: 已 connect 的 UDP 传输
+        packets: 数据包视图列表（按顺序，第 i 个包位于第 i 个发送槽位）
+        mmsg: 批量发送器，None 时逐包 sendto
+
+    Returns:
+        经 sendmmsg 发出的包数
+    """
+    sent = 0
+    # 传输层已有积压时直接排队，保证包序
+    backlog = transport.get_write_buffer_size()
+    if mmsg is not None and len(packets) > 1 and not backlog:
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            sent = mmsg.send(sock.fileno(), packets)
+    for packet in packets[sent:]:
+        transport.sendto(packet)
+    return sent
@@ -1,5 +1,4 @@
 import asyncio
-import json
 import socket
 import ssl
 import time
@@ -7,7 +6,13 @@ import time
 import websockets
 
 from src.constants.constants import AudioConfig
+from src.protocols.connection_manager import (
+    ConnectionHealth,
+    ReconnectBackoff,
+    StandbyConnection,
+)
 from src.protocols.protocol import Protocol
+from src.utils import json_codec
 from src.utils.config_manager import ConfigManager
 from src.utils.logging_config import get_logger
 
@@ -26,6 +31,7 @@ class WebsocketProtocol(Protocol):
         self.hello_received = None  # 初始化时先设为 None
         # 消息处理任务引用，便于在关闭时取消
         self._message_task = None
+        self._connection_loss_task = None
 
         # 连接健康状态监测
         self._last_ping_time = None
@@ -57,83 +63,54 @@ class WebsocketProtocol(Protocol):
             "Client-Id": client_id,
         }
 
-    async def connect(self) -> bool:
-        """
-        连接到WebSocket服务器.
+        # 连接管理：健康评分、带抖动的指数退避、预热备用连接
+        options = self.config.get_config("CONNECTION_OPTIONS", {}) or {}
+        self._health = ConnectionHealth()
+        self._backoff = ReconnectBackoff(
+            options.get("BACKOFF_BASE_S", 0.5), options.get("BACKOFF_MAX_S", 30.0)
+        )
+        self._standby = None
+        if options.get("STANDBY_ENABLED", True):
+            self._standby = StandbyConnection(
+                self._open_websocket,
+                self._health,
+                max_age=options.get("STANDBY_MAX_AGE_S", 50.0),
+                min_score=options.get("STANDBY_MIN_SCORE", 0.3),
+            )
+        self._network_ready = False
+        self._connected_at = None
+        self._last_connect_ms = None
+        self._last_connect_source = None
+
+    async def connect(self, allow_standby: bool = True) -> bool:
+        """连接到WebSocket服务器.
+
+        Args:
+            allow_standby: 是否允许取用预热的备用连接
         """
         if self._is_closing:
             logger.warning("连接正在关闭中，取消新的连接尝试")
             return False
 
         # Đợi network sẵn sàng (đặc biệt quan trọng khi boot)
-        await self._wait_for_network()
+        # 网络确认可用后不再检测，避免每次重连都阻塞在探测上
+        if not self._network_ready:
+            await self._wait_for_network()
 
+        connect_start = time.monotonic()
         try:
             # 在连接时创建 Event，确保在正确的事件循环中
             self.hello_received = asyncio.Event()
 
-            # 判断是否应该使用 SSL
-            current_ssl_context = None
-            if self.WEBSOCKET_URL.startswith("wss://"):
-                current_ssl_context = ssl_context
-
-            # Retry logic: thử kết nối tối đa 3 lần
-            max_retries = 3
-            retry_delay = 5  # Đợi 5 giây giữa các lần thử
-            
-            for attempt in range(1, max_retries + 1):
-                try:
-                    logger.info(f"Đang thử kết nối WebSocket (lần {attempt}/{max_retries})...")
-                    
-                    # 建立WebSocket连接 (兼容不同Python版本的写法)
-                    try:
-                        # 新的写法 (在Python 3.11+版本中)
-                        self.websocket = await asyncio.wait_for(
-                            websockets.connect(
-                                uri=self.WEBSOCKET_URL,
-                                ssl=current_ssl_context,
-                                additional_headers=self.HEADERS,
-                                ping_interval=20,  # 使用websockets自己的心跳，20秒间隔
-                                ping_timeout=20,  # ping超时20秒
-                                close_timeout=10,  # 关闭超时10秒
-                                max_size=10 * 1024 * 1024,  # 最大消息10MB
-                                compression=None,  # 禁用压缩以提高稳定性
-                            ),
-                            timeout=15.0  # Timeout 15 giây cho mỗi lần thử
-                        )
-                    except TypeError:
-                        # 旧的写法 (在较早的Python版本中)
-                        self.websocket = await asyncio.wait_for(
-                            websockets.connect(
-                                self.WEBSOCKET_URL,
-                                ssl=current_ssl_context,
-                                extra_headers=self.HEADERS,
-                                ping_interval=20,  # 使用websockets自己的心跳
-                                ping_timeout=20,  # ping超时20秒
-                                close_timeout=10,  # 关闭超时10秒
-                                max_size=10 * 1024 * 1024,  # 最大消息10MB
-                                compression=None,  # 禁用压缩
-                            ),
-                            timeout=15.0
-                        )
-                    
-                    # Kết nối thành công, break khỏi retry loop
-                    break
-                    
-                except asyncio.TimeoutError:
-                    logger.warning(f"Kết nối WebSocket timeout (lần {attempt}/{max_retries})")
-                    if attempt < max_retries:
-                        logger.info(f"Đợi {retry_delay} giây trước khi thử lại...")
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        raise
-                except Exception as e:
-                    logger.warning(f"Lỗi kết nối WebSocket (lần {attempt}/{max_retries}): {e}")
-                    if attempt < max_retries:
-                        logger.info(f"Đợi {retry_delay} giây trước khi thử lại...")
-                        await asyncio.sleep(retry_delay)
-                    else:
-                        raise
+            # 优先取用预热的备用连接（已完成握手，只差 hello）
+            standby = self._standby.take() if self._standby and allow_standby else None
+            if standby is not None:
+                logger.info("使用预热的备用WebSocket连接")
+                self.websocket = standby
+                self._last_connect_source = "standby"
+            else:
+                await self._connect_with_retry()
+                self._last_connect_source = "fresh"
 
             # 启动消息处理循环（保存任务引用，关闭时可取消）
             self._message_task = asyncio.create_task(self._message_handler())
@@ -159,14 +136,31 @@ class WebsocketProtocol(Protocol):
                     "frame_duration": AudioConfig.FRAME_DURATION,
                 },
             }
-            await self.send_text(json.dumps(hello_message))
+            await self.send_text(json_codec.dumps(hello_message))
 
             # 等待服务器hello响应
             try:
-                await asyncio.wait_for(self.hello_received.wait(), timeout=10.0)
+                # 备用连接可能已被网络静默断开，缩短等待后改用新连接
+                hello_timeout = 3.0 if standby is not None else 10.0
+                await asyncio.wait_for(
+                    self.hello_received.wait(), timeout=hello_timeout
+                )
                 self.connected = True
                 self._reconnect_attempts = 0  # 重置重连计数
-                logger.info("已连接到WebSocket服务器")
+                self._backoff.reset()
+                self._network_ready = True
+                self._connected_at = time.monotonic()
+                self._last_connect_ms = round(
+                    (self._connected_at - connect_start) * 1000, 1
+                )
+                logger.info(
+                    f"已连接到WebSocket服务器（{self._last_connect_source}，"
+                    f"{self._last_connect_ms:.0f}ms）"
+                )
+
+                # 后台预热下一条备用连接
+                if self._standby:
+                    self._standby.start()
 
                 # 通知连接状态变化
                 if self._on_connection_state_changed:
@@ -174,6 +168,11 @@ class WebsocketProtocol(Protocol):
 
                 return True
             except asyncio.TimeoutError:
+                if standby is not None:
+                    logger.warning("备用连接未响应hello，改用新连接")
+                    self._health.record_failure()
+                    await self._cleanup_connection()
+                    return await self.connect(allow_standby=False)
                 logger.error("等待服务器hello响应超时")
                 await self._cleanup_connection()
                 if self._on_network_error:
@@ -187,6 +186,83 @@ class WebsocketProtocol(Protocol):
                 self._on_network_error(f"无法连接服务: {str(e)}")
             return False
 
+    async def _open_websocket(self):
+        """建立一条新的WebSocket连接（TCP/TLS/升级握手，不发送hello）
+
+        Returns:
+            已握手的连接
+        """
+        # 判断是否应该使用 SSL
+        current_ssl_context = None
+        if self.WEBSOCKET_URL.startswith("wss://"):
+            current_ssl_context = ssl_context
+
+        # 建立WebSocket连接 (兼容不同Python版本的写法)
+        try:
+            # 新的写法 (在Python 3.11+版本中)
+            return await asyncio.wait_for(
+                websockets.connect(
+                    uri=self.WEBSOCKET_URL,
+                    ssl=current_ssl_context,
+                    additional_headers=self.HEADERS,
+                    ping_interval=20,  # 使用websockets自己的心跳，20秒间隔
+                    ping_timeout=20,  # ping超时20秒
+                    close_timeout=10,  # 关闭超时10秒
+                    max_size=10 * 1024 * 1024,  # 最大消息10MB
+                    compression=None,  # 禁用压缩以提高稳定性
+                ),
+                timeout=15.0,  # Timeout 15 giây cho mỗi lần thử
+            )
+        except TypeError:
+            # 旧的写法 (在较早的Python版本中)
+            return await asyncio.wait_for(
+                websockets.connect(
+                    self.WEBSOCKET_URL,
+                    ssl=current_ssl_context,
+                    extra_headers=self.HEADERS,
+                    ping_interval=20,  # 使用websockets自己的心跳
+                    ping_timeout=20,  # ping超时20秒
+                    close_timeout=10,  # 关闭超时10秒
+                    max_size=10 * 1024 * 1024,  # 最大消息10MB
+                    compression=None,  # 禁用压缩
+                ),
+                timeout=15.0,
+            )
+
+    async def _connect_with_retry(self, max_retries: int = 3):
+        """建立新连接，失败时按退避策略重试.
+
+        Args:
+            max_retries: 最多尝试次数
+        """
+        for attempt in range(1, max_retries + 1):
+            start = time.monotonic()
+            try:
+                logger.info(
+                    f"Đang thử kết nối WebSocket (lần {attempt}/{max_retries})..."
+                )
+                self.websocket = await self._open_websocket()
+                self._health.record_success(time.monotonic() - start)
+                return
+            except asyncio.TimeoutError:
+                self._health.record_failure()
+                logger.warning(
+                    f"Kết nối WebSocket timeout (lần {attempt}/{max_retries})"
+                )
+                if attempt >= max_retries:
+                    raise
+            except Exception as e:
+                self._health.record_failure()
+                logger.warning(
+                    f"Lỗi kết nối WebSocket (lần {attempt}/{max_retries}): {e}"
+                )
+                if attempt >= max_retries:
+                    raise
+
+            retry_delay = self._backoff.next_delay(self._health.score)
+            logger.info(f"Đợi {retry_delay:.1f} giây trước khi thử lại...")
+            await asyncio.sleep(retry_delay)
+
     def _start_heartbeat(self):
         """
         启动心跳检测任务.
@@ -209,7 +285,8 @@ class WebsocketProtocol(Protocol):
                 # Thử kết nối đến server
                 parsed_url = self.WEBSOCKET_URL.replace("wss://", "").replace("ws://", "").split("/")[0]
                 host = parsed_url.split(":")[0]
-                socket.create_connection((host, 443 if "wss" in self.WEBSOCKET_URL else 80), timeout=3)
+                port = 443 if "wss" in self.WEBSOCKET_URL else 80
+                socket.create_connection((host, port), timeout=3).close()
                 logger.info("Network đã sẵn sàng")
                 return
             except (socket.gaierror, socket.timeout, OSError):
@@ -296,6 +373,8 @@ class WebsocketProtocol(Protocol):
         # 更新连接状态
         was_connected = self.connected
         self.connected = False
+        if was_connected and self._connected_at is not None:
+            self._health.record_drop(time.monotonic() - self._connected_at)
 
         # 通知连接状态变化
         if self._on_connection_state_changed and was_connected:
@@ -351,8 +430,9 @@ class WebsocketProtocol(Protocol):
             f"尝试自动重连 ({self._reconnect_attempts}/{self._max_reconnect_attempts})"
         )
 
-        # 等待一段时间后重连
-        await asyncio.sleep(min(self._reconnect_attempts * 2, 30))  # 指数退避，最大30秒
+        # 有可用的备用连接时立即切换，否则按带抖动的指数退避等待
+        if not self.standby_ready():
+            await asyncio.sleep(self._backoff.next_delay(self._health.score))
 
         try:
             success = await self.connect()
@@ -392,6 +472,12 @@ class WebsocketProtocol(Protocol):
             self._max_reconnect_attempts = 0
             logger.info("禁用自动重连")
 
+    def standby_ready(self) -> bool:
+        """
+        是否有可立即切换的预热备用连接.
+        """
+        return self._standby is not None and self._standby.snapshot()["ready"]
+
     def get_connection_info(self) -> dict:
         """获取连接信息.
 
@@ -410,8 +496,25 @@ class WebsocketProtocol(Protocol):
             "last_ping_time": self._last_ping_time,
             "last_pong_time": self._last_pong_time,
             "websocket_url": self.WEBSOCKET_URL,
+            "last_connect_ms": self._last_connect_ms,
+            "last_connect_source": self._last_connect_source,
+            "health": self._health.snapshot(),
+            "standby": self._standby.snapshot() if self._standby else None,
         }
 
+    def _schedule_connection_loss(self, reason: str):
+        """在独立任务中处理断线（消息任务会在清理中被取消，不能在其内部等待清理）
+
+        Args:
+            reason: 断线原因
+        """
+        task = self._connection_loss_task
+        if task is not None and not task.done():
+            return
+        self._connection_loss_task = asyncio.create_task(
+            self._handle_connection_loss(reason), name="ws:connection_loss"
+        )
+
     async def _message_handler(self):
         """
         处理接收到的WebSocket消息.
@@ -424,7 +527,7 @@ class WebsocketProtocol(Protocol):
                 try:
                     if isinstance(message, str):
                         try:
-                            data = json.loads(message)
+                            data = json_codec.loads(message)
                             msg_type = data.get("type")
                             if msg_type == "hello":
                                 # 处理服务器 hello 消息
@@ -432,7 +535,7 @@ class WebsocketProtocol(Protocol):
                             else:
                                 if self._on_incoming_json:
                                     self._on_incoming_json(data)
-                        except json.JSONDecodeError as e:
+                        except json_codec.JSONDecodeError as e:
                             logger.error(f"无效的JSON消息: {message}, 错误: {e}")
                     elif isinstance(message, bytes):
                         # 二进制消息，可能是音频
@@ -443,29 +546,35 @@ class WebsocketProtocol(Protocol):
                     logger.error(f"处理消息时出错: {e}", exc_info=True)
                     continue
 
+            # 服务端正常关闭时迭代直接结束，不抛出异常，需立即按断线处理
+            if not self._is_closing:
+                code = self.websocket.close_code if self.websocket else None
+                logger.info(f"WebSocket连接已被服务端关闭: {code}")
+                self._schedule_connection_loss(f"连接关闭: {code}")
+
         except asyncio.CancelledError:
             logger.debug("消息处理任务被取消")
             return
         except websockets.ConnectionClosed as e:
             if not self._is_closing:
                 logger.info(f"WebSocket连接已关闭: {e}")
-                await self._handle_connection_loss(f"连接关闭: {e.code} {e.reason}")
+                self._schedule_connection_loss(f"连接关闭: {e.code} {e.reason}")
         except websockets.ConnectionClosedError as e:
             if not self._is_closing:
                 logger.info(f"WebSocket连接错误关闭: {e}")
-                await self._handle_connection_loss(f"连接错误: {e.code} {e.reason}")
+                self._schedule_connection_loss(f"连接错误: {e.code} {e.reason}")
         except websockets.InvalidState as e:
             logger.error(f"WebSocket状态无效: {e}")
-            await self._handle_connection_loss("连接状态异常")
+            self._schedule_connection_loss("连接状态异常")
         except ConnectionResetError:
             logger.warning("连接被重置")
-            await self._handle_connection_loss("连接被重置")
+            self._schedule_connection_loss("连接被重置")
         except OSError as e:
             logger.error(f"网络I/O错误: {e}")
-            await self._handle_connection_loss("网络I/O错误")
+            self._schedule_connection_loss("网络I/O错误")
         except Exception as e:
             logger.error(f"消息处理循环异常: {e}", exc_info=True)
-            await self._handle_connection_loss(f"消息处理异常: {str(e)}")
+            self._schedule_connection_loss(f"消息处理异常: {str(e)}")
 
     async def send_audio(self, data: bytes):
         """
@@ -608,6 +717,8 @@ class WebsocketProtocol(Protocol):
         self._is_closing = True
 
         try:
+            if self._standby:
+                await self._standby.stop()
             await self._cleanup_connection()
 
             if self._on_audio_channel_closed:
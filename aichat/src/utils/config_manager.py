@@ -36,6 +36,11 @@ class ConfigManager:
             "KEYWORDS_SCORE": 1.8,
             "KEYWORDS_THRESHOLD": 0.2,
             "NUM_TRAILING_BLANKS": 1,
+            # Vosk: grammar（仅唤醒词+垃圾词，使用稳定的部分结果）或 open（开放词表）
+            "VOSK_MODE": "grammar",
+            "VOSK_WAKE_PHRASES": ["hello"],
+            "VOSK_MIN_CONFIDENCE": 0.6,
+            "VOSK_PARTIAL_STABLE": 2,
         },
         "CAMERA": {
             "camera_index": 0,
@@ -64,6 +69,52 @@ class ConfigManager:
             "FRAME_DELAY": 3,
             "FILTER_LENGTH_RATIO": 0.4,
             "ENABLE_PREPROCESS": True,
+            "REFERENCE_SOURCE": "auto",
+        },
+        "AUDIO_OPTIONS": {
+            "PLAYOUT_BUFFER_MS": 30000,
+            "JITTER_BUFFER_ENABLED": True,
+            "JITTER_MIN_MS": None,
+            "JITTER_MAX_MS": 600,
+            "DECODE_MODE": "loop",
+            "NATIVE_OPUS": True,
+            "UPLINK_QUEUE_MS": 1000,
+            "UPLINK_MAX_BATCH": 5,
+            "UDP_SENDMMSG": False,
+            "UDP_REORDER_WINDOW": 3,
+            "UDP_REORDER_HOLD_MS": 60,
+            "UDP_RX_BATCH_MS": 20,
+            "PRECONNECT_MAX_MS": 3000,
+            "PRECONNECT_REPLAY_SPEED": 3.0,
+            "WAKE_PREROLL_MS": 1500,
+        },
+        "CONNECTION_OPTIONS": {
+            "STANDBY_ENABLED": True,
+            "STANDBY_MAX_AGE_S": 50,
+            "STANDBY_MIN_SCORE": 0.3,
+            "BACKOFF_BASE_S": 0.5,
+            "BACKOFF_MAX_S": 30,
+        },
+        "TRACE_OPTIONS": {
+            "ENABLED": True,
+            "FILE_MAX_KB": 1024,
+            "BACKUP_COUNT": 3,
+            "SUMMARY_WINDOW": 200,
+        },
+        "KWS_GATE_OPTIONS": {
+            "ENABLED": True,
+            "THRESHOLD_DB": 8.0,
+            "MIN_LEVEL_DB": -55.0,
+            "PREROLL_MS": 300,
+            "HANGOVER_MS": 1000,
+        },
+        "VAD_OPTIONS": {
+            "ENABLED": False,
+            "THRESHOLD_DB": 10,
+            "HANGOVER_MS": 300,
+            "PREROLL_MS": 180,
+            "ENDPOINT_MS": 800,
+            "KEEPALIVE_MS": 1000,
         },
         "AUDIO_DEVICES": {
             "input_device_id": None,
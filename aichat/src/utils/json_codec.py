@@ -0,0 +1,61 @@
+"""
+JSON 编解码（协议消息与 MCP 负载共用）
+
+安装了 orjson 时使用 orjson，否则回退到标准库；两种后端输出相同格式的紧凑 JSON
+（无多余空格、非 ASCII 字符不转义），便于消息长度前后一致。
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # 可选依赖
+    orjson = None
+
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，调用方统一捕获此异常即可
+JSONDecodeError = json.JSONDecodeError
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(obj: Any) -> str:
+    """
+    编码为 JSON 字符串.
+    """
+    return dumps_bytes(obj).decode("utf-8") if orjson is not None else _encode(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    编码为 UTF-8 JSON 字节串（MQTT 负载等直接发送字节的场景，省去一次转码）.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError as e:
+            # orjson 不支持的值（如超过 64 位的整数），交给标准库处理
+            logger.debug(f"orjson 编码失败，回退标准库: {e}")
+    return _encode(obj).encode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """
+    解码 JSON（接受 str 或 UTF-8 字节，字节输入无需先 decode）.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _encode(obj: Any) -> str:
+    return _encoder.encode(obj)
@@ -6,13 +6,17 @@ import shutil
 import sys
 from enum import Enum
 from pathlib import Path
-from typing import List, Tuple, Union, cast
+from typing import List, Optional, Tuple, Union, cast
 
 # 获取日志记录器
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# 已加载的opus库路径及句柄（供原生绑定直接调用）
+_opus_lib_path: Optional[str] = None
+_opus_lib: Optional[ctypes.CDLL] = None
+
 
 # 平台常量定义
 class PLATFORM(Enum):
@@ -250,6 +254,8 @@ def setup_opus() -> bool:
     """
     设置opus动态库.
     """
+    global _opus_lib_path
+
     # 检查是否已经由runtime_hook加载
     if hasattr(sys, "_opus_loaded"):
         logger.info("opus库已由运行时钩子加载")
@@ -284,6 +290,7 @@ def setup_opus() -> bool:
             try:
                 _ = ctypes.cdll.LoadLibrary(system_lib_path)
                 logger.info(f"已从系统路径加载opus库: {system_lib_path}")
+                _opus_lib_path = system_lib_path
                 sys._opus_loaded = True
                 return True
             except Exception as e:
@@ -321,6 +328,7 @@ def setup_opus() -> bool:
         # 加载DLL并存储引用以防止垃圾回收
         _ = ctypes.CDLL(lib_path)
         logger.info(f"成功加载opus库: {lib_path}")
+        _opus_lib_path = lib_path
         sys._opus_loaded = True
         return True
     except Exception as e:
@@ -328,6 +336,34 @@ def setup_opus() -> bool:
         return False
 
 
+def get_opus_library() -> Optional[ctypes.CDLL]:
+    """获取opus库句柄（供原生绑定直接调用）
+
+    优先使用 setup_opus 加载的库，否则按系统库名查找.
+
+    Returns:
+        ctypes.CDLL，找不到时返回 None
+    """
+    global _opus_lib
+    if _opus_lib is not None:
+        return _opus_lib
+
+    lib_path = _opus_lib_path
+    if not lib_path:
+        from ctypes.util import find_library
+
+        lib_path = find_library("opus")
+    if not lib_path:
+        return None
+
+    try:
+        _opus_lib = ctypes.CDLL(lib_path)
+    except OSError as e:
+        logger.warning(f"加载opus库失败: {e}")
+        return None
+    return _opus_lib
+
+
 def _patch_find_library(lib_name: str, lib_path: str):
     """
     修补ctypes.util.find_library函数.
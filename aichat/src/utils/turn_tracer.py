@@ -0,0 +1,234 @@
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from typing import Dict, Optional
+
+from src.utils.config_manager import ConfigManager
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# 每轮对话的里程碑（按正常发生顺序）
+MILESTONES = (
+    "wake",  # 检测到唤醒词
+    "listen",  # 发送 listen start
+    "first_uplink",  # 首个上行音频帧发出
+    "stt",  # 收到服务端 stt
+    "llm",  # 收到服务端 llm
+    "tts_start",  # 收到 tts start
+    "first_audio",  # 收到首个下行音频帧
+    "first_played",  # 输出回调首次播放出有效样本
+    "tts_stop",  # 收到 tts stop
+)
+
+# 统计的分段：名称 -> (起点, 终点)，任一端缺失的分段不统计
+SEGMENTS = {
+    "wake_to_listen": ("wake", "listen"),
+    "listen_to_uplink": ("listen", "first_uplink"),
+    "uplink_to_stt": ("first_uplink", "stt"),
+    "stt_to_llm": ("stt", "llm"),
+    "stt_to_tts_start": ("stt", "tts_start"),
+    "tts_start_to_audio": ("tts_start", "first_audio"),
+    "audio_to_played": ("first_audio", "first_played"),
+    "stt_to_played": ("stt", "first_played"),
+    "wake_to_played": ("wake", "first_played"),
+    "playback": ("first_played", "tts_stop"),
+}
+
+
+class _Turn:
+    __slots__ = ("turn_id", "source", "wall_time", "marks")
+
+    def __init__(self, turn_id: int, source: str):
+        self.turn_id = turn_id
+        self.source = source
+        self.wall_time = time.time()
+        self.marks: Dict[str, float] = {}
+
+
+class TurnTracer:
+    """
+    对话轮次延迟追踪（单例）
+
+    - 每轮对话分配一个 ID，在固定里程碑记录 time.monotonic 时间戳（只记首次）
+    - 唤醒或无进行中轮次时的 listen start 开启新一轮；tts stop、打断或断线时结束
+    - 结束的轮次写入滚动 JSONL 文件（logs/turn_trace.jsonl），
+      并按分段保留最近若干轮的耗时，用于计算 P50/P95
+    - mark 只做一次字典写入，可在音频输出回调中调用
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_instance(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        config = ConfigManager.get_instance()
+        self.enabled = bool(config.get_config("TRACE_OPTIONS.ENABLED", True))
+        self._max_bytes = int(config.get_config("TRACE_OPTIONS.FILE_MAX_KB", 1024))
+        self._max_bytes *= 1024
+        self._backup_count = int(config.get_config("TRACE_OPTIONS.BACKUP_COUNT", 3))
+        window = max(1, int(config.get_config("TRACE_OPTIONS.SUMMARY_WINDOW", 200)))
+
+        self._turn: Optional[_Turn] = None
+        self._next_id = 1
+        self._file_logger: Optional[logging.Logger] = None
+        self._durations = {name: deque(maxlen=window) for name in SEGMENTS}
+        self.completed = 0
+        self.aborted = 0
+
+    def start_turn(self, source: str = "wake") -> int:
+        """开始新一轮（未结束的上一轮按被打断结束）.
+
+        Args:
+            source: 触发来源，同时记为本轮首个里程碑（wake 或 listen）
+
+        Returns:
+            本轮 ID，未启用时返回 0
+        """
+        if not self.enabled:
+            return 0
+        if self._turn is not None:
+            self.finish_turn("superseded")
+        turn = _Turn(self._next_id, source)
+        self._next_id += 1
+        turn.marks[source] = time.monotonic()
+        self._turn = turn
+        return turn.turn_id
+
+    def mark(self, milestone: str, after: Optional[str] = None):
+        """记录里程碑（同一轮只记首次，无进行中轮次时忽略；listen 会开启新一轮）.
+
+        Args:
+            milestone: MILESTONES 中的名称
+            after: 前置里程碑，尚未记录时忽略本次（如播放须在收到下行音频之后）
+        """
+        turn = self._turn
+        if turn is None:
+            if milestone == "listen" and self.enabled:
+                self.start_turn("listen")
+            return
+        marks = turn.marks
+        if milestone not in marks and (after is None or after in marks):
+            marks[milestone] = time.monotonic()
+
+    def finish_turn(self, reason: str = "tts_stop"):
+        """结束当前轮次并写入追踪文件.
+
+        Args:
+            reason: 结束原因（tts_stop / abort / goodbye / closed / superseded）
+        """
+        turn, self._turn = self._turn, None
+        if turn is None:
+            return
+        if reason == "tts_stop":
+            turn.marks.setdefault("tts_stop", time.monotonic())
+            self.completed += 1
+        else:
+            self.aborted += 1
+
+        marks = dict(turn.marks)
+        origin = min(marks.values())
+        segments = {}
+        for name, (begin, end) in SEGMENTS.items():
+            if begin in marks and end in marks and marks[end] >= marks[begin]:
+                segments[name] = round((marks[end] - marks[begin]) * 1000, 1)
+                self._durations[name].append(segments[name])
+
+        record = {
+            "turn": turn.turn_id,
+            "time": time.strftime(
+                "%Y-%m-%dT%H:%M:%S", time.localtime(turn.wall_time)
+            ),
+            "source": turn.source,
+            "end": reason,
+            "marks_ms": {
+                name: round((marks[name] - origin) * 1000, 1)
+                for name in MILESTONES
+                if name in marks
+            },
+            "segments_ms": segments,
+        }
+        self._write(record)
+        if "stt_to_played" in segments:
+            logger.debug(
+                f"轮次 {turn.turn_id}: stt 到开始播放 {segments['stt_to_played']}ms"
+            )
+
+    def _write(self, record: dict):
+        try:
+            if self._file_logger is None:
+                self._file_logger = self._create_file_logger()
+            self._file_logger.info(json.dumps(record, ensure_ascii=False))
+        except Exception as e:
+            logger.debug(f"写入轮次追踪失败: {e}")
+
+    def _create_file_logger(self) -> logging.Logger:
+        """
+        创建独立的追踪日志记录器（不向上传播，按大小滚动）.
+        """
+        from src.utils.resource_finder import get_project_root
+
+        log_dir = get_project_root() / "logs"
+        log_dir.mkdir(exist_ok=True)
+        handler = RotatingFileHandler(
+            log_dir / "turn_trace.jsonl",
+            maxBytes=self._max_bytes,
+            backupCount=self._backup_count,
+            encoding="utf-8",
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        file_logger = logging.getLogger("turn_trace")
+        file_logger.setLevel(logging.INFO)
+        file_logger.propagate = False
+        file_logger.handlers.clear()
+        file_logger.addHandler(handler)
+        return file_logger
+
+    def get_summary(self) -> dict:
+        """获取最近若干轮的分段耗时汇总.
+
+        Returns:
+            dict: 完成/中断轮数，各分段的样本数与 P50/P95（毫秒）
+        """
+        return {
+            "enabled": self.enabled,
+            "completed": self.completed,
+            "aborted": self.aborted,
+            "segments": {
+                name: summarize(values)
+                for name, values in self._durations.items()
+                if values
+            },
+        }
+
+
+def summarize(values) -> dict:
+    """计算一组耗时（毫秒）的 P50/P95.
+
+    Returns:
+        dict: 样本数、P50、P95、最大值
+    """
+    ordered = sorted(values)
+    count = len(ordered)
+
+    def percentile(q: float) -> float:
+        # 最近秩法
+        return ordered[max(0, min(count - 1, math.ceil(q * count) - 1))]
+
+    return {
+        "count": count,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "max_ms": ordered[-1],
+    }
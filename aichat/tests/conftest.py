@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(project_dir))
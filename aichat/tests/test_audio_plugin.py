@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+# AudioPlugin 依赖音频设备相关模块
+for _module in ("opuslib", "sounddevice", "soxr"):
+    pytest.importorskip(_module)
+
+from src.audio_processing.vad_gate import VadEvent  # noqa: E402
+from src.constants.constants import ListeningMode  # noqa: E402
+from src.plugins.audio import AudioPlugin  # noqa: E402
+from src.protocols.audio_uplink import AudioUplink, PreconnectBuffer  # noqa: E402
+
+
+class FakeProtocol:
+    def __init__(self, log):
+        self.log = log
+        self.channel_open = True
+
+    def is_audio_channel_opened(self):
+        return self.channel_open
+
+    async def send_audio_batch(self, frames):
+        self.log.extend(frames)
+
+    async def send_stop_listening(self):
+        self.log.append("stop_listening")
+
+    async def send_start_listening(self, mode):
+        self.log.append("start_listening")
+
+
+class FakeApp:
+    running = True
+    device_state = "listening"
+
+    def __init__(self, log):
+        self.protocol = FakeProtocol(log)
+
+    def get_listening_mode(self):
+        return ListeningMode.REALTIME
+
+    def is_listening(self):
+        return True
+
+    def should_capture_audio(self):
+        return True
+
+    def is_audio_channel_opened(self):
+        return True
+
+
+class FakeCodec:
+    last_frame_silent = False
+
+
+def test_endpoint_restart_pair_survives_full_uplink():
+    log = []
+
+    async def main():
+        plugin = AudioPlugin()
+        plugin.app = FakeApp(log)
+        plugin.codec = FakeCodec()
+        plugin._uplink = AudioUplink(
+            asyncio.get_running_loop(),
+            plugin._send_uplink_batch,
+            capacity=4,
+            max_batch=3,
+        )
+        plugin._uplink.start()
+
+        # 采集线程顺序：端点 → 语音起点 → 语音帧，发送协程取帧前队列已溢出
+        plugin._on_vad_event(VadEvent.ENDPOINT)
+        plugin._on_vad_event(VadEvent.SPEECH_START)
+        for i in range(6):
+            plugin._on_encoded_audio(b"speech%d" % i)
+
+        for _ in range(20):
+            await asyncio.sleep(0)
+        await plugin._uplink.stop()
+
+    asyncio.run(main())
+    assert log[:2] == ["stop_listening", "start_listening"]
+    assert log[2:] == [b"speech2", b"speech3", b"speech4", b"speech5"]
+
+
+def test_preconnect_replay_dropped_when_channel_closed():
+    log = []
+
+    async def main():
+        plugin = AudioPlugin()
+        plugin.app = FakeApp(log)
+        plugin.app.protocol.channel_open = False
+        plugin._preconnect = PreconnectBuffer(10)
+        plugin._preconnect.start([b"held0", b"held1"])
+        await plugin._replay_preconnect()
+        return plugin._preconnect
+
+    preconnect = asyncio.run(main())
+    assert log == []
+    assert not preconnect.holding
+    assert preconnect.cancelled == 1
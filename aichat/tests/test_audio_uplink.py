@@ -0,0 +1,63 @@
+import asyncio
+
+from src.protocols.audio_uplink import AudioUplink
+
+
+def run_uplink(capacity, fill):
+    """
+    在发送协程开始取帧前调用 fill 入队，随后发送完毕，返回 (发送日志, 统计).
+    """
+    log = []
+
+    async def send_batch(frames):
+        log.extend(frames)
+        return True
+
+    async def main():
+        uplink = AudioUplink(
+            asyncio.get_running_loop(), send_batch, capacity=capacity, max_batch=3
+        )
+        uplink.start()
+        fill(uplink, log)
+        for _ in range(20):
+            await asyncio.sleep(0)
+        stats = uplink.get_stats()
+        await uplink.stop()
+        return stats
+
+    stats = asyncio.run(main())
+    return log, stats
+
+
+def control(log, name):
+    async def callback():
+        log.append(name)
+
+    return callback
+
+
+def test_consecutive_controls_survive_overflow():
+    def fill(uplink, log):
+        uplink.push_control(control(log, "stop"))
+        uplink.push_control(control(log, "start"))
+        for i in range(6):
+            uplink.push(b"f%d" % i)
+
+    log, stats = run_uplink(4, fill)
+    assert log == ["stop", "start", b"f2", b"f3", b"f4", b"f5"]
+    assert stats["dropped_oldest"] == 2
+    assert stats["controls"] == 2
+
+
+def test_control_keeps_position_between_frames():
+    def fill(uplink, log):
+        uplink.push(b"f0")
+        uplink.push(b"f1")
+        uplink.push_control(control(log, "start"))
+        for i in range(2, 6):
+            uplink.push(b"f%d" % i)
+
+    log, stats = run_uplink(4, fill)
+    # 控制消息之前的帧被挤掉，控制消息本身及其后的帧按序送出
+    assert log == ["start", b"f2", b"f3", b"f4", b"f5"]
+    assert stats["dropped_oldest"] == 2
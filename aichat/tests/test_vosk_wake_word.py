@@ -0,0 +1,74 @@
+import json
+
+from src.audio_processing import vosk_wake_word
+from src.audio_processing.vosk_wake_word import VoskPhraseDecoder
+
+SAMPLE_RATE = 16000
+CHUNK = b"\x00\x00" * (SAMPLE_RATE * 60 // 1000)  # 60ms
+
+
+class FakeRecognizer:
+    """
+    Giả lập KaldiRecognizer: thời điểm từ tính liên tục từ đầu luồng, kể cả sau Reset.
+    """
+
+    def __init__(self, model, sample_rate, grammar=None):
+        self.sample_rate = sample_rate
+        self.stream_s = 0.0
+        self.wake_at = []  # (thời điểm bắt đầu, kết thúc) của wake phrase cần trả về
+        self.final_after_s = 0.3
+
+    def SetWords(self, enabled):
+        pass
+
+    def SetPartialWords(self, enabled):
+        pass
+
+    def AcceptWaveform(self, pcm):
+        self.stream_s += len(pcm) / 2 / self.sample_rate
+        return bool(self.wake_at) and (
+            self.stream_s >= self.wake_at[0][1] + self.final_after_s
+        )
+
+    def Result(self):
+        start, end = self.wake_at.pop(0)
+        words = [
+            {"word": "hello", "conf": 1.0, "start": start, "end": end},
+        ]
+        return json.dumps({"text": "hello", "result": words})
+
+    def PartialResult(self):
+        return json.dumps({"partial": ""})
+
+    def Reset(self):
+        pass
+
+
+def feed_until_hit(decoder, max_chunks=200):
+    for _ in range(max_chunks):
+        hit = decoder.accept(CHUNK)
+        if hit:
+            return hit
+    raise AssertionError("không phát hiện wake phrase")
+
+
+def test_tail_survives_reset(monkeypatch):
+    monkeypatch.setattr(
+        vosk_wake_word, "KaldiRecognizer", FakeRecognizer, raising=False
+    )
+    decoder = VoskPhraseDecoder(None, ["hello"], mode="open")
+    recognizer = decoder.recognizer
+
+    recognizer.wake_at.append((0.5, 1.0))
+    first = feed_until_hit(decoder)
+    assert first[0] == "hello"
+    assert first[3] > 0.2
+
+    # Worker reset sau mỗi lần resume; Vosk vẫn đếm thời gian từ đầu luồng
+    decoder.reset()
+    for _ in range(50):
+        decoder.accept(CHUNK)
+    recognizer.wake_at.append((recognizer.stream_s + 0.5, recognizer.stream_s + 1.0))
+    second = feed_until_hit(decoder)
+    assert second[0] == "hello"
+    assert 0.2 < second[3] < 0.5